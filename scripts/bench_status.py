@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from zeroterm_status import batterylog, discharge, metrics, netlink, nl80211, render
+
+
+def _cpu_time() -> float:
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def _measure(label: str, iterations: int, func) -> float:
+    func()
+    start = _cpu_time()
+    for _ in range(iterations):
+        func()
+    elapsed = _cpu_time() - start
+    per_call = elapsed * 1000 / iterations
+    print(f"{label:<28} {per_call:9.3f} ms cpu/cycle")
+    return per_call
+
+
+def _measure_latency(label: str, iterations: int, func) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    per_call = (time.perf_counter() - start) * 1000 / iterations
+    print(f"{label:<28} {per_call:9.3f} ms/read")
+    return per_call
+
+
+def _write_script(path: Path, body: str) -> None:
+    path.write_text(f"#!/bin/sh\n{body}\n", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+class _ReplaySocket:
+    def __init__(self) -> None:
+        self._pending: list[bytes] = []
+
+    def send(self, data: bytes) -> int:
+        msg_type, _, seq, _ = next(netlink.iter_messages(data))
+        ack = netlink.pack_message(netlink.NLMSG_ERROR, 0, seq, struct.pack("=i", 0) + data[:16])
+        if msg_type == nl80211.GENL_ID_CTRL:
+            attrs = netlink.pack_attr(nl80211.CTRL_ATTR_FAMILY_ID, struct.pack("=H", 0x1C))
+        else:
+            attrs = (
+                netlink.pack_attr_u32(nl80211.NL80211_ATTR_IFTYPE, 2)
+                + netlink.pack_attr_u32(nl80211.NL80211_ATTR_WIPHY_FREQ, 2437)
+                + netlink.pack_attr(nl80211.NL80211_ATTR_SSID, b"ZEROTERM-LAB")
+            )
+        reply = struct.pack("=BBH", 1, 1, 0) + attrs
+        self._pending.append(netlink.pack_message(msg_type, 0, seq, reply) + ack)
+        return len(data)
+
+    def recv(self, size: int) -> bytes:
+        return self._pending.pop(0)
+
+    def close(self) -> None:
+        return None
+
+
+def bench_wifi(iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bin_dir = Path(temp_dir)
+        _write_script(bin_dir / "iwgetid", "echo ZEROTERM-LAB")
+        _write_script(
+            bin_dir / "iw",
+            "printf 'Interface wlan0\\n\\ttype managed\\n\\tchannel 6 (2437 MHz), width: 20 MHz\\n'",
+        )
+        path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        with mock.patch.dict(os.environ, {"PATH": path}), mock.patch(
+            "zeroterm_status.nl80211.socket.if_nametoindex", return_value=3
+        ):
+            before = _measure(
+                "iwgetid + iw (fork/exec)",
+                iterations,
+                lambda: (metrics._read_ssid("wlan0"), metrics._read_wifi_mode_channel("wlan0")),
+            )
+            client = nl80211.Nl80211Client(sock=_ReplaySocket())
+            after = _measure(
+                "nl80211 (persistent socket)",
+                iterations,
+                lambda: client.interface_info("wlan0"),
+            )
+    if after > 0:
+        print(f"speedup                      {before / after:9.1f}x")
+
+
+def bench_battery(iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        for name, kind in (("AC", "Mains"), ("usb", "USB"), ("BAT0", "Battery")):
+            entry = root / name
+            entry.mkdir()
+            (entry / "type").write_text(f"{kind}\n", encoding="utf-8")
+            (entry / "capacity").write_text("67\n", encoding="utf-8")
+            (entry / "status").write_text("Charging\n", encoding="utf-8")
+        def read_fresh() -> None:
+            fresh = metrics.BatterySource(temp_dir, None)
+            fresh.read()
+            fresh.close()
+
+        before = _measure("rediscover every poll", iterations, read_fresh)
+        source = metrics.BatterySource(temp_dir, None)
+        after = _measure("cached BatterySource", iterations, source.read)
+        source.close()
+    if after > 0:
+        print(f"speedup                      {before / after:9.1f}x")
+
+
+def _serve_pisugar(server: socket.socket) -> None:
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            return
+        with conn, conn.makefile("rb") as reader:
+            for raw in reader:
+                command = raw.strip()
+                if command == b"get battery":
+                    conn.sendall(b"battery: 67.2\n")
+                elif command == b"get battery_charging":
+                    conn.sendall(b"battery_charging: true\n")
+
+
+def bench_pisugar(iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bin_dir = Path(temp_dir)
+        _write_script(bin_dir / "pisugar-power", "echo 'battery: 67'")
+        sock_path = str(bin_dir / "pisugar.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(sock_path)
+        server.listen(1)
+        threading.Thread(target=_serve_pisugar, args=(server,), daemon=True).start()
+        path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        with mock.patch.dict(os.environ, {"PATH": path}):
+            forked = metrics.BatterySource(None, "pisugar-power -c", "")
+            before = _measure_latency("pisugar-power -c (fork)", iterations, forked.read)
+            forked.close()
+        persistent = metrics.BatterySource(None, "pisugar-power -c", f"unix:{sock_path}")
+        after = _measure_latency("pisugar server socket", iterations, persistent.read)
+        persistent.close()
+        server.close()
+    if after > 0:
+        print(f"speedup                      {before / after:9.1f}x")
+
+
+def _trace_rate(trace: str | None) -> float:
+    if not trace:
+        return -8.0
+    model = discharge.DischargeModel(window=float("inf"), min_span=0.0, max_samples=100_000)
+    path = Path(trace)
+    if path.suffix == ".csv":
+        from datetime import datetime
+
+        for line in path.read_text(encoding="utf-8").splitlines()[1:]:
+            stamp, percent, status = (line.split(",") + ["", ""])[:3]
+            try:
+                when = datetime.fromisoformat(stamp.rstrip("Z")).timestamp()
+                model.add(when, int(percent), status or "Discharging")
+            except ValueError:
+                continue
+    else:
+        for when, percent, status in batterylog.read_range(path, 0, 2**32 - 1, step=1, keep=5):
+            model.add(when, percent, status or "Discharging")
+    rate = model.rate()
+    if rate is None or rate >= 0:
+        raise SystemExit(f"no discharging segment found in {trace}")
+    return rate
+
+
+def _simulate_runtime(rate: float, interval: float, poll_cost: float, max_scale: float, reference: float) -> float:
+    percent = 100.0
+    now = 0.0
+    next_poll = 0.0
+    step = 5.0
+    model = discharge.DischargeModel()
+    while percent > 0:
+        percent += rate * step / 3600
+        if now >= next_poll:
+            percent -= poll_cost
+            model.add(now, int(percent), "Discharging")
+            scale = discharge.interval_scale(model.estimate().time_to_empty, reference, max_scale)
+            next_poll = now + interval * scale
+        now += step
+    return now / 3600
+
+
+def bench_discharge(trace: str | None, interval: float, poll_cost: float, max_scale: float) -> None:
+    rate = _trace_rate(trace)
+    reference = 4 * 3600.0
+    print(f"trace discharge rate         {rate:9.2f} %/h")
+    fixed = _simulate_runtime(rate, interval, poll_cost, 1.0, reference)
+    adaptive = _simulate_runtime(rate, interval, poll_cost, max_scale, reference)
+    print(f"fixed {interval:.0f}s polling          {fixed:9.2f} h")
+    print(f"adaptive (max {max_scale:.0f}x)           {adaptive:9.2f} h")
+    print(f"battery-hours saved          {adaptive - fixed:9.2f} h")
+
+
+_RENDER_SAMPLE = dict(
+    status="RUNNING",
+    ip="10.0.0.12",
+    wifi="UP ZEROTERM-LAB",
+    battery="67% CHARGING",
+    adapter="wlan1",
+    power="CHG 1h20",
+    alert="UPD",
+    temp="44C",
+    load="0.42",
+    uptime="3h12m",
+    mem="58%",
+    cpu="12%",
+    battery_percent=67,
+    updated=None,
+    wifi_channel="11",
+    wifi_rate=42.5,
+)
+
+
+def bench_render(iterations: int) -> None:
+    config = render.RenderConfig(width=250, height=122, rotate=0, font_path=None, font_size=14)
+
+    def cold() -> None:
+        render._LAYOUT_CACHE.clear()
+        render.render_status(config=config, **_RENDER_SAMPLE)
+
+    def cached() -> None:
+        render.render_status(config=config, **_RENDER_SAMPLE)
+
+    before = _measure("render_status (no layout)", iterations, cold)
+    after = _measure("render_status (cached base)", iterations, cached)
+    print(f"{'calls/s before -> after':<28} {1000 / before:9.0f} -> {1000 / after:.0f}")
+
+
+def _fit_text_linear(draw, text: str, font, max_width: int) -> str:
+    def width(value: str) -> int:
+        bbox = draw.textbbox((0, 0), value, font=font)
+        return bbox[2] - bbox[0]
+
+    if width(text) <= max_width:
+        return text
+    trimmed = text
+    while trimmed:
+        if width(trimmed + "...") <= max_width:
+            return trimmed + "..."
+        trimmed = trimmed[:-1]
+    return ""
+
+
+def bench_fit(iterations: int) -> None:
+    from PIL import Image, ImageDraw
+
+    draw = ImageDraw.Draw(Image.new("1", (250, 122), 255))
+    font = render._load_font(None, 8)
+    samples = [
+        "SSID " + "ZEROTERM-FIELD-LAB-5GHZ-EXTENDED-GUEST-NETWORK-0123456789",
+        "SSID " + "Free Public WiFi at the Airport Lounge Terminal B",
+        "ALRT TIME UPD LOW",
+        "ALRT " + " ".join(["TIME", "UPD", "LOW"] * 6),
+        "TOP airodump-ng --write /tmp/capture --output-format pcap 97%",
+    ]
+    widths = [60, 86, 120]
+
+    def linear() -> None:
+        for text in samples:
+            for max_width in widths:
+                _fit_text_linear(draw, text, font, max_width)
+
+    def cold() -> None:
+        render._measure.cache_clear()
+        for text in samples:
+            for max_width in widths:
+                render._fit_text(draw, text, font, max_width)
+
+    def warm() -> None:
+        for text in samples:
+            for max_width in widths:
+                render._fit_text(draw, text, font, max_width)
+
+    _measure("fit linear (uncached)", iterations, linear)
+    _measure("fit bisect (cold cache)", iterations, cold)
+    _measure("fit bisect (warm cache)", iterations, warm)
+    config = render.RenderConfig(width=250, height=122, rotate=0, font_path=None, font_size=14)
+    long_values = dict(
+        _RENDER_SAMPLE,
+        wifi="UP " + samples[0][5:],
+        alert=" ".join(["TIME", "UPD", "LOW"] * 6),
+    )
+
+    def render_long() -> None:
+        render._measure.cache_clear()
+        render.render_status(config=config, **long_values)
+
+    _measure("render long strings (cold)", iterations, render_long)
+    _measure(
+        "render long strings (warm)",
+        iterations,
+        lambda: render.render_status(config=config, **long_values),
+    )
+
+
+_BACKEND_SCRIPT = """
+import resource, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+if {backend!r} == "bitmap":
+    from zeroterm_status.bitmap import render_status_bitmap as render
+else:
+    from zeroterm_status.render import render_status_frame as render
+from zeroterm_status.statusview import RenderConfig
+imported = time.perf_counter() - start
+config = RenderConfig(width=250, height=122, rotate=90, font_path=None, font_size=14)
+values = {values!r}
+render(config=config, panel_size=(122, 250), **values)
+start = time.process_time()
+for index in range({iterations}):
+    values["cpu"] = f"{{index % 100}}%"
+    render(config=config, panel_size=(122, 250), **values)
+elapsed = time.process_time() - start
+# ru_maxrss survives exec and would report the parent's peak.
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open("/proc/self/status") as handle:
+        rss = next(int(line.split()[1]) for line in handle if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    pass
+print(imported * 1000, elapsed * 1000 / {iterations}, rss)
+"""
+
+
+def bench_backends(iterations: int) -> None:
+    for backend in ("pillow", "bitmap"):
+        script = _BACKEND_SCRIPT.format(
+            src=str(ROOT_DIR / "src"),
+            backend=backend,
+            values=_RENDER_SAMPLE,
+            iterations=iterations,
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{backend:<28} failed: {result.stderr.strip().splitlines()[-1:]}")
+            continue
+        imported, per_frame, rss = (float(value) for value in result.stdout.split())
+        print(f"{backend + ' import':<28} {imported:9.3f} ms")
+        print(f"{backend + ' frame':<28} {per_frame:9.3f} ms cpu/cycle")
+        print(f"{backend + ' max RSS':<28} {rss / 1024:9.1f} MiB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for zeroterm-status cycles.")
+    parser.add_argument(
+        "target",
+        choices=["wifi", "battery", "pisugar", "discharge", "render", "fit", "backends"],
+        help="Benchmark to run.",
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--trace", help="Battery store (.bin) or battery CSV to replay for 'discharge'.")
+    parser.add_argument("--interval", type=float, default=30.0, help="Base poll interval for 'discharge'.")
+    parser.add_argument("--poll-cost", type=float, default=0.01, help="Battery percent spent per poll cycle.")
+    parser.add_argument("--max-scale", type=float, default=3.0, help="Adaptive interval ceiling for 'discharge'.")
+    args = parser.parse_args()
+    iterations = max(1, args.iterations)
+    if args.target == "wifi":
+        bench_wifi(iterations)
+    elif args.target == "battery":
+        bench_battery(iterations)
+    elif args.target == "pisugar":
+        bench_pisugar(iterations)
+    elif args.target == "render":
+        bench_render(iterations)
+    elif args.target == "fit":
+        bench_fit(iterations)
+    elif args.target == "backends":
+        bench_backends(iterations)
+    elif args.target == "discharge":
+        bench_discharge(args.trace, max(1.0, args.interval), max(0.0, args.poll_cost), max(1.0, args.max_scale))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
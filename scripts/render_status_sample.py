@@ -81,7 +81,8 @@ def _build_live_payload(config):
         cpu_text,
         battery.percent,
         wifi.channel,
-        wifi.packets,
+        wifi.packet_rate,
+        None,
     )
 
 
@@ -101,7 +102,8 @@ def _build_sample_payload():
         "12%",
         67,
         "11",
-        12458,
+        42.5,
+        "airodump-ng 97%",
     )
 
 
@@ -133,6 +135,7 @@ def main() -> int:
         rotate=config.epaper_rotate,
         font_path=config.font_path,
         font_size=config.font_size,
+        layout=config.epaper_layout,
     )
 
     if args.live:
@@ -161,7 +164,8 @@ def main() -> int:
             updated=None,
             config=render_config,
             wifi_channel=payload[13],
-            wifi_packets=payload[14],
+            wifi_rate=payload[14],
+            top=payload[15],
         )
     except RuntimeError as exc:
         print(f"[error] {exc}", file=sys.stderr)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from pathlib import Path
+import heapq
+import mmap
+import os
+import struct
+import threading
+
+_MAGIC = b"ZTBL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHH8x")
+_RECORD = struct.Struct("<IBBxx")
+_NO_PERCENT = 0xFF
+
+STATUS_CODES = {
+    None: 0,
+    "charging": 1,
+    "discharging": 2,
+    "full": 3,
+    "not charging": 4,
+}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items() if name}
+
+
+def encode_status(status: str | None) -> int:
+    if not status:
+        return 0
+    return STATUS_CODES.get(status.strip().lower(), 0)
+
+
+def decode_status(code: int) -> str | None:
+    name = STATUS_NAMES.get(code)
+    return name.title() if name else None
+
+
+def rotated_paths(path: str | Path, keep: int) -> list[Path]:
+    base = Path(path)
+    return [base.with_name(f"{base.name}.{index}") for index in range(keep, 0, -1)] + [base]
+
+
+class BatteryLogWriter:
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 512 * 1024,
+        keep: int = 2,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max(_HEADER.size + _RECORD.size, max_bytes)
+        self.keep = max(0, keep)
+        self._handle = None
+        self._size = 0
+        self._last_timestamp = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "ab", buffering=8192)
+        size = handle.seek(0, os.SEEK_END)
+        if size < _HEADER.size or not self._valid_header():
+            handle.close()
+            handle = open(self.path, "wb", buffering=8192)
+            handle.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size))
+            size = _HEADER.size
+            self._last_timestamp = 0
+        else:
+            size -= (size - _HEADER.size) % _RECORD.size
+            handle.truncate(size)
+            handle.seek(size)
+            self._last_timestamp = self._read_last_timestamp(size)
+        self._handle = handle
+        self._size = size
+
+    def _valid_header(self) -> bool:
+        try:
+            with open(self.path, "rb") as handle:
+                magic, version, record_size = _HEADER.unpack(handle.read(_HEADER.size))
+        except (OSError, struct.error):
+            return False
+        return magic == _MAGIC and version == _VERSION and record_size == _RECORD.size
+
+    def _read_last_timestamp(self, size: int) -> int:
+        if size <= _HEADER.size:
+            return 0
+        try:
+            with open(self.path, "rb") as handle:
+                handle.seek(size - _RECORD.size)
+                return _RECORD.unpack(handle.read(_RECORD.size))[0]
+        except (OSError, struct.error):
+            return 0
+
+    def _rotate(self) -> None:
+        self._close_handle()
+        if self.keep == 0:
+            self.path.unlink(missing_ok=True)
+        else:
+            paths = rotated_paths(self.path, self.keep)
+            for older, newer in zip(paths, paths[1:]):
+                if newer.exists():
+                    os.replace(newer, older)
+        self._open()
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+        self._handle = None
+
+    def append(self, timestamp: float, percent: int | None, status: str | None) -> None:
+        stamp = int(timestamp)
+        with self._lock:
+            if self._handle is None:
+                self._open()
+            if stamp < self._last_timestamp or self._size + _RECORD.size > self.max_bytes:
+                self._rotate()
+            value = _NO_PERCENT if percent is None else max(0, min(100, int(percent)))
+            self._handle.write(_RECORD.pack(stamp, value, encode_status(status)))
+            self._size += _RECORD.size
+            self._last_timestamp = stamp
+            # Flushed per record so zerotermd's mmap reader sees it right away.
+            self._handle.flush()
+
+    def _flush_locked(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._close_handle()
+
+
+def _bisect(view, count: int, timestamp: int) -> int:
+    low, high = 0, count
+    while low < high:
+        mid = (low + high) // 2
+        if _RECORD.unpack_from(view, _HEADER.size + mid * _RECORD.size)[0] < timestamp:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def _iter_file(path: Path, since: int, until: int):
+    try:
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size <= _HEADER.size:
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                magic, version, record_size = _HEADER.unpack_from(view)
+                if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+                    return
+                count = (size - _HEADER.size) // _RECORD.size
+                index = _bisect(view, count, since)
+                while index < count:
+                    record = _RECORD.unpack_from(view, _HEADER.size + index * _RECORD.size)
+                    if record[0] > until:
+                        break
+                    yield record
+                    index += 1
+    except (OSError, ValueError):
+        return
+
+
+def read_range(
+    path: str | Path,
+    since: float,
+    until: float,
+    step: int | None = None,
+    max_points: int = 500,
+    keep: int = 2,
+) -> list[tuple[int, int | None, str | None]]:
+    start = int(since)
+    end = int(until)
+    if end < start:
+        return []
+    if step is None or step <= 0:
+        step = max(1, -(-(end - start) // max(1, max_points)))
+    points: list[tuple[int, int | None, str | None]] = []
+    bucket_key = None
+    total = count = 0
+    status_code = 0
+    # Each file is sorted, but a backward clock step rotates early, so an
+    # older file can hold later timestamps than a newer one.
+    files = [_iter_file(candidate, start, end) for candidate in rotated_paths(path, keep)]
+    for stamp, percent, code in heapq.merge(*files, key=lambda record: record[0]):
+        key = (stamp - start) // step
+        if key != bucket_key:
+            if bucket_key is not None:
+                points.append(_bucket_point(start, step, bucket_key, total, count, status_code))
+            bucket_key = key
+            total = count = 0
+        if percent != _NO_PERCENT:
+            total += percent
+            count += 1
+        status_code = code
+    if bucket_key is not None:
+        points.append(_bucket_point(start, step, bucket_key, total, count, status_code))
+    return points
+
+
+def _bucket_point(start: int, step: int, key: int, total: int, count: int, code: int):
+    percent = int(round(total / count)) if count else None
+    return start + key * step, percent, decode_status(code)
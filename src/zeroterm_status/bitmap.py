@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+from .framebuffer import PackedFrame, pack_bytes
+from .layout import Slot, compile_layout, place_text, select_panel
+from .statusview import RenderConfig, status_text
+
+# Classic 5x7 (+1 descender row) ASCII font, 0x20-0x7E, five column bytes per
+# glyph with the least significant bit at the top.
+_GLYPHS = bytes.fromhex(
+    "0000000000" "00005f0000" "0007000700" "147f147f14" "242a7f2a12" "2313086462"
+    "3649562050" "0008070300" "001c224100" "0041221c00" "2a1c7f1c2a" "08083e0808"
+    "0080703000" "0808080808" "0000606000" "2010080402" "3e5149453e" "00427f4000"
+    "7249494946" "2141494d33" "1814127f10" "2745454539" "3c4a494931" "4121110907"
+    "3649494936" "464949291e" "0000140000" "0040340000" "0008142241" "1414141414"
+    "0041221408" "0201590906" "3e415d594e" "7c1211127c" "7f49494936" "3e41414122"
+    "7f4141413e" "7f49494941" "7f09090901" "3e41415173" "7f0808087f" "00417f4100"
+    "2040413f01" "7f08142241" "7f40404040" "7f021c027f" "7f0408107f" "3e4141413e"
+    "7f09090906" "3e4151215e" "7f09192946" "2649494932" "03017f0103" "3f4040403f"
+    "1f2040201f" "3f4038403f" "6314081463" "0304780403" "61594945" "43"
+    "007f414141" "0204081020" "004141417f" "0402010204" "4040404040" "0003070800"
+    "2054547840" "7f28444438" "3844444428" "384444287f" "3854545418" "00087e0902"
+    "18a4a49c78" "7f08040478" "00447d4000" "2040403d00" "7f10284400" "00417f4000"
+    "7c04780478" "7c08040478" "3844444438" "fc18242418" "18242418fc" "7c08040408"
+    "4854545424" "04043f4424" "3c4040207c" "1c2040201c" "3c4030403c" "4428102844"
+    "4c9090907c" "4464544c44" "0008364100" "0000770000" "0041360800" "0201020402"
+)
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 7
+_ADVANCE = GLYPH_WIDTH + 1
+_ELLIPSIS = "..."
+
+
+def _scale(font_size: int) -> int:
+    return max(1, (font_size + 4) // 11)
+
+
+@lru_cache(maxsize=512)
+def _glyph_runs(char: str, scale: int) -> tuple[tuple[int, int, int], ...]:
+    index = ord(char) - 32
+    if not 0 <= index < len(_GLYPHS) // GLYPH_WIDTH:
+        index = ord("?") - 32
+    columns = _GLYPHS[index * GLYPH_WIDTH : (index + 1) * GLYPH_WIDTH]
+    runs = []
+    for row in range(GLYPH_HEIGHT + 1):
+        x = 0
+        while x < GLYPH_WIDTH:
+            if not columns[x] >> row & 1:
+                x += 1
+                continue
+            start = x
+            while x < GLYPH_WIDTH and columns[x] >> row & 1:
+                x += 1
+            for dy in range(scale):
+                runs.append((row * scale + dy, start * scale, x * scale))
+    return tuple(runs)
+
+
+def text_width(text: str, scale: int = 1) -> int:
+    return max(0, len(text) * _ADVANCE - 1) * scale
+
+
+def text_height(scale: int = 1) -> int:
+    return GLYPH_HEIGHT * scale
+
+
+def fit_text(text: str, scale: int, max_width: int) -> str:
+    if text_width(text, scale) <= max_width:
+        return text
+    keep = (max_width // scale + 1) // _ADVANCE - len(_ELLIPSIS)
+    return text[:keep] + _ELLIPSIS if keep > 0 else ""
+
+
+class BitmapCanvas:
+    """1bpp canvas in the panel buffer format (MSB first, 1 = white)."""
+
+    def __init__(self, width: int, height: int, buffer: bytearray | None = None) -> None:
+        self.width = width
+        self.height = height
+        self.stride = (width + 7) // 8
+        if buffer is None:
+            row = b"\xff" * (width // 8)
+            if width % 8:
+                row += bytes([(0xFF << (8 - width % 8)) & 0xFF])
+            buffer = bytearray(row * height)
+        self.buffer = buffer
+
+    def copy(self) -> BitmapCanvas:
+        return BitmapCanvas(self.width, self.height, bytearray(self.buffer))
+
+    def span(self, y: int, x0: int, x1: int, fill: int = 0) -> None:
+        if y < 0 or y >= self.height:
+            return
+        x0 = max(0, x0)
+        x1 = min(self.width, x1)
+        if x0 >= x1:
+            return
+        buffer = self.buffer
+        row = y * self.stride
+        first = x0 >> 3
+        last = (x1 - 1) >> 3
+        head = 0xFF >> (x0 & 7)
+        tail = (0xFF << (7 - ((x1 - 1) & 7))) & 0xFF
+        if first == last:
+            masks = ((row + first, head & tail),)
+        else:
+            masks = ((row + first, head), (row + last, tail))
+            if last - first > 1:
+                buffer[row + first + 1 : row + last] = (b"\xff" if fill else b"\x00") * (last - first - 1)
+        for index, mask in masks:
+            if fill:
+                buffer[index] |= mask
+            else:
+                buffer[index] &= ~mask & 0xFF
+
+    def rectangle(self, box: tuple[int, int, int, int], outline: int | None = None, fill: int | None = None) -> None:
+        x0, y0, x1, y1 = box
+        if fill is not None:
+            for y in range(y0, y1 + 1):
+                self.span(y, x0, x1 + 1, fill)
+        if outline is not None:
+            self.span(y0, x0, x1 + 1, outline)
+            self.span(y1, x0, x1 + 1, outline)
+            for y in range(y0 + 1, y1):
+                self.span(y, x0, x0 + 1, outline)
+                self.span(y, x1, x1 + 1, outline)
+
+    def text(self, x: int, y: int, text: str, scale: int = 1, fill: int = 0) -> None:
+        step = _ADVANCE * scale
+        for char in text:
+            if char != " ":
+                for dy, dx0, dx1 in _glyph_runs(char, scale):
+                    self.span(y + dy, x + dx0, x + dx1, fill)
+            x += step
+            if x >= self.width:
+                break
+
+    def center_text(self, text: str, scale: int, box: tuple[int, int, int, int]) -> None:
+        x0, y0, x1, y1 = box
+        x = x0 + max(0, (x1 - x0 - text_width(text, scale)) // 2)
+        y = y0 + max(0, (y1 - y0 - text_height(scale)) // 2)
+        self.text(x, y, text, scale)
+
+    def battery_bar(self, box: tuple[int, int, int, int], percent: int | None) -> None:
+        x0, y0, x1, y1 = box
+        if x1 <= x0 or y1 <= y0:
+            return
+        self.rectangle(box, outline=0, fill=1)
+        if percent is None:
+            return
+        pct = max(0, min(100, percent))
+        if x1 - 1 <= x0 + 1 or y1 - 1 <= y0 + 1:
+            return
+        fill_width = int((x1 - 1 - (x0 + 1)) * pct / 100)
+        self.rectangle((x0 + 1, y0 + 1, x0 + 1 + fill_width, y1 - 1), fill=0)
+
+
+@dataclass(frozen=True)
+class _BitmapLayout:
+    base: BitmapCanvas
+    slots: dict[str, Slot]
+    scales: dict[str, int]
+
+
+_LAYOUT_CACHE: dict[RenderConfig, _BitmapLayout] = {}
+_FRAME_CACHE: dict[str, object] = {}
+
+
+def _draw_text(
+    canvas: BitmapCanvas,
+    box: tuple[int, int, int, int],
+    text: str,
+    scale: int,
+    align: str = "left",
+    valign: str = "top",
+) -> None:
+    text = fit_text(text, scale, box[2] - box[0])
+    if not text:
+        return
+    x, y = place_text(box, text_width(text, scale), text_height(scale), align, valign)
+    canvas.text(x, y, text, scale)
+
+
+def _face_scale(box: tuple[int, int, int, int], scale: int) -> int:
+    x0, y0, x1, y1 = box
+    while scale > 1 and (text_width("(^_^)", scale) > x1 - x0 or text_height(scale) > y1 - y0):
+        scale -= 1
+    return scale
+
+
+def _status_layout(config: RenderConfig) -> _BitmapLayout:
+    cached = _LAYOUT_CACHE.get(config)
+    if cached is not None:
+        return cached
+    panel = select_panel(config.layout, config.width, config.height)
+    compiled = compile_layout(
+        panel,
+        config.width,
+        config.height,
+        config.font_size,
+        lambda size: text_height(_scale(size)),
+    )
+    scales = {role: _scale(size) for role, size in compiled.fonts.items()}
+    face = compiled.slots.get("face")
+    if face is not None:
+        scales[face.font] = _face_scale(face.box, scales[face.font])
+    base = BitmapCanvas(config.width, config.height)
+    for static in compiled.statics:
+        if static.kind == "rect":
+            base.rectangle(static.box, outline=0)
+        elif static.kind == "line":
+            base.rectangle(static.box, fill=0)
+        else:
+            _draw_text(base, static.box, static.text, scales[static.font], static.align, static.valign)
+    layout = _BitmapLayout(base=base, slots=compiled.slots, scales=scales)
+    _LAYOUT_CACHE[config] = layout
+    return layout
+
+
+def draw_status(config: RenderConfig, **values) -> BitmapCanvas:
+    layout = _status_layout(config)
+    canvas = layout.base.copy()
+    text = status_text(**values)
+    for name, slot in layout.slots.items():
+        scale = layout.scales.get(slot.font, 1)
+        if slot.kind == "bar":
+            canvas.battery_bar(slot.box, text.battery_percent)
+        elif slot.kind == "lines":
+            x0, y, x1, _ = slot.box
+            for line in text.visible_lines(slot.capacity):
+                _draw_text(canvas, (x0, y, x1, y + slot.step), line, scale)
+                y += slot.step
+        elif slot.kind == "metrics":
+            value_scale = layout.scales[slot.value_font]
+            for field, x0, x1 in slot.columns:
+                _draw_text(canvas, (x0, slot.value_top, x1, slot.box[3]), text.fields[field], value_scale, "center")
+        elif text.fields.get(name):
+            _draw_text(canvas, slot.box, text.fields[name], scale, slot.align, slot.valign)
+    return canvas
+
+
+def render_status_bitmap(
+    config: RenderConfig,
+    panel_size: tuple[int, int] | None = None,
+    **values,
+) -> PackedFrame:
+    panel = tuple(panel_size) if panel_size is not None else (config.width, config.height)
+    key = (config, panel, tuple(sorted(values.items())))
+    if _FRAME_CACHE.get("key") == key:
+        return _FRAME_CACHE["frame"]
+    width, height = panel if config.rotate % 180 == 0 else (panel[1], panel[0])
+    canvas = draw_status(replace(config, width=width, height=height, rotate=0), **values)
+    frame = pack_bytes(bytes(canvas.buffer), width, height, config.rotate, panel)
+    _FRAME_CACHE["key"] = key
+    _FRAME_CACHE["frame"] = frame
+    return frame
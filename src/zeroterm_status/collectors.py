@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2000, 5000)
+
+COST_CHEAP = "cheap"
+COST_BLOCKING = "blocking"
+
+
+@dataclass
+class Collector:
+    name: str
+    func: Callable[[], object]
+    period: float
+    cost: str = COST_BLOCKING
+    budget: float = 0.0
+    deadline: float = 1.0
+    on_wake: bool = False
+
+    def staleness_budget(self, period: float | None = None) -> float:
+        # ``period`` is the interval actually scheduled (scaled, or stretched
+        # by night/idle/low-battery), so a value never expires between runs.
+        effective = max(self.period, period or 0.0)
+        if self.budget > 0:
+            return self.budget * effective / self.period if self.period > 0 else self.budget
+        return max(3 * effective, 60.0)
+
+
+@dataclass
+class CollectorRegistry:
+    collectors: dict[str, Collector] = field(default_factory=dict)
+
+    def register(self, collector: Collector) -> Collector:
+        if collector.name in self.collectors:
+            raise ValueError(f"collector already registered: {collector.name}")
+        self.collectors[collector.name] = collector
+        return collector
+
+    def get(self, name: str) -> Collector | None:
+        return self.collectors.get(name)
+
+    def __iter__(self):
+        return iter(list(self.collectors.values()))
+
+    def __len__(self) -> int:
+        return len(self.collectors)
+
+
+def collector_periods(config) -> dict[str, float]:
+    base = float(config.interval)
+
+    def period(value: int) -> float:
+        return float(value) if value > 0 else base
+
+    return {
+        "wifi": period(config.wifi_interval),
+        "service": period(config.service_interval),
+        "battery": period(config.battery_interval),
+        "system": period(config.metrics_interval),
+        "time_sync": period(config.metrics_interval),
+        "update": base,
+        "update_fetch": period(config.update_interval),
+    }
+
+
+@dataclass(frozen=True)
+class Sample:
+    value: object
+    stale: bool
+    elapsed: float | None
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_ms: tuple[int, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        value = seconds * 1000
+        index = len(self.buckets_ms)
+        for position, bound in enumerate(self.buckets_ms):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.total += 1
+            self.max_ms = max(self.max_ms, value)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            counts = list(self.counts)
+        labels = [f"le{bound}" for bound in self.buckets_ms] + ["inf"]
+        return dict(zip(labels, counts))
+
+    def percentile(self, fraction: float) -> int | None:
+        with self._lock:
+            counts = list(self.counts)
+            total = self.total
+        if total == 0:
+            return None
+        target = fraction * total
+        seen = 0
+        for position, count in enumerate(counts):
+            seen += count
+            if seen >= target:
+                if position < len(self.buckets_ms):
+                    return self.buckets_ms[position]
+                break
+        return int(self.max_ms)
+
+    def summary(self) -> str:
+        buckets = " ".join(f"{label}={count}" for label, count in self.snapshot().items() if count)
+        return (
+            f"n={self.total} p50<={self.percentile(0.5)}ms p95<={self.percentile(0.95)}ms "
+            f"max={self.max_ms:.0f}ms [{buckets}]"
+        )
+
+
+class CollectorPool:
+    def __init__(self, max_workers: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zeroterm-collect")
+        self._pending: dict[str, tuple[Future, float]] = {}
+        self._last: dict[str, object] = {}
+        self.histogram = LatencyHistogram()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _submit(self, name: str, func: Callable[[], object]) -> tuple[Future, float]:
+        pending = self._pending.get(name)
+        if pending is not None:
+            # Still running, or finished since the last collect: either way
+            # its result has not been used yet.
+            return pending
+        submitted = (self._executor.submit(func), time.monotonic())
+        self._pending[name] = submitted
+        return submitted
+
+    def collect(self, jobs: dict[str, tuple[Callable[[], object], float]]) -> dict[str, Sample]:
+        start = time.monotonic()
+        futures = {name: self._submit(name, func) for name, (func, _) in jobs.items()}
+        samples: dict[str, Sample] = {}
+        for name, (_, deadline) in jobs.items():
+            future, submitted_at = futures[name]
+            remaining = start + deadline - time.monotonic()
+            try:
+                value = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                logger.warning("Collector %s missed its %.1fs deadline, using last value", name, deadline)
+                samples[name] = Sample(self._last.get(name), stale=True, elapsed=None)
+                continue
+            except Exception:
+                logger.exception("Collector %s failed", name)
+                self._pending.pop(name, None)
+                samples[name] = Sample(self._last.get(name), stale=True, elapsed=None)
+                continue
+            self._pending.pop(name, None)
+            self._last[name] = value
+            samples[name] = Sample(value, stale=False, elapsed=time.monotonic() - submitted_at)
+        self.histogram.record(time.monotonic() - start)
+        return samples
@@ -3,6 +3,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 import os
 
+DEFAULT_HISTORY_PATH = "/run/zeroterm/history.bin"
+DEFAULT_BATTERY_STORE_PATH = "/var/lib/zeroterm/battery.bin"
+DISABLED_VALUES = frozenset({"0", "off", "no", "none", "false"})
+
+
+def is_disabled(value: str | None) -> bool:
+    return value is not None and value.strip().lower() in DISABLED_VALUES
+
 
 @dataclass(frozen=True)
 class StatusConfig:
@@ -12,15 +20,24 @@ class StatusConfig:
     service_name: str
     epaper_driver: str
     epaper_model: str
+    epaper_renderer: str
+    epaper_layout: str | None
     epaper_rotate: int
     epaper_width: int
     epaper_height: int
     epaper_lib: str | None
     epaper_output: str | None
+    epaper_partial: bool
+    epaper_full_every: int
+    epaper_full_interval: int
+    epaper_sleep: bool
+    epaper_min_interval: int
+    epaper_sinks: str | None
     font_path: str | None
     font_size: int
     battery_path: str | None
     battery_cmd: str | None
+    battery_pisugar: str | None
     log_level: str
     night_start: int
     night_end: int
@@ -30,11 +47,18 @@ class StatusConfig:
     wifi_interval: int
     service_interval: int
     metrics_interval: int
+    battery_interval: int
+    adaptive_max: int
+    adaptive_hours: int
+    top_threshold: int
+    significance: bool
     idle_interval: int
     wifi_ssid: bool
-    battery_log_path: str | None
-    battery_log_interval: int
     power_log_path: str | None
+    history_path: str | None
+    battery_store_path: str | None
+    battery_store_interval: int
+    battery_store_max_kb: int
     update_check: bool
     update_interval: int
     update_path: str | None
@@ -74,6 +98,15 @@ def _env_path(name: str) -> str | None:
     return value
 
 
+def _env_address(name: str) -> str | None:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return None
+    if is_disabled(value):
+        return ""
+    return value.strip()
+
+
 def load_config() -> StatusConfig:
     profile = _env("ZEROTERM_STATUS_PROFILE", "").strip().lower()
     interval = max(5, _env_int("ZEROTERM_STATUS_INTERVAL", 30))
@@ -83,6 +116,12 @@ def load_config() -> StatusConfig:
 
     epaper_driver = _env("ZEROTERM_EPAPER_DRIVER", "waveshare")
     epaper_model = _env("ZEROTERM_EPAPER_MODEL", "epd2in13_V3")
+    epaper_renderer = _env("ZEROTERM_EPAPER_RENDERER", "auto").lower()
+    if epaper_renderer not in {"auto", "pillow", "bitmap"}:
+        epaper_renderer = "auto"
+    epaper_layout = _env("ZEROTERM_EPAPER_LAYOUT", "auto").lower()
+    if epaper_layout == "auto":
+        epaper_layout = None
     epaper_rotate = _env_int("ZEROTERM_EPAPER_ROTATE", 0)
     if epaper_rotate not in {0, 90, 180, 270}:
         epaper_rotate = 0
@@ -90,12 +129,19 @@ def load_config() -> StatusConfig:
     epaper_height = _env_int("ZEROTERM_EPAPER_HEIGHT", 122)
     epaper_lib = _env_path("ZEROTERM_EPAPER_LIB")
     epaper_output = _env_path("ZEROTERM_EPAPER_OUTPUT")
+    epaper_partial = _env_bool("ZEROTERM_EPAPER_PARTIAL", True)
+    epaper_full_every = max(0, _env_int("ZEROTERM_EPAPER_FULL_EVERY", 20))
+    epaper_full_interval = max(0, _env_int("ZEROTERM_EPAPER_FULL_INTERVAL", 3600))
+    epaper_sleep = _env_bool("ZEROTERM_EPAPER_SLEEP", True)
+    epaper_min_interval = max(0, _env_int("ZEROTERM_EPAPER_MIN_INTERVAL", 0))
+    epaper_sinks = _env_path("ZEROTERM_EPAPER_SINKS")
 
     font_path = _env_path("ZEROTERM_EPAPER_FONT_PATH")
     font_size = _env_int("ZEROTERM_EPAPER_FONT_SIZE", 14)
 
     battery_path = _env_path("ZEROTERM_BATTERY_PATH")
     battery_cmd = _env_path("ZEROTERM_BATTERY_CMD")
+    battery_pisugar = _env_address("ZEROTERM_BATTERY_PISUGAR")
 
     log_level = _env("ZEROTERM_LOG_LEVEL", "info").lower()
 
@@ -111,12 +157,27 @@ def load_config() -> StatusConfig:
     wifi_interval = max(0, _env_int("ZEROTERM_STATUS_WIFI_INTERVAL", 0))
     service_interval = max(0, _env_int("ZEROTERM_STATUS_SERVICE_INTERVAL", 0))
     metrics_interval = max(0, _env_int("ZEROTERM_STATUS_METRICS_INTERVAL", 0))
+    battery_interval = max(0, _env_int("ZEROTERM_STATUS_BATTERY_INTERVAL", 0))
+    adaptive_max = max(1, _env_int("ZEROTERM_STATUS_ADAPTIVE_MAX", 2))
+    adaptive_hours = max(1, _env_int("ZEROTERM_STATUS_ADAPTIVE_HOURS", 4))
+    top_threshold = max(0, _env_int("ZEROTERM_STATUS_TOP_THRESHOLD", 50))
+    significance = _env_bool("ZEROTERM_STATUS_SIGNIFICANCE", True)
     idle_interval = max(0, _env_int("ZEROTERM_STATUS_IDLE_INTERVAL", 0))
     wifi_ssid = _env_bool("ZEROTERM_STATUS_WIFI_SSID", True)
 
-    battery_log_path = _env_path("ZEROTERM_BATTERY_LOG_PATH")
-    battery_log_interval = max(0, _env_int("ZEROTERM_BATTERY_LOG_INTERVAL", 0))
     power_log_path = _env_path("ZEROTERM_POWER_LOG_PATH")
+    history_path = _env_address("ZEROTERM_STATUS_HISTORY_PATH")
+    if history_path is None:
+        history_path = DEFAULT_HISTORY_PATH
+    elif history_path == "":
+        history_path = None
+    battery_store_path = _env_address("ZEROTERM_BATTERY_STORE_PATH")
+    if battery_store_path is None:
+        battery_store_path = DEFAULT_BATTERY_STORE_PATH
+    elif battery_store_path == "":
+        battery_store_path = None
+    battery_store_interval = max(10, _env_int("ZEROTERM_BATTERY_STORE_INTERVAL", 300))
+    battery_store_max_kb = max(16, _env_int("ZEROTERM_BATTERY_STORE_MAX_KB", 512))
     update_check = _env_bool("ZEROTERM_UPDATE_CHECK", False)
     update_interval = max(0, _env_int("ZEROTERM_UPDATE_INTERVAL", 3600))
     update_path = _env_path("ZEROTERM_UPDATE_PATH") or "/opt/zeroterm"
@@ -130,6 +191,8 @@ def load_config() -> StatusConfig:
             "wifi_interval": 120,
             "service_interval": 60,
             "metrics_interval": 300,
+            "battery_interval": 120,
+            "adaptive_max": 4,
             "idle_interval": 180,
             "wifi_ssid": False,
             "night_interval": 300,
@@ -141,6 +204,8 @@ def load_config() -> StatusConfig:
             "wifi_interval": 30,
             "service_interval": 30,
             "metrics_interval": 60,
+            "battery_interval": 60,
+            "adaptive_max": 3,
             "idle_interval": 60,
             "wifi_ssid": True,
         },
@@ -149,6 +214,8 @@ def load_config() -> StatusConfig:
             "wifi_interval": 10,
             "service_interval": 10,
             "metrics_interval": 10,
+            "battery_interval": 10,
+            "adaptive_max": 1,
             "idle_interval": 0,
             "wifi_ssid": True,
         },
@@ -164,6 +231,10 @@ def load_config() -> StatusConfig:
             service_interval = max(0, preset.get("service_interval", service_interval))
         if "ZEROTERM_STATUS_METRICS_INTERVAL" not in os.environ:
             metrics_interval = max(0, preset.get("metrics_interval", metrics_interval))
+        if "ZEROTERM_STATUS_BATTERY_INTERVAL" not in os.environ:
+            battery_interval = max(0, preset.get("battery_interval", battery_interval))
+        if "ZEROTERM_STATUS_ADAPTIVE_MAX" not in os.environ:
+            adaptive_max = max(1, preset.get("adaptive_max", adaptive_max))
         if "ZEROTERM_STATUS_IDLE_INTERVAL" not in os.environ:
             idle_interval = max(0, preset.get("idle_interval", idle_interval))
         if "ZEROTERM_STATUS_WIFI_SSID" not in os.environ:
@@ -188,15 +259,24 @@ def load_config() -> StatusConfig:
         service_name=service_name,
         epaper_driver=epaper_driver,
         epaper_model=epaper_model,
+        epaper_renderer=epaper_renderer,
+        epaper_layout=epaper_layout,
         epaper_rotate=epaper_rotate,
         epaper_width=epaper_width,
         epaper_height=epaper_height,
         epaper_lib=epaper_lib,
         epaper_output=epaper_output,
+        epaper_partial=epaper_partial,
+        epaper_full_every=epaper_full_every,
+        epaper_full_interval=epaper_full_interval,
+        epaper_sleep=epaper_sleep,
+        epaper_min_interval=epaper_min_interval,
+        epaper_sinks=epaper_sinks,
         font_path=font_path,
         font_size=font_size,
         battery_path=battery_path,
         battery_cmd=battery_cmd,
+        battery_pisugar=battery_pisugar,
         log_level=log_level,
         night_start=night_start,
         night_end=night_end,
@@ -206,11 +286,18 @@ def load_config() -> StatusConfig:
         wifi_interval=wifi_interval,
         service_interval=service_interval,
         metrics_interval=metrics_interval,
+        battery_interval=battery_interval,
+        adaptive_max=adaptive_max,
+        adaptive_hours=adaptive_hours,
+        top_threshold=top_threshold,
+        significance=significance,
         idle_interval=idle_interval,
         wifi_ssid=wifi_ssid,
-        battery_log_path=battery_log_path,
-        battery_log_interval=battery_log_interval,
         power_log_path=power_log_path,
+        history_path=history_path,
+        battery_store_path=battery_store_path,
+        battery_store_interval=battery_store_interval,
+        battery_store_max_kb=battery_store_max_kb,
         update_check=update_check,
         update_interval=update_interval,
         update_path=update_path,
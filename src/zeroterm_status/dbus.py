@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import os
+import socket
+import struct
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_BUS_ADDRESS = "/run/dbus/system_bus_socket"
+
+MESSAGE_METHOD_CALL = 1
+MESSAGE_METHOD_RETURN = 2
+MESSAGE_ERROR = 3
+MESSAGE_SIGNAL = 4
+
+FIELD_PATH = 1
+FIELD_INTERFACE = 2
+FIELD_MEMBER = 3
+FIELD_ERROR_NAME = 4
+FIELD_REPLY_SERIAL = 5
+FIELD_DESTINATION = 6
+FIELD_SENDER = 7
+FIELD_SIGNATURE = 8
+
+_FIELD_TYPES = {
+    FIELD_PATH: "o",
+    FIELD_INTERFACE: "s",
+    FIELD_MEMBER: "s",
+    FIELD_ERROR_NAME: "s",
+    FIELD_REPLY_SERIAL: "u",
+    FIELD_DESTINATION: "s",
+    FIELD_SENDER: "s",
+    FIELD_SIGNATURE: "g",
+}
+
+DBUS_NAME = "org.freedesktop.DBus"
+DBUS_PATH = "/org/freedesktop/DBus"
+PROPERTIES_IFACE = "org.freedesktop.DBus.Properties"
+SYSTEMD_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+SYSTEMD_MANAGER_IFACE = "org.freedesktop.systemd1.Manager"
+SYSTEMD_UNIT_IFACE = "org.freedesktop.systemd1.Unit"
+
+_ALIGN = {
+    "y": 1,
+    "b": 4,
+    "n": 2,
+    "q": 2,
+    "i": 4,
+    "u": 4,
+    "x": 8,
+    "t": 8,
+    "d": 8,
+    "h": 4,
+    "s": 4,
+    "o": 4,
+    "g": 1,
+    "v": 1,
+    "a": 4,
+    "(": 8,
+    "{": 8,
+}
+_FIXED = {
+    "y": "<B",
+    "b": "<I",
+    "n": "<h",
+    "q": "<H",
+    "i": "<i",
+    "u": "<I",
+    "x": "<q",
+    "t": "<Q",
+    "d": "<d",
+    "h": "<I",
+}
+_MAX_MESSAGE = 1 << 20
+_RECONNECT_MIN = 1.0
+_RECONNECT_MAX = 60.0
+
+
+class DBusError(Exception):
+    pass
+
+
+@dataclass
+class Message:
+    type: int
+    serial: int
+    fields: dict[int, object]
+    body: list[object] = field(default_factory=list)
+    flags: int = 0
+
+    @property
+    def path(self) -> str | None:
+        return self.fields.get(FIELD_PATH)
+
+    @property
+    def interface(self) -> str | None:
+        return self.fields.get(FIELD_INTERFACE)
+
+    @property
+    def member(self) -> str | None:
+        return self.fields.get(FIELD_MEMBER)
+
+    @property
+    def reply_serial(self) -> int | None:
+        return self.fields.get(FIELD_REPLY_SERIAL)
+
+
+def _type_end(signature: str, index: int) -> int:
+    code = signature[index]
+    if code == "a":
+        return _type_end(signature, index + 1)
+    if code in "({":
+        closing = ")" if code == "(" else "}"
+        index += 1
+        while signature[index] != closing:
+            index = _type_end(signature, index)
+        return index + 1
+    return index + 1
+
+
+def split_signature(signature: str) -> list[str]:
+    types = []
+    index = 0
+    while index < len(signature):
+        end = _type_end(signature, index)
+        types.append(signature[index:end])
+        index = end
+    return types
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def align(self, size: int) -> None:
+        self.buf.extend(b"\0" * (-len(self.buf) % size))
+
+    def write(self, signature: str, value) -> None:
+        code = signature[0]
+        self.align(_ALIGN[code])
+        if code in _FIXED:
+            self.buf += struct.pack(_FIXED[code], int(value) if code == "b" else value)
+        elif code in "so":
+            data = value.encode("utf-8")
+            self.buf += struct.pack("<I", len(data)) + data + b"\0"
+        elif code == "g":
+            data = value.encode("ascii")
+            self.buf += bytes([len(data)]) + data + b"\0"
+        elif code == "v":
+            inner_signature, inner_value = value
+            self.write("g", inner_signature)
+            self.write(inner_signature, inner_value)
+        elif code == "a":
+            element = signature[1:]
+            length_at = len(self.buf)
+            self.buf += b"\0\0\0\0"
+            self.align(_ALIGN[element[0]])
+            start = len(self.buf)
+            items = value.items() if element[0] == "{" else value
+            for item in items:
+                self.write(element, item)
+            struct.pack_into("<I", self.buf, length_at, len(self.buf) - start)
+        elif code in "({":
+            for part, item in zip(split_signature(signature[1:-1]), value):
+                self.write(part, item)
+        else:
+            raise DBusError(f"unsupported signature {signature}")
+
+
+class _Reader:
+    def __init__(self, buf, offset: int = 0) -> None:
+        self.buf = buf
+        self.offset = offset
+
+    def align(self, size: int) -> None:
+        self.offset += -self.offset % size
+
+    def read(self, signature: str):
+        code = signature[0]
+        self.align(_ALIGN[code])
+        if code in _FIXED:
+            fmt = _FIXED[code]
+            (value,) = struct.unpack_from(fmt, self.buf, self.offset)
+            self.offset += struct.calcsize(fmt)
+            return bool(value) if code == "b" else value
+        if code in "so":
+            (length,) = struct.unpack_from("<I", self.buf, self.offset)
+            start = self.offset + 4
+            self.offset = start + length + 1
+            return bytes(self.buf[start : start + length]).decode("utf-8", errors="replace")
+        if code == "g":
+            length = self.buf[self.offset]
+            start = self.offset + 1
+            self.offset = start + length + 1
+            return bytes(self.buf[start : start + length]).decode("ascii")
+        if code == "v":
+            return self.read(self.read("g"))
+        if code == "a":
+            (length,) = struct.unpack_from("<I", self.buf, self.offset)
+            self.offset += 4
+            element = signature[1:]
+            self.align(_ALIGN[element[0]])
+            end = self.offset + length
+            items = []
+            while self.offset < end:
+                items.append(self.read(element))
+            return dict(items) if element[0] == "{" else items
+        if code in "({":
+            return tuple(self.read(part) for part in split_signature(signature[1:-1]))
+        raise DBusError(f"unsupported signature {signature}")
+
+
+def build_message(
+    msg_type: int,
+    serial: int,
+    fields: dict[int, object],
+    signature: str = "",
+    body: tuple | list = (),
+    flags: int = 0,
+) -> bytes:
+    body_writer = _Writer()
+    for part, value in zip(split_signature(signature), body):
+        body_writer.write(part, value)
+    header_fields = dict(fields)
+    if signature:
+        header_fields[FIELD_SIGNATURE] = signature
+    header = _Writer()
+    for value in (ord("l"), msg_type, flags, 1):
+        header.write("y", value)
+    header.write("u", len(body_writer.buf))
+    header.write("u", serial)
+    header.write(
+        "a(yv)",
+        [(code, (_FIELD_TYPES[code], value)) for code, value in sorted(header_fields.items())],
+    )
+    header.align(8)
+    return bytes(header.buf + body_writer.buf)
+
+
+def parse_message(buf) -> tuple[Message, int] | None:
+    if len(buf) < 16:
+        return None
+    if buf[0] != ord("l"):
+        raise DBusError("big-endian D-Bus messages are not supported")
+    body_length, serial, fields_length = struct.unpack_from("<III", buf, 4)
+    header_length = 16 + fields_length
+    header_length += -header_length % 8
+    total = header_length + body_length
+    if total > _MAX_MESSAGE:
+        raise DBusError("D-Bus message too large")
+    if len(buf) < total:
+        return None
+    reader = _Reader(buf, 12)
+    fields = dict(reader.read("a(yv)"))
+    reader.offset = header_length
+    signature = fields.get(FIELD_SIGNATURE, "")
+    body = [reader.read(part) for part in split_signature(signature)]
+    return Message(type=buf[1], serial=serial, fields=fields, body=body, flags=buf[2]), total
+
+
+def unit_object_path(unit: str) -> str:
+    if not unit:
+        return f"{SYSTEMD_PATH}/unit/_"
+    escaped = []
+    for index, char in enumerate(unit):
+        if char.isascii() and (char.isalpha() or (char.isdigit() and index > 0)):
+            escaped.append(char)
+        else:
+            escaped.extend(f"_{byte:02x}" for byte in char.encode("utf-8"))
+    return f"{SYSTEMD_PATH}/unit/{''.join(escaped)}"
+
+
+class DBusConnection:
+    def __init__(self, address: str = SYSTEM_BUS_ADDRESS, timeout: float = 5.0) -> None:
+        self._address = address
+        self._timeout = timeout
+        self._sock: socket.socket | None = None
+        self._buffer = bytearray()
+        self._serial = 0
+        self._queued: list[Message] = []
+        self.unique_name: str | None = None
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self._timeout)
+        try:
+            sock.connect(self._address)
+            self._sock = sock
+            self._authenticate()
+            reply = self.call(DBUS_NAME, DBUS_PATH, DBUS_NAME, "Hello")
+        except (OSError, DBusError):
+            self.close()
+            raise
+        self.unique_name = str(reply[0]) if reply else None
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._buffer.clear()
+        self._queued.clear()
+
+    def _require_socket(self) -> socket.socket:
+        if self._sock is None:
+            raise DBusError("D-Bus connection is closed")
+        return self._sock
+
+    def _recv(self) -> None:
+        chunk = self._require_socket().recv(4096)
+        if not chunk:
+            raise DBusError("D-Bus connection closed by peer")
+        self._buffer += chunk
+
+    def _read_auth_line(self) -> str:
+        while b"\r\n" not in self._buffer:
+            if len(self._buffer) > 1024:
+                raise DBusError("D-Bus authentication line too long")
+            self._recv()
+        index = self._buffer.index(b"\r\n")
+        line = bytes(self._buffer[:index]).decode("ascii", errors="replace")
+        del self._buffer[: index + 2]
+        return line
+
+    def _authenticate(self) -> None:
+        sock = self._require_socket()
+        uid = str(os.getuid()).encode("ascii").hex()
+        sock.sendall(b"\0AUTH EXTERNAL " + uid.encode("ascii") + b"\r\n")
+        line = self._read_auth_line()
+        if not line.startswith("OK "):
+            raise DBusError(f"D-Bus authentication rejected: {line}")
+        sock.sendall(b"BEGIN\r\n")
+
+    def read_message(self, timeout: float | None = None) -> Message:
+        sock = self._require_socket()
+        sock.settimeout(timeout)
+        while True:
+            parsed = parse_message(self._buffer)
+            if parsed is not None:
+                message, consumed = parsed
+                del self._buffer[:consumed]
+                return message
+            self._recv()
+
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        body: tuple | list = (),
+    ) -> list[object]:
+        self._serial += 1
+        serial = self._serial
+        fields = {
+            FIELD_PATH: path,
+            FIELD_INTERFACE: interface,
+            FIELD_MEMBER: member,
+            FIELD_DESTINATION: destination,
+        }
+        self._require_socket().sendall(
+            build_message(MESSAGE_METHOD_CALL, serial, fields, signature, body)
+        )
+        while True:
+            message = self.read_message(self._timeout)
+            if message.reply_serial == serial and message.type == MESSAGE_METHOD_RETURN:
+                return message.body
+            if message.reply_serial == serial and message.type == MESSAGE_ERROR:
+                name = message.fields.get(FIELD_ERROR_NAME, "error")
+                detail = message.body[0] if message.body else ""
+                raise DBusError(f"{name}: {detail}")
+            if message.type == MESSAGE_SIGNAL:
+                self._queued.append(message)
+
+    def next_signal(self) -> Message:
+        if self._queued:
+            return self._queued.pop(0)
+        while True:
+            message = self.read_message(None)
+            if message.type == MESSAGE_SIGNAL:
+                return message
+
+
+class ServiceWatcher:
+    def __init__(
+        self,
+        unit: str,
+        on_change: Callable[[], None] | None = None,
+        address: str = SYSTEM_BUS_ADDRESS,
+    ) -> None:
+        self.unit = unit
+        self.path = unit_object_path(unit)
+        self._on_change = on_change
+        self._address = address
+        self._conn: DBusConnection | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.state: str | None = None
+        self.ready = False
+
+    def start(self) -> bool:
+        try:
+            self._connect()
+        except (OSError, DBusError) as exc:
+            logger.debug("D-Bus watcher unavailable for %s: %s", self.unit, exc)
+            return False
+        self._thread = threading.Thread(target=self._run, name="zeroterm-dbus", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.ready = False
+        if self._conn is not None:
+            self._conn.close()
+
+    def _connect(self) -> None:
+        conn = DBusConnection(self._address)
+        conn.connect()
+        try:
+            conn.call(SYSTEMD_NAME, SYSTEMD_PATH, SYSTEMD_MANAGER_IFACE, "Subscribe")
+            rule = (
+                f"type='signal',sender='{SYSTEMD_NAME}',path='{self.path}',"
+                f"interface='{PROPERTIES_IFACE}',member='PropertiesChanged'"
+            )
+            conn.call(DBUS_NAME, DBUS_PATH, DBUS_NAME, "AddMatch", "s", [rule])
+            self._conn = conn
+            self._refresh()
+        except (OSError, DBusError):
+            conn.close()
+            self._conn = None
+            raise
+        self.ready = True
+
+    def _refresh(self) -> None:
+        if self._conn is None:
+            return
+        reply = self._conn.call(
+            SYSTEMD_NAME,
+            self.path,
+            PROPERTIES_IFACE,
+            "Get",
+            "ss",
+            [SYSTEMD_UNIT_IFACE, "ActiveState"],
+        )
+        self._set_state(str(reply[0]) if reply else None)
+
+    def _set_state(self, state: str | None) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        if self._on_change is not None:
+            self._on_change()
+
+    def _handle_signal(self, message: Message) -> None:
+        if message.member != "PropertiesChanged" or message.path != self.path:
+            return
+        if len(message.body) < 3 or message.body[0] != SYSTEMD_UNIT_IFACE:
+            return
+        changed = message.body[1]
+        invalidated = message.body[2]
+        if isinstance(changed, dict) and "ActiveState" in changed:
+            self._set_state(str(changed["ActiveState"]))
+        elif isinstance(invalidated, list) and "ActiveState" in invalidated:
+            self._refresh()
+
+    def _run(self) -> None:
+        backoff = _RECONNECT_MIN
+        while not self._stop.is_set():
+            try:
+                if self._conn is None:
+                    self._connect()
+                    backoff = _RECONNECT_MIN
+                self._handle_signal(self._conn.next_signal())
+            except (OSError, DBusError) as exc:
+                if self._stop.is_set():
+                    return
+                logger.debug("D-Bus watcher for %s lost connection: %s", self.unit, exc)
+                self.ready = False
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                self._stop.wait(backoff)
+                backoff = min(_RECONNECT_MAX, backoff * 2)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+_MIN_SAMPLES = 3
+
+
+@dataclass(frozen=True)
+class Estimate:
+    rate_per_hour: float | None
+    time_to_empty: int | None
+    time_to_full: int | None
+
+
+def _direction(status: str | None) -> int:
+    value = (status or "").strip().lower()
+    if "discharg" in value:
+        return -1
+    if "charg" in value:
+        return 1
+    return 0
+
+
+class DischargeModel:
+    def __init__(self, window: float = 3600.0, min_span: float = 600.0, max_samples: int = 720) -> None:
+        self.window = window
+        self.min_span = min_span
+        self._samples: deque[tuple[float, float]] = deque(maxlen=max_samples)
+        self._direction = 0
+        self._last_percent: float | None = None
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def add(self, timestamp: float, percent: int | float | None, status: str | None = None) -> None:
+        if percent is None:
+            return
+        direction = _direction(status)
+        if direction != self._direction:
+            self._samples.clear()
+            self._direction = direction
+        if self._samples and timestamp <= self._samples[-1][0]:
+            if timestamp < self._samples[-1][0]:
+                self._samples.clear()
+            else:
+                return
+        self._samples.append((timestamp, float(percent)))
+        self._last_percent = float(percent)
+        cutoff = timestamp - self.window
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def rate(self) -> float | None:
+        if len(self._samples) < _MIN_SAMPLES:
+            return None
+        first = self._samples[0][0]
+        span = self._samples[-1][0] - first
+        if span < self.min_span:
+            return None
+        count = len(self._samples)
+        mean_t = sum(t - first for t, _ in self._samples) / count
+        mean_p = sum(p for _, p in self._samples) / count
+        numerator = 0.0
+        denominator = 0.0
+        for t, p in self._samples:
+            dt = t - first - mean_t
+            numerator += dt * (p - mean_p)
+            denominator += dt * dt
+        if denominator <= 0:
+            return None
+        return numerator / denominator * 3600
+
+    def estimate(self) -> Estimate:
+        rate = self.rate()
+        percent = self._last_percent
+        if rate is None or percent is None:
+            return Estimate(rate_per_hour=rate, time_to_empty=None, time_to_full=None)
+        time_to_empty = None
+        time_to_full = None
+        if rate < -0.05 and self._direction <= 0:
+            time_to_empty = int(percent / -rate * 3600)
+        elif rate > 0.05 and self._direction >= 0:
+            time_to_full = int(max(0.0, 100 - percent) / rate * 3600)
+        return Estimate(rate_per_hour=round(rate, 2), time_to_empty=time_to_empty, time_to_full=time_to_full)
+
+
+def interval_scale(time_to_empty: int | None, reference: float, max_scale: float) -> float:
+    if time_to_empty is None or max_scale <= 1 or reference <= 0:
+        return 1.0
+    if time_to_empty <= 0:
+        return max_scale
+    return max(1.0, min(max_scale, reference / time_to_empty))
+
+
+def format_duration(seconds: int | None) -> str | None:
+    if seconds is None or seconds < 0:
+        return None
+    minutes = seconds // 60
+    hours, minutes = divmod(minutes, 60)
+    if hours >= 100:
+        return ">99h"
+    if hours:
+        return f"{hours}h{minutes - minutes % 10:02d}"
+    return f"{minutes}m"
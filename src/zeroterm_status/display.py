@@ -4,20 +4,78 @@ import logging
 
 from .config import StatusConfig
 from .drivers.base import BaseDisplay
+from .drivers.composite import CompositeDisplay, Sink
 from .drivers.file import FileDisplay
 from .drivers.null import NullDisplay
+from .drivers.raw import RawDisplay
 from .drivers.waveshare import WaveshareDisplay
+from .refresh import RefreshPolicy
 
 logger = logging.getLogger(__name__)
 
 
+def refresh_policy(config: StatusConfig) -> RefreshPolicy:
+    return RefreshPolicy(
+        partial=config.epaper_partial,
+        full_every=config.epaper_full_every,
+        full_interval=float(config.epaper_full_interval),
+    )
+
+
+def parse_sinks(spec: str | None) -> list[tuple[str, str, float]]:
+    """Parse ``kind:path[@min_seconds]`` entries separated by commas."""
+    sinks = []
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        kind, _, target = entry.partition(":")
+        interval = 0.0
+        path, at, limit = target.rpartition("@")
+        if at:
+            try:
+                interval = max(0.0, float(limit))
+                target = path
+            except ValueError:
+                pass
+        if not target:
+            logger.warning("Ignoring e-paper sink '%s' without a path", entry)
+            continue
+        sinks.append((kind.strip().lower(), target, interval))
+    return sinks
+
+
 def create_display(config: StatusConfig) -> BaseDisplay:
+    display = _create_driver(config)
+    extra = parse_sinks(config.epaper_sinks)
+    if not extra and config.epaper_min_interval <= 0:
+        return display
+    sinks = [Sink(config.epaper_driver or "panel", display, float(config.epaper_min_interval))]
+    for kind, path, interval in extra:
+        if kind == "file":
+            # Previews are written upright rather than in panel orientation.
+            output = FileDisplay(config.epaper_width, config.epaper_height, path, model=config.epaper_model)
+            sinks.append(Sink(path, output, interval, rotate=(-config.epaper_rotate) % 360))
+        elif kind == "raw":
+            sinks.append(Sink(path, RawDisplay(config.epaper_width, config.epaper_height, path), interval))
+        else:
+            logger.warning("Unknown e-paper sink '%s', ignoring", kind)
+    return CompositeDisplay(sinks)
+
+
+def _create_driver(config: StatusConfig) -> BaseDisplay:
     driver = (config.epaper_driver or "").lower()
     if driver == "file":
         output = config.epaper_output or "/var/lib/zeroterm/epaper.png"
-        return FileDisplay(config.epaper_width, config.epaper_height, output)
+        return FileDisplay(
+            config.epaper_width,
+            config.epaper_height,
+            output,
+            model=config.epaper_model,
+            policy=refresh_policy(config),
+        )
     if driver == "waveshare":
-        return WaveshareDisplay(config.epaper_model, config.epaper_lib)
+        return WaveshareDisplay(config.epaper_model, config.epaper_lib, policy=refresh_policy(config))
     if driver == "null":
         return NullDisplay(config.epaper_width, config.epaper_height)
 
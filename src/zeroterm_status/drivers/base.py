@@ -10,6 +10,8 @@ class DisplayError(RuntimeError):
 class BaseDisplay(ABC):
     width: int
     height: int
+    # Drivers that take a PackedFrame (panel-native 1bpp buffer) in show().
+    accepts_frames = False
 
     @abstractmethod
     def init(self) -> None:
@@ -21,4 +23,8 @@ class BaseDisplay(ABC):
 
     @abstractmethod
     def sleep(self) -> None:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def due_in(self) -> float | None:
+        # Seconds until a rate-limited frame from the last show() is due again.
+        return None
\ No newline at end of file
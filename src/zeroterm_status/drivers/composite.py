@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Callable
+
+from ..framebuffer import PackedFrame, rotate
+from .base import BaseDisplay, DisplayError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SinkStats:
+    shown: int = 0
+    unchanged: int = 0
+    limited: int = 0
+    failures: int = 0
+
+    def summary(self) -> str:
+        return f"shown={self.shown} unchanged={self.unchanged} limited={self.limited} failures={self.failures}"
+
+
+@dataclass
+class Sink:
+    name: str
+    display: BaseDisplay
+    min_interval: float = 0.0
+    # Applied to the panel-native frame before it reaches this sink.
+    rotate: int = 0
+    stats: SinkStats = field(default_factory=SinkStats)
+    ready: bool = False
+    held: bool = False
+    last: object = None
+    shown_at: float | None = None
+    retry_at: float = 0.0
+    backoff: float = 0.0
+
+
+class CompositeDisplay(BaseDisplay):
+    """Fans each frame out to several sinks, each with its own rate limit.
+
+    The first sink is the primary one: it sets the frame size, provides the
+    refresh and power stats, and is the only one whose failures raise
+    ``DisplayError``. Other sinks log failures and retry their own init.
+    """
+
+    accepts_frames = True
+    backoff_min = 5.0
+    backoff_max = 60.0
+
+    def __init__(self, sinks: list[Sink], clock: Callable[[], float] = time.monotonic) -> None:
+        if not sinks:
+            raise ValueError("composite display needs at least one sink")
+        self.sinks = sinks
+        self._clock = clock
+
+    @property
+    def width(self) -> int:
+        return self.sinks[0].display.width
+
+    @property
+    def height(self) -> int:
+        return self.sinks[0].display.height
+
+    @property
+    def refresh_stats(self):
+        return getattr(self.sinks[0].display, "refresh_stats", None)
+
+    @property
+    def power_stats(self):
+        return getattr(self.sinks[0].display, "power_stats", None)
+
+    def summary(self) -> str:
+        return " | ".join(f"{sink.name} {sink.stats.summary()}" for sink in self.sinks)
+
+    def init(self) -> None:
+        primary = self.sinks[0]
+        if not primary.ready:
+            primary.display.init()
+            primary.ready = True
+            primary.last = None
+        now = self._clock()
+        for sink in self.sinks[1:]:
+            if not sink.ready:
+                self._init_secondary(sink, now)
+
+    def replace_primary(self, display: BaseDisplay) -> None:
+        """Swaps in an initialised stand-in for a primary that failed to init."""
+        primary = self.sinks[0]
+        primary.display = display
+        primary.ready = True
+        primary.last = None
+        primary.shown_at = None
+        primary.held = False
+        self.init()
+
+    def show(self, image) -> None:
+        now = self._clock()
+        primary = self.sinks[0]
+        error = None
+        for sink in self.sinks:
+            if not sink.ready:
+                if sink is primary:
+                    error = DisplayError(f"{sink.name}: not initialized")
+                    continue
+                if now < sink.retry_at or not self._init_secondary(sink, now):
+                    continue
+            if image is sink.last or image == sink.last:
+                sink.stats.unchanged += 1
+                sink.held = False
+                continue
+            if sink.shown_at is not None and now - sink.shown_at < sink.min_interval:
+                sink.stats.limited += 1
+                sink.held = True
+                continue
+            try:
+                sink.display.show(self._frame_for(sink, image))
+            except DisplayError as exc:
+                sink.stats.failures += 1
+                sink.ready = False
+                sink.held = False
+                sink.last = None
+                if sink is primary:
+                    error = exc
+                else:
+                    self._schedule_retry(sink, now)
+                    logger.error("Display sink %s failed: %s", sink.name, exc)
+                continue
+            sink.stats.shown += 1
+            sink.last = image
+            sink.shown_at = now
+            sink.held = False
+            sink.backoff = 0.0
+        if error is not None:
+            raise error
+
+    def _init_secondary(self, sink: Sink, now: float) -> bool:
+        try:
+            sink.display.init()
+        except DisplayError as exc:
+            sink.stats.failures += 1
+            self._schedule_retry(sink, now)
+            logger.error("Display sink %s init failed (retry in %.0fs): %s", sink.name, sink.backoff, exc)
+            return False
+        sink.ready = True
+        sink.last = None
+        return True
+
+    def _schedule_retry(self, sink: Sink, now: float) -> None:
+        sink.backoff = min(self.backoff_max, max(self.backoff_min, sink.backoff * 2))
+        sink.retry_at = now + sink.backoff
+
+    def due_in(self) -> float | None:
+        due = [sink.shown_at + sink.min_interval for sink in self.sinks if sink.held and sink.ready]
+        if not due:
+            return None
+        return max(0.0, min(due) - self._clock())
+
+    def sleep(self) -> None:
+        for sink in self.sinks:
+            if sink.ready:
+                sink.display.sleep()
+
+    @staticmethod
+    def _frame_for(sink: Sink, image):
+        if not sink.rotate:
+            if isinstance(image, PackedFrame) and not sink.display.accepts_frames:
+                return image.to_image()
+            return image
+        frame = image if isinstance(image, PackedFrame) else PackedFrame.from_image(image)
+        data, width, height = rotate(frame.data, frame.width, frame.height, sink.rotate)
+        frame = PackedFrame(width, height, data)
+        return frame if sink.display.accepts_frames else frame.to_image()
@@ -1,21 +1,88 @@
 from __future__ import annotations
 
+import importlib.util
+import logging
+import os
 from pathlib import Path
 
-from .base import BaseDisplay
+from ..framebuffer import PackedFrame
+from ..panelpower import PanelPower
+from ..refresh import SKIP, PartialRefresher, RefreshPolicy, model_cost
+from .base import BaseDisplay, DisplayError
+
+logger = logging.getLogger(__name__)
 
 
 class FileDisplay(BaseDisplay):
-    def __init__(self, width: int, height: int, output_path: str) -> None:
+    accepts_frames = True
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        output_path: str,
+        model: str | None = None,
+        policy: RefreshPolicy | None = None,
+    ) -> None:
         self.width = width
         self.height = height
         self._output = Path(output_path)
+        if self._output.suffix.lower() != ".pbm" and importlib.util.find_spec("PIL") is None:
+            pbm = self._output.with_suffix(".pbm")
+            logger.warning("Pillow is not installed; writing %s instead of %s", pbm, self._output)
+            self._output = pbm
+        self._cost = model_cost(model)
+        self._refresher = PartialRefresher(policy or RefreshPolicy(), self._cost.partial_seconds is not None)
+        self._power = PanelPower(simulated_wake=self._cost.wake_seconds)
+
+    @property
+    def refresh_stats(self):
+        return self._refresher.stats
+
+    @property
+    def power_stats(self):
+        return self._power.stats
 
     def init(self) -> None:
-        self._output.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._output.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            raise DisplayError(f"cannot create {self._output.parent}: {exc}") from exc
+        self._refresher.reset()
+        self._power.init()
 
     def show(self, image) -> None:
-        image.save(self._output, format="PNG")
+        plan = self._refresher.plan(image)
+        seconds = self._cost.seconds(plan.mode)
+        if plan.mode != SKIP and self._power.wake():
+            seconds += self._cost.wake_seconds
+        energy = self._cost.energy_mj(seconds)
+        self._refresher.commit(plan, image, seconds, energy)
+        if plan.mode == SKIP:
+            return
+        # Written via a temp file so readers (the web UI) never see a partial image.
+        temp = self._output.with_name(f".{self._output.name}.tmp")
+        try:
+            if self._output.suffix.lower() == ".pbm":
+                frame = image if isinstance(image, PackedFrame) else PackedFrame.from_image(image)
+                temp.write_bytes(frame.to_pbm())
+            else:
+                if isinstance(image, PackedFrame):
+                    image = image.to_image()
+                image.save(temp, format="PNG")
+            os.replace(temp, self._output)
+        except OSError as exc:
+            raise DisplayError(f"cannot write {self._output}: {exc}") from exc
+        logger.info(
+            "Simulated %s refresh (%s): %d rects %.0f%% area %.2fs %.1fmJ; %s",
+            plan.mode,
+            plan.reason,
+            len(plan.rects),
+            plan.area * 100,
+            seconds,
+            energy,
+            self._refresher.stats.summary(),
+        )
 
     def sleep(self) -> None:
-        return None
\ No newline at end of file
+        self._power.sleep()
@@ -1,18 +1,32 @@
 from __future__ import annotations
 
+from ..panelpower import PanelPower
+from ..refresh import DEFAULT_COST
 from .base import BaseDisplay
 
 
 class NullDisplay(BaseDisplay):
+    accepts_frames = True
+
     def __init__(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
+        self._last = None
+        self._power = PanelPower(simulated_wake=DEFAULT_COST.wake_seconds)
+
+    @property
+    def power_stats(self):
+        return self._power.stats
 
     def init(self) -> None:
-        return None
+        self._last = None
+        self._power.init()
 
     def show(self, image) -> None:
-        return None
+        if image == self._last:
+            return
+        self._power.wake()
+        self._last = image
 
     def sleep(self) -> None:
-        return None
\ No newline at end of file
+        self._power.sleep()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from ..framebuffer import PackedFrame
+from .base import BaseDisplay, DisplayError
+
+
+class RawDisplay(BaseDisplay):
+    """Writes the packed 1bpp buffer as-is: no header, panel orientation."""
+
+    accepts_frames = True
+
+    def __init__(self, width: int, height: int, output_path: str) -> None:
+        self.width = width
+        self.height = height
+        self._output = Path(output_path)
+
+    def init(self) -> None:
+        try:
+            self._output.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            raise DisplayError(f"cannot create {self._output.parent}: {exc}") from exc
+
+    def show(self, image) -> None:
+        frame = image if isinstance(image, PackedFrame) else PackedFrame.from_image(image)
+        temp = self._output.with_name(f".{self._output.name}.tmp")
+        try:
+            temp.write_bytes(frame.data)
+            os.replace(temp, self._output)
+        except OSError as exc:
+            raise DisplayError(f"cannot write {self._output}: {exc}") from exc
+
+    def sleep(self) -> None:
+        return None
@@ -1,40 +1,106 @@
 from __future__ import annotations
 
 import importlib
+import logging
 import sys
+import time
 
+from ..framebuffer import PackedFrame
+from ..panelpower import PanelPower
+from ..refresh import PARTIAL, SKIP, PartialRefresher, RefreshPolicy, model_cost
 from .base import BaseDisplay, DisplayError
 
+logger = logging.getLogger(__name__)
+
 
 class WaveshareDisplay(BaseDisplay):
-    def __init__(self, model: str, lib_path: str | None = None) -> None:
+    accepts_frames = True
+
+    def __init__(self, model: str, lib_path: str | None = None, policy: RefreshPolicy | None = None) -> None:
         self._model = model
         self._lib_path = lib_path
+        self._policy = policy or RefreshPolicy()
         self._epd = None
+        self._refresher: PartialRefresher | None = None
+        self._cost = model_cost(model)
+        self._power = PanelPower()
         self.width = 0
         self.height = 0
 
+    @property
+    def refresh_stats(self):
+        return self._refresher.stats if self._refresher is not None else None
+
+    @property
+    def power_stats(self):
+        return self._power.stats
+
     def init(self) -> None:
         try:
             if self._lib_path and self._lib_path not in sys.path:
                 sys.path.insert(0, self._lib_path)
             module = importlib.import_module(f"waveshare_epd.{self._model}")
             self._epd = module.EPD()
-            self._epd.init()
+            self._power.init(self._epd.init)
             self.width = int(getattr(self._epd, "width", 0))
             self.height = int(getattr(self._epd, "height", 0))
         except Exception as exc:
             raise DisplayError(f"Failed to initialize waveshare driver {self._model}: {exc}")
+        supported = hasattr(self._epd, "displayPartial") and hasattr(self._epd, "displayPartBaseImage")
+        if self._refresher is None:
+            self._refresher = PartialRefresher(self._policy, supported)
+        else:
+            self._refresher.partial_supported = supported and self._policy.partial
+            self._refresher.reset()
 
     def show(self, image) -> None:
-        if self._epd is None:
+        if self._epd is None or self._refresher is None:
             raise DisplayError("waveshare display not initialized")
-        self._epd.display(self._epd.getbuffer(image))
+        if isinstance(image, PackedFrame) and image.size != (self.width, self.height):
+            raise DisplayError(
+                f"frame is {image.width}x{image.height}, panel is {self.width}x{self.height}"
+            )
+        plan = self._refresher.plan(image)
+        if plan.mode == SKIP:
+            self._refresher.commit(plan, image, 0.0, 0.0)
+            return
+        start = time.monotonic()
+        try:
+            if isinstance(image, PackedFrame):
+                buffer = image.data
+            else:
+                buffer = self._epd.getbuffer(image)
+            # A full refresh on partial-capable panels re-inits anyway, so that
+            # init doubles as the wake. The vendor sleep() uses deep-sleep
+            # mode 1, which keeps controller RAM, so partials can follow a wake.
+            if plan.mode == PARTIAL:
+                self._power.wake(self._epd.init)
+                self._epd.displayPartial(buffer)
+            elif self._refresher.partial_supported:
+                if not self._power.wake(self._epd.init):
+                    self._epd.init()
+                self._epd.displayPartBaseImage(buffer)
+            else:
+                self._power.wake(self._epd.init)
+                self._epd.display(buffer)
+        except Exception as exc:
+            self._refresher.reset()
+            raise DisplayError(f"waveshare {plan.mode} refresh failed: {exc}")
+        elapsed = time.monotonic() - start
+        self._refresher.commit(plan, image, elapsed, self._cost.energy_mj(elapsed))
+        logger.debug(
+            "%s refresh (%s) %d rects %.0f%% area in %.2fs",
+            plan.mode,
+            plan.reason,
+            len(plan.rects),
+            plan.area * 100,
+            elapsed,
+        )
 
     def sleep(self) -> None:
         if self._epd is None:
             return
         try:
-            self._epd.sleep()
+            self._power.sleep(self._epd.sleep)
         except Exception:
-            return
\ No newline at end of file
+            return
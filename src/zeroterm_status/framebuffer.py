@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+_BIT_REVERSE = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+_INVERT = bytes(255 - value for value in range(256))
+
+
+# 1bpp, MSB first, 1 = white, rows padded to a byte with zero bits: the layout
+# PIL's "1" mode packs to and the Waveshare getbuffer() buffers use.
+@dataclass(frozen=True)
+class PackedFrame:
+    width: int
+    height: int
+    data: bytes
+
+    @property
+    def stride(self) -> int:
+        return (self.width + 7) // 8
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    @classmethod
+    def from_image(cls, image) -> PackedFrame:
+        if image.mode != "1":
+            image = image.convert("1")
+        width, height = image.size
+        return cls(width, height, image.tobytes())
+
+    def to_image(self):
+        from PIL import Image
+
+        return Image.frombytes("1", (self.width, self.height), self.data)
+
+    def to_pbm(self) -> bytes:
+        # Binary PBM (P4) uses the same row packing with 1 = black.
+        return b"P4\n%d %d\n" % (self.width, self.height) + self.data.translate(_INVERT)
+
+
+def _stride(width: int) -> int:
+    return (width + 7) // 8
+
+
+def mirror(data: bytes, width: int, height: int) -> bytes:
+    stride = _stride(width)
+    pad = stride * 8 - width
+    mask = (1 << (stride * 8)) - 1
+    rows = []
+    for offset in range(0, stride * height, stride):
+        row = data[offset : offset + stride][::-1].translate(_BIT_REVERSE)
+        if pad:
+            value = (int.from_bytes(row, "big") << pad) & mask
+            row = value.to_bytes(stride, "big")
+        rows.append(row)
+    return b"".join(rows)
+
+
+def flip(data: bytes, width: int, height: int) -> bytes:
+    stride = _stride(width)
+    return b"".join(data[offset : offset + stride] for offset in range((height - 1) * stride, -1, -stride))
+
+
+def _transpose8(value: int) -> int:
+    t = (value ^ (value >> 7)) & 0x00AA00AA00AA00AA
+    value ^= t ^ (t << 7)
+    t = (value ^ (value >> 14)) & 0x0000CCCC0000CCCC
+    value ^= t ^ (t << 14)
+    t = (value ^ (value >> 28)) & 0x00000000F0F0F0F0
+    value ^= t ^ (t << 28)
+    return value
+
+
+def transpose(data: bytes, width: int, height: int) -> bytes:
+    stride = _stride(width)
+    out_stride = _stride(height)
+    padding = bytes(out_stride * 8 - height)
+    blank = b"\xff" * 8
+    out = bytearray(b"\xff" * (out_stride * stride * 8))
+    for block_x in range(stride):
+        column = data[block_x::stride] + padding
+        base = block_x * 8 * out_stride
+        for block_y in range(out_stride):
+            chunk = column[block_y * 8 : block_y * 8 + 8]
+            if chunk == blank:
+                continue
+            value = _transpose8(int.from_bytes(chunk, "big"))
+            out[base + block_y : base + block_y + 8 * out_stride : out_stride] = value.to_bytes(8, "big")
+    return bytes(out[: width * out_stride])
+
+
+def rotate(data: bytes, width: int, height: int, angle: int) -> tuple[bytes, int, int]:
+    turns = (angle // 90) % 4
+    if turns == 0:
+        return data, width, height
+    if turns == 2:
+        return mirror(flip(data, width, height), width, height), width, height
+    swapped = transpose(data, width, height)
+    if turns == 1:
+        return flip(swapped, height, width), height, width
+    return mirror(swapped, height, width), height, width
+
+
+def _turns(size: tuple[int, int], rotate_by: int, panel_size: tuple[int, int] | None) -> int:
+    turns = (rotate_by // 90) % 4
+    width, height = size if turns % 2 == 0 else (size[1], size[0])
+    if panel_size is not None and (width, height) != tuple(panel_size) and (height, width) == tuple(panel_size):
+        turns = (turns + 1) % 4
+    return turns
+
+
+def pack_image(image, rotate_by: int = 0, panel_size: tuple[int, int] | None = None) -> PackedFrame:
+    if image.mode != "1":
+        image = image.convert("1")
+    turns = _turns(image.size, rotate_by, panel_size)
+    if turns:
+        from PIL import Image
+
+        methods = getattr(Image, "Transpose", Image)
+        image = image.transpose((None, methods.ROTATE_90, methods.ROTATE_180, methods.ROTATE_270)[turns])
+    return PackedFrame.from_image(image)
+
+
+def pack_bytes(
+    data: bytes,
+    width: int,
+    height: int,
+    rotate_by: int = 0,
+    panel_size: tuple[int, int] | None = None,
+) -> PackedFrame:
+    turns = _turns((width, height), rotate_by, panel_size)
+    data, width, height = rotate(data, width, height, turns * 90)
+    return PackedFrame(width, height, data)
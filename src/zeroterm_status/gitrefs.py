@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+import zlib
+
+_MAX_SYMREF_DEPTH = 5
+_MAX_WALK = 256
+_HEX = frozenset("0123456789abcdef")
+_READERS: dict[Path, RefReader] = {}
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _is_object_id(value: str) -> bool:
+    return len(value) in {40, 64} and set(value) <= _HEX
+
+
+def find_git_dir(repo_path: str | Path) -> Path | None:
+    repo = Path(repo_path)
+    dot_git = repo / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = _read_text(dot_git)
+        if content and content.startswith("gitdir:"):
+            target = Path(content[len("gitdir:") :].strip())
+            if not target.is_absolute():
+                target = repo / target
+            return target if target.is_dir() else None
+        return None
+    if (repo / "HEAD").is_file() and (repo / "refs").is_dir():
+        return repo
+    return None
+
+
+class RefReader:
+    def __init__(self, git_dir: str | Path) -> None:
+        self.git_dir = Path(git_dir)
+        common = _read_text(self.git_dir / "commondir")
+        if common:
+            common_dir = Path(common)
+            self.common_dir = common_dir if common_dir.is_absolute() else self.git_dir / common_dir
+        else:
+            self.common_dir = self.git_dir
+        self._packed: dict[str, str] = {}
+        self._packed_key: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def _packed_refs(self) -> dict[str, str]:
+        path = self.common_dir / "packed-refs"
+        try:
+            stat = path.stat()
+        except OSError:
+            self._packed = {}
+            self._packed_key = None
+            return self._packed
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key == self._packed_key:
+            return self._packed
+        refs: dict[str, str] = {}
+        content = _read_text(path) or ""
+        for line in content.splitlines():
+            if not line or line[0] in "#^":
+                continue
+            object_id, _, name = line.partition(" ")
+            if name and _is_object_id(object_id):
+                refs[name.strip()] = object_id
+        self._packed = refs
+        self._packed_key = key
+        return refs
+
+    def _ref_file(self, name: str) -> Path:
+        if name == "HEAD" or not name.startswith("refs/"):
+            return self.git_dir / name
+        return self.common_dir / name
+
+    def resolve(self, name: str) -> str | None:
+        with self._lock:
+            for _ in range(_MAX_SYMREF_DEPTH):
+                if ".." in name.split("/"):
+                    return None
+                value = _read_text(self._ref_file(name))
+                if value is None:
+                    return self._packed_refs().get(name)
+                if value.startswith("ref:"):
+                    name = value[len("ref:") :].strip()
+                    continue
+                return value if _is_object_id(value) else None
+        return None
+
+    def _commit_parents(self, object_id: str) -> list[str] | None:
+        # Only loose objects are read; packed ones leave the answer to git.
+        path = self.common_dir / "objects" / object_id[:2] / object_id[2:]
+        try:
+            data = zlib.decompress(path.read_bytes())
+        except (OSError, zlib.error):
+            return None
+        header, _, body = data.partition(b"\0")
+        if not header.startswith(b"commit "):
+            return None
+        parents = []
+        for line in body.split(b"\n"):
+            if not line:
+                break
+            if line.startswith(b"parent "):
+                parents.append(line[len(b"parent ") :].decode("ascii", "replace"))
+        return parents
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool | None:
+        """Walks loose commits back from ``descendant``; None when undecided."""
+        seen: set[str] = set()
+        pending = [descendant]
+        while pending:
+            object_id = pending.pop()
+            if object_id == ancestor:
+                return True
+            if object_id in seen:
+                continue
+            seen.add(object_id)
+            if len(seen) > _MAX_WALK:
+                return None
+            parents = self._commit_parents(object_id)
+            if parents is None:
+                return None
+            pending.extend(parents)
+        return False
+
+
+def behind_upstream(repo_path: str | Path, remote: str, branch: str) -> bool | None:
+    """True when the remote branch has commits HEAD lacks, like ``HEAD..remote``.
+
+    A HEAD that is only ahead of the remote is not behind. None when the refs
+    or the commits needed to decide cannot be read without git.
+    """
+    git_dir = find_git_dir(repo_path)
+    if git_dir is None:
+        return None
+    reader = _READERS.get(git_dir)
+    if reader is None:
+        reader = _READERS.setdefault(git_dir, RefReader(git_dir))
+    head = reader.resolve("HEAD")
+    upstream = reader.resolve(f"refs/remotes/{remote}/{branch}")
+    if head is None or upstream is None:
+        return None
+    if head == upstream:
+        return False
+    ahead = reader.is_ancestor(upstream, head)
+    return None if ahead is None else not ahead
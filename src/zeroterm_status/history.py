@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+import os
+import struct
+import threading
+
+METRICS = ("battery", "cpu", "mem", "temp", "load", "wifi_pps")
+RESOLUTIONS = ((10, 360), (300, 288), (3600, 168))
+
+_MAGIC = b"ZTH1"
+_HEADER = struct.Struct("<4sHH")
+_NAME = struct.Struct("<16s")
+_RING = struct.Struct("<IIq")
+
+
+class MetricRing:
+    def __init__(self, resolution: int, capacity: int) -> None:
+        self.resolution = resolution
+        self.capacity = capacity
+        self.latest = -1
+        self.keys = array("q", [-1]) * capacity
+        self.counts = array("I", [0]) * capacity
+        self.mins = array("d", [0.0]) * capacity
+        self.maxs = array("d", [0.0]) * capacity
+        self.sums = array("d", [0.0]) * capacity
+
+    @property
+    def span(self) -> int:
+        return self.resolution * self.capacity
+
+    def add(self, timestamp: float, value: float) -> None:
+        key = int(timestamp // self.resolution)
+        slot = key % self.capacity
+        current = self.keys[slot]
+        if current == key:
+            self.counts[slot] += 1
+            self.sums[slot] += value
+            if value < self.mins[slot]:
+                self.mins[slot] = value
+            if value > self.maxs[slot]:
+                self.maxs[slot] = value
+        elif key > current:
+            self.keys[slot] = key
+            self.counts[slot] = 1
+            self.mins[slot] = value
+            self.maxs[slot] = value
+            self.sums[slot] = value
+        else:
+            return
+        if key > self.latest:
+            self.latest = key
+
+    def _key_range(self, since: float | None, until: float | None) -> range:
+        if self.latest < 0:
+            return range(0)
+        last = self.latest if until is None else min(self.latest, int(until // self.resolution))
+        first = last - self.capacity + 1
+        if since is not None:
+            first = max(first, int(since // self.resolution))
+        return range(first, last + 1)
+
+    def series(self, since: float | None = None, until: float | None = None) -> list[tuple[int, float, float, float]]:
+        points = []
+        for key in self._key_range(since, until):
+            slot = key % self.capacity
+            if self.keys[slot] != key or not self.counts[slot]:
+                continue
+            points.append(
+                (
+                    key * self.resolution,
+                    self.mins[slot],
+                    self.maxs[slot],
+                    self.sums[slot] / self.counts[slot],
+                )
+            )
+        return points
+
+    def window(self, since: float | None = None, until: float | None = None) -> tuple[float, float, float] | None:
+        low = high = None
+        total = 0.0
+        count = 0
+        for key in self._key_range(since, until):
+            slot = key % self.capacity
+            if self.keys[slot] != key or not self.counts[slot]:
+                continue
+            low = self.mins[slot] if low is None else min(low, self.mins[slot])
+            high = self.maxs[slot] if high is None else max(high, self.maxs[slot])
+            total += self.sums[slot]
+            count += self.counts[slot]
+        if not count:
+            return None
+        return low, high, total / count
+
+    def to_bytes(self) -> bytes:
+        return b"".join(
+            [
+                _RING.pack(self.resolution, self.capacity, self.latest),
+                self.keys.tobytes(),
+                self.counts.tobytes(),
+                self.mins.tobytes(),
+                self.maxs.tobytes(),
+                self.sums.tobytes(),
+            ]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int) -> tuple[MetricRing, int]:
+        resolution, capacity, latest = _RING.unpack_from(data, offset)
+        ring = cls(resolution, capacity)
+        ring.latest = latest
+        offset += _RING.size
+        for values in (ring.keys, ring.counts, ring.mins, ring.maxs, ring.sums):
+            size = values.itemsize * capacity
+            chunk = data[offset : offset + size]
+            if len(chunk) != size:
+                raise ValueError("truncated history snapshot")
+            values[:] = array(values.typecode, chunk)
+            offset += size
+        return ring, offset
+
+
+class MetricsHistory:
+    def __init__(
+        self,
+        metrics: tuple[str, ...] = METRICS,
+        resolutions: tuple[tuple[int, int], ...] = RESOLUTIONS,
+    ) -> None:
+        self._rings: dict[str, list[MetricRing]] = {
+            name: [MetricRing(resolution, capacity) for resolution, capacity in resolutions] for name in metrics
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> list[str]:
+        return list(self._rings)
+
+    @property
+    def resolutions(self) -> list[int]:
+        first = next(iter(self._rings.values()), [])
+        return [ring.resolution for ring in first]
+
+    def record(self, timestamp: float, values: dict[str, float | int | None]) -> None:
+        with self._lock:
+            for name, value in values.items():
+                rings = self._rings.get(name)
+                if rings is None or value is None:
+                    continue
+                for ring in rings:
+                    ring.add(timestamp, float(value))
+
+    def _ring(self, name: str, resolution: int | None, span: float | None) -> MetricRing | None:
+        rings = self._rings.get(name)
+        if not rings:
+            return None
+        if resolution is not None:
+            return next((ring for ring in rings if ring.resolution == resolution), None)
+        if span is not None:
+            for ring in rings:
+                if ring.span >= span:
+                    return ring
+        return rings[-1]
+
+    def series(
+        self,
+        name: str,
+        resolution: int | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[tuple[int, float, float, float]]:
+        with self._lock:
+            ring = self._ring(name, resolution, None)
+            return ring.series(since, until) if ring else []
+
+    def window(self, name: str, seconds: float, now: float) -> tuple[float, float, float] | None:
+        with self._lock:
+            ring = self._ring(name, None, seconds)
+            return ring.window(now - seconds, now) if ring else None
+
+    def merge(self, snapshot: MetricsHistory) -> None:
+        """Adopts the snapshot's rings for metrics this history tracks.
+
+        Metrics the snapshot lacks keep their empty rings, so a metric added
+        since the snapshot was written still gets recorded.
+        """
+        with self._lock:
+            for name, rings in self._rings.items():
+                saved = {(ring.resolution, ring.capacity): ring for ring in snapshot._rings.get(name, ())}
+                self._rings[name] = [saved.get((ring.resolution, ring.capacity), ring) for ring in rings]
+
+    def to_bytes(self) -> bytes:
+        with self._lock:
+            parts = [_HEADER.pack(_MAGIC, len(self._rings), len(self.resolutions))]
+            for name, rings in self._rings.items():
+                parts.append(_NAME.pack(name.encode("ascii")))
+                parts.extend(ring.to_bytes() for ring in rings)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> MetricsHistory:
+        if len(data) < _HEADER.size:
+            raise ValueError("truncated history snapshot")
+        magic, metric_count, ring_count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("not a history snapshot")
+        history = cls(metrics=())
+        offset = _HEADER.size
+        for _ in range(metric_count):
+            (raw_name,) = _NAME.unpack_from(data, offset)
+            offset += _NAME.size
+            rings = []
+            for _ in range(ring_count):
+                ring, offset = MetricRing.from_bytes(data, offset)
+                rings.append(ring)
+            history._rings[raw_name.rstrip(b"\0").decode("ascii")] = rings
+        return history
+
+    def save(self, path: str | Path) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.tmp")
+        temp.write_bytes(self.to_bytes())
+        os.replace(temp, target)
+
+    @classmethod
+    def load(cls, path: str | Path) -> MetricsHistory | None:
+        try:
+            return cls.from_bytes(Path(path).read_bytes())
+        except (OSError, ValueError, struct.error):
+            return None
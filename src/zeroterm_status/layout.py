@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Union
+
+Box = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class Size:
+    """Extent of a child along its container's axis."""
+
+    px: int = 0
+    text: tuple[str, ...] = ()
+    weight: float = 0.0
+    ratio: float = 0.0
+    min: int = 0
+
+
+def px(value: int) -> Size:
+    return Size(px=value)
+
+
+def text(*roles: str, pad: int = 2, min: int = 0) -> Size:
+    return Size(px=pad, text=roles, min=min)
+
+
+def flex(weight: float = 1.0, min: int = 0) -> Size:
+    return Size(weight=weight, min=min)
+
+
+def share(ratio: float, min: int = 0) -> Size:
+    return Size(ratio=ratio, min=min)
+
+
+@dataclass(frozen=True)
+class Field:
+    name: str
+    font: str
+    align: str = "left"
+    valign: str = "top"
+
+
+@dataclass(frozen=True)
+class Label:
+    text: str
+    font: str
+    align: str = "left"
+    valign: str = "top"
+
+
+@dataclass(frozen=True)
+class Face:
+    name: str = "face"
+    font: str = "face"
+
+
+@dataclass(frozen=True)
+class Bar:
+    name: str = "battery_bar"
+
+
+@dataclass(frozen=True)
+class Lines:
+    name: str
+    font: str
+    gap: int = 2
+
+
+@dataclass(frozen=True)
+class Metrics:
+    name: str
+    columns: tuple[tuple[str, str], ...]
+    label_font: str
+    value_font: str
+
+
+@dataclass(frozen=True)
+class Container:
+    direction: str
+    children: tuple[tuple[Size, "Widget"], ...]
+    gap: int = 0
+    pad: tuple[int, int] = (0, 0)
+    rules: bool = False
+    border: bool = False
+
+
+Widget = Union[Field, Label, Face, Bar, Lines, Metrics, Container, None]
+
+
+def row(*children: tuple[Size, Widget], gap: int = 0, pad: tuple[int, int] = (0, 0), rules: bool = False) -> Container:
+    return Container("row", tuple(children), gap, pad, rules)
+
+
+def column(
+    *children: tuple[Size, Widget],
+    gap: int = 0,
+    pad: tuple[int, int] = (0, 0),
+    rules: bool = False,
+    border: bool = False,
+) -> Container:
+    return Container("column", tuple(children), gap, pad, rules, border)
+
+
+def stack(*children: Widget, pad: tuple[int, int] = (0, 0)) -> Container:
+    return Container("stack", tuple((Size(), child) for child in children), pad=pad)
+
+
+@dataclass(frozen=True)
+class PanelLayout:
+    name: str
+    size: tuple[int, int]
+    # (role, offset from the configured font size, minimum size)
+    fonts: tuple[tuple[str, int, int], ...]
+    root: Container
+
+
+@dataclass(frozen=True)
+class Static:
+    kind: str
+    box: Box
+    text: str = ""
+    font: str = ""
+    align: str = "left"
+    valign: str = "top"
+
+
+@dataclass(frozen=True)
+class Slot:
+    kind: str
+    box: Box
+    font: str = ""
+    align: str = "left"
+    valign: str = "top"
+    step: int = 0
+    capacity: int = 0
+    columns: tuple[tuple[str, int, int], ...] = ()
+    value_font: str = ""
+    value_top: int = 0
+
+
+@dataclass(frozen=True)
+class CompiledLayout:
+    name: str
+    width: int
+    height: int
+    fonts: dict[str, int]
+    statics: tuple[Static, ...]
+    slots: dict[str, Slot]
+
+
+def place_text(box: Box, width: int, height: int, align: str = "left", valign: str = "top") -> tuple[int, int]:
+    x0, y0, x1, y1 = box
+    if align == "center":
+        x = x0 + max(0, (x1 - x0 - width) // 2)
+    elif align == "right":
+        x = x1 - width
+    else:
+        x = x0
+    if valign == "center":
+        y = y0 + max(0, (y1 - y0 - height) // 2)
+    elif valign == "bottom":
+        y = max(y0, y1 - height)
+    else:
+        y = y0
+    return x, y
+
+
+def _resolve(sizes: list[Size], length: int, heights: dict[str, int]) -> list[int]:
+    extents = [0] * len(sizes)
+    flexible = []
+    for index, size in enumerate(sizes):
+        if size.weight:
+            flexible.append(index)
+        elif size.ratio:
+            extents[index] = max(size.min, int(length * size.ratio))
+        else:
+            extent = size.px + sum(heights[role] for role in size.text)
+            extents[index] = max(size.min, extent)
+    available = length - sum(extents)
+    remaining = available
+    total = sum(sizes[index].weight for index in flexible)
+    for position, index in enumerate(flexible):
+        if position == len(flexible) - 1:
+            share_px = remaining
+        else:
+            share_px = int(available * sizes[index].weight / total)
+        remaining -= share_px
+        extents[index] = max(sizes[index].min, share_px)
+    # A flexible child held at its minimum takes the overflow from ratio children.
+    overflow = sum(extents) - length
+    for index, size in enumerate(sizes):
+        if overflow <= 0:
+            break
+        if size.ratio:
+            taken = min(overflow, extents[index] - size.min)
+            extents[index] -= taken
+            overflow -= taken
+    return extents
+
+
+class _Compiler:
+    def __init__(self, heights: dict[str, int]) -> None:
+        self.heights = heights
+        self.statics: list[Static] = []
+        self.slots: dict[str, Slot] = {}
+
+    def place(self, widget: Widget, box: Box) -> None:
+        x0, y0, x1, y1 = box
+        if widget is None or x1 <= x0 or y1 <= y0:
+            return
+        if isinstance(widget, Container):
+            self._container(widget, box)
+        elif isinstance(widget, Label):
+            self.statics.append(Static("text", box, widget.text, widget.font, widget.align, widget.valign))
+        elif isinstance(widget, Field):
+            self.slots[widget.name] = Slot("text", box, widget.font, widget.align, widget.valign)
+        elif isinstance(widget, Face):
+            self.slots[widget.name] = Slot("face", box, widget.font, "center", "center")
+        elif isinstance(widget, Bar):
+            self.slots[widget.name] = Slot("bar", (x0, y0, x1 - 1, y1 - 1))
+        elif isinstance(widget, Lines):
+            step = self.heights[widget.font] + widget.gap
+            capacity = max(0, (y1 - y0 + widget.gap) // step)
+            self.slots[widget.name] = Slot("lines", box, widget.font, step=step, capacity=capacity)
+        elif isinstance(widget, Metrics):
+            self._metrics(widget, box)
+        else:
+            raise TypeError(f"unknown layout widget {widget!r}")
+
+    def _container(self, node: Container, box: Box) -> None:
+        x0, y0, x1, y1 = box
+        if node.border:
+            self.statics.append(Static("rect", (x0, y0, x1 - 1, y1 - 1)))
+        pad_x, pad_y = node.pad
+        inner = (x0 + pad_x, y0 + pad_y, x1 - pad_x, y1 - pad_y)
+        if node.direction == "stack":
+            for _, child in node.children:
+                self.place(child, inner)
+            return
+        horizontal = node.direction == "row"
+        start, end = (inner[0], inner[2]) if horizontal else (inner[1], inner[3])
+        length = end - start - node.gap * (len(node.children) - 1)
+        extents = _resolve([size for size, _ in node.children], length, self.heights)
+        position = start
+        for index, ((_, child), extent) in enumerate(zip(node.children, extents)):
+            if horizontal:
+                self.place(child, (position, inner[1], position + extent, inner[3]))
+            else:
+                self.place(child, (inner[0], position, inner[2], position + extent))
+            position += extent
+            if node.rules and index < len(node.children) - 1 and node.gap:
+                rule = position + (node.gap - 1) // 2
+                if horizontal:
+                    self.statics.append(Static("line", (rule, y0, rule, y1 - 1)))
+                else:
+                    self.statics.append(Static("line", (x0, rule, x1 - 1, rule)))
+            position += node.gap
+
+    def _metrics(self, widget: Metrics, box: Box) -> None:
+        x0, y0, x1, y1 = box
+        count = max(1, len(widget.columns))
+        width = max(1, (x1 - x0) // count)
+        label_height = self.heights[widget.label_font]
+        columns = []
+        for index, (label, field) in enumerate(widget.columns):
+            cx0 = x0 + index * width
+            columns.append((field, cx0, cx0 + width))
+            self.statics.append(
+                Static("text", (cx0, y0, cx0 + width, y0 + label_height), label, widget.label_font, "center")
+            )
+        self.slots[widget.name] = Slot(
+            "metrics",
+            box,
+            widget.label_font,
+            columns=tuple(columns),
+            value_font=widget.value_font,
+            value_top=y0 + label_height + 2,
+        )
+
+
+def compile_layout(
+    panel: PanelLayout,
+    width: int,
+    height: int,
+    font_size: int,
+    text_height: Callable[[int], int],
+) -> CompiledLayout:
+    fonts = {role: max(minimum, font_size + offset) for role, offset, minimum in panel.fonts}
+    compiler = _Compiler({role: text_height(size) for role, size in fonts.items()})
+    compiler.place(panel.root, (0, 0, width, height))
+    return CompiledLayout(panel.name, width, height, fonts, tuple(compiler.statics), compiler.slots)
+
+
+_FONTS = (("header", -4, 9), ("body", -2, 10), ("small", -6, 8), ("face", 22, 26))
+_METRICS = Metrics("metrics", (("MEM", "mem"), ("CPU", "cpu"), ("TMP", "temp")), "small", "body")
+
+
+def _bar(header: str = "header", pad: int = 6) -> tuple[Size, Container]:
+    return text(header, pad=2, min=12), stack(
+        Field("ssid", header, valign="center"),
+        Field("updated", header, align="center", valign="center"),
+        Field("load", header, align="right", valign="center"),
+        pad=(pad, 0),
+    )
+
+
+def _battery(font: str = "small") -> tuple[tuple[Size, Widget], ...]:
+    return (
+        (text(font, pad=2), stack(Label("BAT", font), Field("battery", font, align="right"), pad=(4, 0))),
+        (px(8), stack(Bar(), pad=(4, 1))),
+    )
+
+
+def _wide(
+    name: str,
+    size: tuple[int, int],
+    side: float,
+    header_weights: tuple[float, ...],
+    fonts: tuple[tuple[str, int, int], ...] = _FONTS,
+) -> PanelLayout:
+    header = row(
+        *(
+            (flex(weight), Field(field, "header", valign="center"))
+            for weight, field in zip(header_weights, ("ip", "wifi", "bat", "uptime"))
+        ),
+        gap=4,
+        pad=(6, 0),
+    )
+    left = column(
+        (text("body", pad=4), Label("zeroterm>", "body")),
+        (flex(), Face()),
+        *_battery(),
+        (px(2), None),
+    )
+    right = column(
+        (text("body", pad=4), Field("message", "body")),
+        (flex(), Lines("lines", "small")),
+        (text("small", "body", pad=4), _METRICS),
+    )
+    body = row((flex(min=80), left), (share(side, min=90), right), gap=6, pad=(6, 1))
+    root = column((text("header", pad=2, min=12), header), (flex(), body), _bar(), gap=1, rules=True, border=True)
+    return PanelLayout(name, size, fonts, root)
+
+
+def _square() -> PanelLayout:
+    header = column(
+        (text("header", pad=2), row((flex(), Field("ip", "header")), (flex(0.6), Field("bat", "header", align="right")))),
+        (text("header", pad=2), row((flex(), Field("wifi", "header")), (flex(0.6), Field("uptime", "header", align="right")))),
+        pad=(6, 1),
+    )
+    left = column((flex(), Face()), *_battery(), (px(2), None))
+    right = column((text("body", pad=4), Field("message", "body")), (flex(), Lines("lines", "small")))
+    body = column(
+        (flex(), row((share(0.45, min=70), left), (flex(), right), gap=6)),
+        (text("small", "body", pad=4), _METRICS),
+        pad=(6, 2),
+    )
+    root = column((text("header", "header", pad=5), header), (flex(), body), _bar(), gap=1, rules=True, border=True)
+    return PanelLayout("1in54", (200, 200), (("header", -4, 9), ("body", -2, 10), ("small", -5, 8), ("face", 14, 24)), root)
+
+
+def _portrait() -> PanelLayout:
+    header = column(
+        (text("header", pad=2), Field("ip", "header")),
+        (text("header", pad=2), row((flex(), Field("wifi", "header")), (flex(), Field("bat", "header", align="right")))),
+        pad=(4, 1),
+    )
+    body = column(
+        (text("body", pad=4), Field("message", "body", align="center")),
+        (share(0.3), Face()),
+        *_battery(),
+        (flex(), Lines("lines", "small")),
+        (text("small", "body", pad=4), _METRICS),
+        pad=(4, 2),
+    )
+    footer = column(
+        (text("header", pad=2), Field("ssid", "header")),
+        (text("header", pad=2), row((flex(), Field("uptime", "header")), (flex(), Field("load", "header", align="right")))),
+        pad=(4, 1),
+    )
+    root = column(
+        (text("header", "header", pad=6), header),
+        (flex(), body),
+        (text("header", "header", pad=6), footer),
+        gap=1,
+        rules=True,
+        border=True,
+    )
+    return PanelLayout("2in13_portrait", (122, 250), _FONTS, root)
+
+
+PANELS: dict[str, PanelLayout] = {
+    "2in13": _wide("2in13", (250, 122), 0.38, (1.6, 1.1, 0.9, 1.2)),
+    "2in9": _wide("2in9", (296, 128), 0.42, (1.5, 1.0, 1.0, 1.1)),
+    "2in7": _wide(
+        "2in7",
+        (264, 176),
+        0.45,
+        (1.8, 1.0, 1.1, 1.0),
+        (("header", -4, 9), ("body", 0, 10), ("small", -3, 8), ("face", 28, 26)),
+    ),
+    "1in54": _square(),
+    "2in13_portrait": _portrait(),
+}
+
+
+def select_panel(name: str | None, width: int, height: int) -> PanelLayout:
+    panel = PANELS.get((name or "").lower())
+    if panel is not None:
+        return panel
+    for panel in PANELS.values():
+        if panel.size == (width, height):
+            return panel
+    aspect = math.log(max(1, width) / max(1, height))
+    return min(PANELS.values(), key=lambda panel: abs(math.log(panel.size[0] / panel.size[1]) - aspect))
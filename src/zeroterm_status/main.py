@@ -1,29 +1,96 @@
 from __future__ import annotations
 
+import atexit
+import importlib.util
 import logging
+import signal
+import threading
 import time
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+from .collectors import COST_CHEAP, Collector, CollectorPool, CollectorRegistry, collector_periods
+from .batterylog import BatteryLogWriter
 from .config import load_config
-from .display import create_display
+from .discharge import DischargeModel, format_duration, interval_scale
+from .history import MetricsHistory
+from .display import create_display, refresh_policy
 from .drivers.base import DisplayError
+from .drivers.composite import CompositeDisplay
 from .drivers.file import FileDisplay
 from .drivers.null import NullDisplay
 from .metrics import (
+    BatteryInfo,
+    BatterySource,
+    ServiceInfo,
+    SystemInfo,
+    WifiInfo,
     find_external_wifi,
-    read_battery,
     read_service_state,
     read_system,
     read_time_sync,
     read_update_available,
     read_wifi,
     select_wifi_iface,
+    start_link_monitor,
+    start_service_watcher,
+    start_update_fetch,
 )
-from .render import RenderConfig, render_status
+from .scheduler import Scheduler
+from .significance import SignificanceFilter
+from .statusview import RenderConfig
+from .worker import DisplayWorker
 
 logger = logging.getLogger(__name__)
 
+_HISTOGRAM_LOG_EVERY = 100
+_HISTORY_SAVE_INTERVAL = 30.0
+_TOP_PROCESSES = 3
+_EMPTY_SYSTEM = SystemInfo(uptime=None, load=None, temp=None, mem_percent=None, cpu_percent=None)
+
+
+def _empty_wifi(iface: str) -> WifiInfo:
+    return WifiInfo(
+        iface=iface,
+        state=None,
+        ssid=None,
+        ip=None,
+        mode=None,
+        channel=None,
+        packets=None,
+    )
+
+
+def _leading_number(text: str | None) -> float | None:
+    if not text:
+        return None
+    end = 0
+    while end < len(text) and (text[end].isdigit() or text[end] in "-."):
+        end += 1
+    try:
+        return float(text[:end])
+    except ValueError:
+        return None
+
+
+def _history_sample(updated: set[str], wifi, battery, system) -> dict[str, float | int | None]:
+    sample: dict[str, float | int | None] = {}
+    if "battery" in updated:
+        sample["battery"] = battery.percent
+    if "system" in updated:
+        sample["cpu"] = system.cpu_percent
+        sample["mem"] = system.mem_percent
+        sample["temp"] = _leading_number(system.temp)
+        sample["load"] = _leading_number(system.load)
+    if "wifi" in updated:
+        sample["wifi_pps"] = wifi.packet_rate
+    return sample
+
+
+def _exit_on_sigterm(signum, frame) -> None:
+    raise SystemExit(0)
+
 
 def _format_status(service_state: str | None) -> str:
     if service_state == "active":
@@ -64,6 +131,28 @@ def _format_power_state(status: str | None) -> str | None:
     return value[:4].upper()
 
 
+def _format_power_text(power_state: str | None, estimate) -> str | None:
+    if not power_state:
+        return None
+    remaining = format_duration(estimate.time_to_empty or estimate.time_to_full)
+    if remaining is None:
+        return power_state
+    return f"{power_state} {remaining}"
+
+
+def _optional(text: str) -> str | None:
+    return None if text == "--" else text
+
+
+def _format_top_text(system: SystemInfo, threshold: int) -> str | None:
+    if threshold <= 0 or not system.top_processes:
+        return None
+    top = system.top_processes[0]
+    if top.percent < threshold:
+        return None
+    return f"{top.name} {int(round(top.percent))}%"
+
+
 def _append_line(path_value: str | None, line: str) -> None:
     if not path_value:
         return
@@ -76,22 +165,6 @@ def _append_line(path_value: str | None, line: str) -> None:
         logger.warning("Failed to write log %s", path)
 
 
-def _append_battery_csv(path_value: str | None, timestamp: str, percent: int, status: str | None) -> None:
-    if not path_value:
-        return
-    path = Path(path_value)
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        new_file = not path.exists()
-        with path.open("a", encoding="utf-8") as handle:
-            if new_file:
-                handle.write("timestamp,percent,status\n")
-            status_text = status or ""
-            handle.write(f"{timestamp},{percent},{status_text}\n")
-    except OSError:
-        logger.warning("Failed to write battery log %s", path)
-
-
 def _is_night(now: datetime, start: int, end: int) -> bool:
     if start == end:
         return False
@@ -119,7 +192,7 @@ def build_payload(
     service_state: str | None,
     wifi,
     battery,
-) -> tuple[str, str, str, str, str | None, int | None]:
+) -> tuple[str, str, str, str, str | None, float | None]:
     status = _format_status(service_state)
     ip = wifi.ip or "--"
     wifi_state = _format_wifi(wifi.state)
@@ -127,7 +200,101 @@ def build_payload(
     if wifi.ssid:
         wifi_text = f"{wifi_text} {wifi.ssid}"
     battery_text = _format_battery(battery.percent, battery.status)
-    return status, ip, wifi_text, battery_text, wifi.channel, wifi.packets
+    return status, ip, wifi_text, battery_text, wifi.channel, wifi.packet_rate
+
+
+def _current_wifi(scheduler: Scheduler, iface: str) -> WifiInfo:
+    wifi = scheduler.value("wifi")
+    if wifi is None:
+        return _empty_wifi(iface)
+    if wifi.iface != iface:
+        # Keep the last reading on screen until the re-read for the new interface lands.
+        scheduler.trigger("wifi")
+    return wifi
+
+
+def _read_selected_wifi(config) -> WifiInfo:
+    iface = select_wifi_iface(config.iface, config.iface_auto)
+    return read_wifi(iface, read_ssid=config.wifi_ssid)
+
+
+def _status_renderer(config, display, panel_size: tuple[int, int]):
+    renderer = config.epaper_renderer
+    if renderer == "auto":
+        renderer = "pillow" if importlib.util.find_spec("PIL") is not None else "bitmap"
+    logger.info("Rendering with the %s backend", renderer)
+    # Imported lazily so the bitmap backend never loads Pillow.
+    if renderer == "bitmap":
+        from .bitmap import render_status_bitmap
+
+        return partial(render_status_bitmap, panel_size=panel_size)
+    from .render import render_status, render_status_frame
+
+    if display.accepts_frames:
+        return partial(render_status_frame, panel_size=panel_size)
+    return render_status
+
+
+def _fallback_display(config, display):
+    fallback = NullDisplay(config.epaper_width, config.epaper_height)
+    if config.epaper_output:
+        output = FileDisplay(
+            config.epaper_width,
+            config.epaper_height,
+            config.epaper_output,
+            model=config.epaper_model,
+            policy=refresh_policy(config),
+        )
+        try:
+            output.init()
+            fallback = output
+        except DisplayError as exc:
+            logger.error("Fallback display init failed: %s", exc)
+    if isinstance(display, CompositeDisplay):
+        # Only the panel is replaced; the extra sinks keep running.
+        display.replace_primary(fallback)
+        return display
+    return fallback
+
+
+def build_registry(config, battery_source: BatterySource) -> CollectorRegistry:
+    periods = collector_periods(config)
+    registry = CollectorRegistry()
+    registry.register(
+        Collector("wifi", partial(_read_selected_wifi, config), periods["wifi"], deadline=2.0, on_wake=True)
+    )
+    registry.register(
+        Collector(
+            "service",
+            partial(read_service_state, config.service_name),
+            periods["service"],
+            deadline=1.0,
+            on_wake=True,
+        )
+    )
+    registry.register(Collector("battery", battery_source.read, periods["battery"], deadline=2.0))
+    top = _TOP_PROCESSES if config.top_threshold > 0 else 0
+    registry.register(Collector("system", partial(read_system, top), periods["system"], cost=COST_CHEAP))
+    registry.register(Collector("time_sync", read_time_sync, periods["time_sync"], deadline=1.0))
+    if config.update_check and config.update_interval > 0:
+        update_args = (config.update_path, config.update_remote, config.update_branch)
+        registry.register(
+            Collector(
+                "update",
+                partial(read_update_available, *update_args, False, float(config.update_interval)),
+                periods["update"],
+                budget=float(config.update_interval) * 2,
+            )
+        )
+        if config.update_fetch:
+            registry.register(
+                Collector(
+                    "update_fetch",
+                    partial(start_update_fetch, config.update_path, config.update_remote),
+                    periods["update_fetch"],
+                )
+            )
+    return registry
 
 
 def main() -> None:
@@ -143,15 +310,7 @@ def main() -> None:
         display.init()
     except DisplayError as exc:
         logger.error("Display init failed: %s", exc)
-        if config.epaper_output:
-            display = FileDisplay(
-                config.epaper_width,
-                config.epaper_height,
-                config.epaper_output,
-            )
-            display.init()
-        else:
-            display = NullDisplay(config.epaper_width, config.epaper_height)
+        display = _fallback_display(config, display)
 
     width = display.width or config.epaper_width
     height = display.height or config.epaper_height
@@ -161,56 +320,90 @@ def main() -> None:
         rotate=config.epaper_rotate,
         font_path=config.font_path,
         font_size=config.font_size,
+        layout=config.epaper_layout,
     )
-
+    render = _status_renderer(config, display, (width, height))
+    worker = DisplayWorker(display, sleep_between=config.epaper_sleep)
+    worker.start()
+    atexit.register(worker.stop)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+    wake = threading.Event()
+    if start_link_monitor(on_change=wake.set) is None:
+        logger.info("rtnetlink unavailable, polling interface state")
+    if config.service_name and start_service_watcher(config.service_name, on_change=wake.set) is None:
+        logger.info("D-Bus unavailable, polling %s with systemctl", config.service_name)
+    battery_source = BatterySource(config.battery_path, config.battery_cmd, config.battery_pisugar)
+    pool = CollectorPool()
+    scheduler = Scheduler(build_registry(config, battery_source), pool)
+    woken = False
+    min_period = float(config.interval)
+    scale = 1.0
+    discharge = DischargeModel()
+    history = None
+    history_saved_at = 0.0
+    if config.history_path:
+        history = MetricsHistory()
+        snapshot = MetricsHistory.load(config.history_path)
+        if snapshot is not None:
+            history.merge(snapshot)
+    battery_store = None
+    battery_stored_at = 0.0
+    if config.battery_store_path:
+        battery_store = BatteryLogWriter(config.battery_store_path, max_bytes=config.battery_store_max_kb * 1024)
+        atexit.register(battery_store.close)
+    significance = SignificanceFilter() if config.significance else None
+    cycles = 0
     last_payload = None
     next_render_attempt = 0.0
     render_failures = 0
-    last_wifi = None
-    last_wifi_at = 0.0
-    last_service = None
-    last_service_at = 0.0
-    last_system = None
-    last_system_at = 0.0
-    last_time_sync = None
-    last_time_sync_at = 0.0
-    last_update = None
-    last_update_at = 0.0
     last_power_state = None
     last_battery_percent = None
-    last_battery_log_at = 0.0
 
     while True:
         interval = config.interval
         payload = None
         try:
+            updated = scheduler.run_due(woken=woken, min_period=min_period, scale=scale)
+            if updated:
+                cycles += 1
+                if cycles % _HISTOGRAM_LOG_EVERY == 0:
+                    logger.info("Collection latency %s", pool.histogram.summary())
+                    if significance is not None:
+                        logger.info("Display refreshes %s", significance.summary())
+                    refresh_stats = getattr(display, "refresh_stats", None)
+                    if refresh_stats is not None:
+                        logger.info("Panel refreshes %s", refresh_stats.summary())
+                    power_stats = getattr(display, "power_stats", None)
+                    if power_stats is not None:
+                        logger.info("Panel power %s", power_stats.summary())
+                    if isinstance(display, CompositeDisplay):
+                        logger.info("Display sinks %s", display.summary())
+                    logger.info("Display worker %s", worker.summary())
+            woken = False
             now = time.monotonic()
             iface = select_wifi_iface(config.iface, config.iface_auto)
-            if (
-                config.wifi_interval > 0
-                and last_wifi is not None
-                and now - last_wifi_at < config.wifi_interval
-                and last_wifi.iface == iface
-            ):
-                wifi = last_wifi
-            else:
-                wifi = read_wifi(iface, read_ssid=config.wifi_ssid)
-                last_wifi = wifi
-                last_wifi_at = now
-
-            if (
-                config.service_interval > 0
-                and last_service is not None
-                and now - last_service_at < config.service_interval
-            ):
-                service = last_service
-            else:
-                service = read_service_state(config.service_name)
-                last_service = service
-                last_service_at = now
-
-            battery = read_battery(config.battery_path, config.battery_cmd)
+            wifi = _current_wifi(scheduler, iface)
+            service = scheduler.value("service", ServiceInfo(name=config.service_name, state=None))
+            battery = scheduler.value("battery", BatteryInfo(percent=None, status=None))
+            system = scheduler.value("system", _EMPTY_SYSTEM)
+            time_sync = scheduler.value("time_sync")
+            last_update = scheduler.value("update")
+            if history is not None and updated:
+                history.record(time.time(), _history_sample(updated, wifi, battery, system))
+                if now - history_saved_at >= _HISTORY_SAVE_INTERVAL:
+                    try:
+                        history.save(config.history_path)
+                    except OSError as exc:
+                        logger.warning("Failed to write history %s: %s", config.history_path, exc)
+                    history_saved_at = now
+
+            if "battery" in updated:
+                discharge.add(now, battery.percent, battery.status)
+            estimate = discharge.estimate()
+            scale = interval_scale(estimate.time_to_empty, config.adaptive_hours * 3600, config.adaptive_max)
             power_state = _format_power_state(battery.status)
+            power_text = _format_power_text(power_state, estimate)
             if power_state and power_state != last_power_state:
                 timestamp = datetime.utcnow().isoformat() + "Z"
                 _append_line(
@@ -233,48 +426,17 @@ def main() -> None:
             if battery.percent is not None:
                 last_battery_percent = battery.percent
             if (
-                config.battery_log_path
+                battery_store is not None
                 and battery.percent is not None
-                and config.battery_log_interval > 0
-                and now - last_battery_log_at >= config.battery_log_interval
+                and now - battery_stored_at >= config.battery_store_interval
             ):
-                timestamp = datetime.utcnow().isoformat() + "Z"
-                _append_battery_csv(config.battery_log_path, timestamp, battery.percent, battery.status)
-                last_battery_log_at = now
+                try:
+                    battery_store.append(time.time(), battery.percent, battery.status)
+                except OSError as exc:
+                    logger.warning("Failed to write battery store %s: %s", config.battery_store_path, exc)
+                battery_stored_at = now
 
-            if (
-                config.metrics_interval > 0
-                and last_system is not None
-                and now - last_system_at < config.metrics_interval
-            ):
-                system = last_system
-            else:
-                system = read_system()
-                last_system = system
-                last_system_at = now
-            if (
-                config.metrics_interval > 0
-                and last_time_sync is not None
-                and now - last_time_sync_at < config.metrics_interval
-            ):
-                time_sync = last_time_sync
-            else:
-                time_sync = read_time_sync()
-                last_time_sync = time_sync
-                last_time_sync_at = now
-            if (
-                config.update_check
-                and config.update_interval > 0
-                and now - last_update_at >= config.update_interval
-            ):
-                last_update = read_update_available(
-                    config.update_path,
-                    config.update_remote,
-                    config.update_branch,
-                    config.update_fetch,
-                )
-                last_update_at = now
-            status, ip, wifi_text, battery_text, wifi_channel, wifi_packets = build_payload(
+            status, ip, wifi_text, battery_text, wifi_channel, wifi_rate = build_payload(
                 service.state,
                 wifi,
                 battery,
@@ -297,44 +459,55 @@ def main() -> None:
             ):
                 alert_flags.append("LOW")
             alert_text = " ".join(alert_flags) if alert_flags else None
+            top_text = _format_top_text(system, config.top_threshold)
             interval = _select_interval(config, battery.percent)
-            payload = "\n".join(
-                [
-                    status,
-                    ip,
-                    wifi_text,
-                    battery_text,
-                    external_iface or "--",
-                    power_state or "--",
-                    alert_text or "--",
-                    temp_text,
-                    load_text,
-                    uptime_text,
-                    mem_text,
-                    cpu_text,
-                ]
-            )
+            fields = {
+                "status": (status, None),
+                "ip": (ip, None),
+                "wifi": (wifi_text, None),
+                "channel": (wifi_channel or "--", None),
+                "battery": (battery_text, battery.percent),
+                "adapter": (external_iface or "--", None),
+                "power": (power_text or "--", None),
+                "alert": (alert_text or "--", None),
+                "top": (top_text or "--", system.top_processes[0].percent if top_text else None),
+                "temp": (temp_text, _leading_number(system.temp)),
+                "load": (load_text, _leading_number(system.load)),
+                "uptime": (uptime_text, None),
+                "mem": (mem_text, system.mem_percent),
+                "cpu": (cpu_text, system.cpu_percent),
+                "pkt": ("--" if wifi_rate is None else str(wifi_rate), wifi_rate),
+            }
+            battery_percent = battery.percent
+            if significance is not None:
+                shown = significance.update(fields)
+                battery_percent = significance.value("battery")
+                wifi_rate = significance.value("pkt")
+            else:
+                shown = {name: text for name, (text, _) in fields.items()}
+            payload = "\n".join(shown.values())
             now = time.monotonic()
             if payload != last_payload and now >= next_render_attempt:
                 try:
-                    image = render_status(
-                        status=status,
-                        ip=ip,
-                        wifi=wifi_text,
-                        battery=battery_text,
-                        adapter=external_iface,
-                        power=power_state,
-                        alert=alert_text,
-                        temp=temp_text,
-                        load=load_text,
-                        uptime=uptime_text,
-                        mem=mem_text,
-                        cpu=cpu_text,
-                        battery_percent=battery.percent,
+                    image = render(
+                        status=shown["status"],
+                        ip=shown["ip"],
+                        wifi=shown["wifi"],
+                        battery=shown["battery"],
+                        adapter=_optional(shown["adapter"]),
+                        power=_optional(shown["power"]),
+                        alert=_optional(shown["alert"]),
+                        top=_optional(shown["top"]),
+                        temp=shown["temp"],
+                        load=shown["load"],
+                        uptime=shown["uptime"],
+                        mem=shown["mem"],
+                        cpu=shown["cpu"],
+                        battery_percent=battery_percent,
                         updated=None,
                         config=render_config,
-                        wifi_channel=wifi_channel,
-                        wifi_packets=wifi_packets,
+                        wifi_channel=_optional(shown["channel"]),
+                        wifi_rate=wifi_rate,
                     )
                 except RuntimeError as exc:
                     render_failures += 1
@@ -344,20 +517,16 @@ def main() -> None:
                     continue
                 render_failures = 0
                 next_render_attempt = 0.0
-                try:
-                    display.show(image)
-                except DisplayError as exc:
-                    logger.error("Display update failed: %s", exc)
-                    try:
-                        display.init()
-                    except DisplayError as init_exc:
-                        logger.error("Display re-init failed: %s", init_exc)
+                worker.submit(image)
                 last_payload = payload
         except Exception:
             logger.exception("Status update failed")
         if payload is not None and config.idle_interval > 0 and last_payload == payload:
             interval = max(interval, config.idle_interval)
-        time.sleep(interval)
+        min_period = float(interval)
+        if wake.wait(scheduler.wait_time()):
+            wake.clear()
+            woken = True
 
 
 if __name__ == "__main__":
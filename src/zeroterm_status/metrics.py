@@ -3,12 +3,35 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import fcntl
+import os
 import re
 import shutil
 import shlex
 import socket
 import struct
 import subprocess
+import threading
+import time
+from typing import Callable
+
+from .dbus import ServiceWatcher
+from .gitrefs import behind_upstream
+from .nl80211 import Nl80211Client, WirelessInfo
+from .pisugar import DEFAULT_ADDRESS as PISUGAR_DEFAULT_ADDRESS, PiSugarClient
+from .procfs import (
+    CpuSampler,
+    CpuUsage,
+    NetCounters,
+    NetDevCollector,
+    NetRates,
+    ProcessScanner,
+    ProcessUsage,
+    ProcFile,
+    SystemCollector,
+    parse_int,
+)
+from .rtnetlink import LinkMonitor
+from .timex import ClockSync
 
 
 @dataclass(frozen=True)
@@ -26,6 +49,8 @@ class WifiInfo:
     mode: str | None
     channel: str | None
     packets: int | None
+    packet_rate: float | None = None
+    bit_rate: float | None = None
 
 
 @dataclass(frozen=True)
@@ -41,10 +66,31 @@ class SystemInfo:
     temp: str | None
     mem_percent: int | None
     cpu_percent: int | None
+    cpu_cores: tuple[int | None, ...] = ()
+    top_processes: tuple[ProcessUsage, ...] = ()
 
 
-_CPU_SAMPLE: tuple[int, int] | None = None
+_CPU_SAMPLERS: dict[str, CpuSampler] = {}
+_PROCESS_SCANNERS: dict[str, ProcessScanner] = {}
+_SAMPLER_LOCK = threading.Lock()
 _COMMAND_TIMEOUT = 3.0
+_NL80211_CLIENT: Nl80211Client | None = None
+_NET_DEV: NetDevCollector | None = None
+_SYSTEM = SystemCollector()
+_CLOCK_SYNC = ClockSync()
+_LINK_MONITOR: LinkMonitor | None = None
+_LINK_MONITOR_LOCK = threading.Lock()
+_SERVICE_WATCHERS: dict[str, ServiceWatcher] = {}
+_SERVICE_WATCHERS_LOCK = threading.Lock()
+_POWER_SUPPLY_ROOT = "/sys/class/power_supply"
+_BATTERY_RESCAN = 10.0
+_BATTERY_CMD_RETRY = 60.0
+_FETCH_TIMEOUT = 120.0
+_FETCH_THREADS: dict[tuple[str, str], threading.Thread] = {}
+_FETCH_LOCK = threading.Lock()
+# Last `git rev-list` fallback per (repo, remote, branch): (checked_at, result).
+_REV_LIST_CHECKS: dict[tuple[str, str, str], tuple[float, bool | None]] = {}
+_BATTERY_SOURCES: dict[tuple[str | None, str | None, str | None], BatterySource] = {}
 
 
 def _run_command(args: list[str]) -> str | None:
@@ -73,50 +119,251 @@ def _parse_percent(text: str) -> int | None:
     return value
 
 
-def read_battery(battery_path: str | None, battery_cmd: str | None) -> BatteryInfo:
-    if battery_cmd:
-        cmd = shlex.split(battery_cmd)
-        if not cmd or shutil.which(cmd[0]) is None:
-            return BatteryInfo(percent=None, status=None)
-        output = _run_command(cmd)
-        if output:
-            return BatteryInfo(percent=_parse_percent(output), status=None)
-
-    search_root = Path(battery_path) if battery_path else Path("/sys/class/power_supply")
-    if not search_root.exists():
-        return BatteryInfo(percent=None, status=None)
-
-    for entry in search_root.iterdir():
-        capacity = entry / "capacity"
-        power_type = entry / "type"
-        status_file = entry / "status"
-        if not capacity.exists():
-            continue
-        if power_type.exists():
-            type_value = power_type.read_text(encoding="utf-8", errors="ignore").strip().lower()
-            if type_value and type_value != "battery":
-                continue
+@dataclass
+class _PowerSupply:
+    name: str
+    capacity: ProcFile
+    status: ProcFile | None
+    weight: int | None
+
+    def close(self) -> None:
+        self.capacity.close()
+        if self.status is not None:
+            self.status.close()
+
+
+def _read_sysfs_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8", errors="ignore").strip()
+    except OSError:
+        return None
+
+
+def _read_sysfs_int(path: Path) -> int | None:
+    text = _read_sysfs_text(path)
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def _fuse_status(statuses: list[str]) -> str | None:
+    if not statuses:
+        return None
+    lowered = [status.lower() for status in statuses]
+    for keyword in ("discharging", "charging"):
+        for status, value in zip(statuses, lowered):
+            if value == keyword:
+                return status
+    return statuses[0]
+
+
+def _is_pisugar_command(battery_cmd: str | None) -> bool:
+    try:
+        cmd = shlex.split(battery_cmd or "")
+    except ValueError:
+        return False
+    return bool(cmd) and os.path.basename(cmd[0]) == "pisugar-power"
+
+
+def _create_pisugar_client(address: str | None, battery_cmd: str | None) -> PiSugarClient | None:
+    if address is None and _is_pisugar_command(battery_cmd):
+        address = PISUGAR_DEFAULT_ADDRESS
+    if not address:
+        return None
+    try:
+        return PiSugarClient(address)
+    except ValueError:
+        return None
+
+
+class BatterySource:
+    def __init__(
+        self,
+        battery_path: str | None,
+        battery_cmd: str | None,
+        pisugar_address: str | None = None,
+    ) -> None:
+        self._root = Path(battery_path) if battery_path else Path(_POWER_SUPPLY_ROOT)
+        self._cmd_text = battery_cmd
+        self._pisugar = _create_pisugar_client(pisugar_address, battery_cmd)
+        self._cmd: list[str] | None = None
+        self._cmd_checked_at: float | None = None
+        self._supplies: list[_PowerSupply] | None = None
+        self._entries: frozenset[str] = frozenset()
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop_supplies()
+            if self._pisugar is not None:
+                self._pisugar.close()
+
+    def _drop_supplies(self) -> None:
+        for supply in self._supplies or []:
+            supply.close()
+        self._supplies = None
+
+    def _resolve_command(self, now: float) -> list[str] | None:
+        if self._cmd_checked_at is not None and (
+            self._cmd is not None or now - self._cmd_checked_at < _BATTERY_CMD_RETRY
+        ):
+            return self._cmd
+        self._cmd_checked_at = now
+        try:
+            cmd = shlex.split(self._cmd_text or "")
+        except ValueError:
+            cmd = []
+        self._cmd = cmd if cmd and shutil.which(cmd[0]) is not None else None
+        return self._cmd
+
+    def _list_entries(self) -> frozenset[str]:
         try:
-            percent_text = capacity.read_text(encoding="utf-8", errors="ignore").strip()
+            return frozenset(os.listdir(self._root))
         except OSError:
-            continue
-        percent = _parse_percent(percent_text)
-        status = None
-        if status_file.exists():
-            try:
-                status = status_file.read_text(encoding="utf-8", errors="ignore").strip()
-            except OSError:
-                status = None
-        return BatteryInfo(percent=percent, status=status)
+            return frozenset()
+
+    def _discover(self, now: float) -> None:
+        self._drop_supplies()
+        self._scanned_at = now
+        self._entries = self._list_entries()
+        supplies = []
+        for name in sorted(self._entries):
+            entry = self._root / name
+            capacity = entry / "capacity"
+            if not capacity.exists():
+                continue
+            type_value = (_read_sysfs_text(entry / "type") or "").lower()
+            if type_value and type_value != "battery":
+                continue
+            status = entry / "status"
+            weight = _read_sysfs_int(entry / "energy_full")
+            if weight is None:
+                weight = _read_sysfs_int(entry / "charge_full")
+            supplies.append(
+                _PowerSupply(
+                    name=name,
+                    capacity=ProcFile(capacity, 16),
+                    status=ProcFile(status, 32) if status.exists() else None,
+                    weight=weight if weight and weight > 0 else None,
+                )
+            )
+        self._supplies = supplies
+
+    def _poll_supplies(self) -> tuple[list[tuple[int | None, int | None]], list[str]] | None:
+        readings: list[tuple[int | None, int | None]] = []
+        statuses: list[str] = []
+        for supply in self._supplies or []:
+            length = supply.capacity.read()
+            if length is None:
+                return None
+            value = parse_int(supply.capacity.buffer, 0, length)
+            percent = value if value is not None and 0 <= value <= 100 else None
+            readings.append((percent, supply.weight))
+            if supply.status is not None:
+                status_length = supply.status.read()
+                if status_length:
+                    text = bytes(supply.status.buffer[:status_length]).decode("utf-8", errors="ignore").strip()
+                    if text:
+                        statuses.append(text)
+        return readings, statuses
+
+    def _read_supplies(self, now: float) -> BatteryInfo:
+        if self._supplies is None:
+            self._discover(now)
+        elif now - self._scanned_at >= _BATTERY_RESCAN:
+            if self._list_entries() != self._entries:
+                self._discover(now)
+            else:
+                self._scanned_at = now
+        polled = self._poll_supplies()
+        if polled is None:
+            self._discover(now)
+            polled = self._poll_supplies()
+            if polled is None:
+                return BatteryInfo(percent=None, status=None)
+        readings, statuses = polled
+        return BatteryInfo(percent=_fuse_percent(readings), status=_fuse_status(statuses))
+
+    def read(self) -> BatteryInfo:
+        with self._lock:
+            now = time.monotonic()
+            if self._pisugar is not None:
+                reading = self._pisugar.read()
+                if reading is not None and reading.percent is not None:
+                    status = None
+                    if reading.charging is not None:
+                        status = "Charging" if reading.charging else "Discharging"
+                    return BatteryInfo(percent=reading.percent, status=status)
+            if self._cmd_text:
+                cmd = self._resolve_command(now)
+                if cmd is None:
+                    return BatteryInfo(percent=None, status=None)
+                output = _run_command(cmd)
+                if output:
+                    return BatteryInfo(percent=_parse_percent(output), status=None)
+            return self._read_supplies(now)
+
+
+def _fuse_percent(readings: list[tuple[int | None, int | None]]) -> int | None:
+    valid = [(percent, weight) for percent, weight in readings if percent is not None]
+    if not valid:
+        return None
+    if len(valid) == 1:
+        return valid[0][0]
+    if all(weight is not None for _, weight in valid):
+        total_weight = sum(weight for _, weight in valid)
+        return int(round(sum(percent * weight for percent, weight in valid) / total_weight))
+    return int(round(sum(percent for percent, _ in valid) / len(valid)))
+
+
+def read_battery(
+    battery_path: str | None,
+    battery_cmd: str | None,
+    pisugar_address: str | None = None,
+) -> BatteryInfo:
+    key = (battery_path, battery_cmd, pisugar_address)
+    source = _BATTERY_SOURCES.get(key)
+    if source is None:
+        source = _BATTERY_SOURCES.setdefault(
+            key,
+            BatterySource(battery_path, battery_cmd, pisugar_address),
+        )
+    return source.read()
 
-    return BatteryInfo(percent=None, status=None)
+
+def start_link_monitor(on_change: Callable[[], None] | None = None) -> LinkMonitor | None:
+    global _LINK_MONITOR
+    with _LINK_MONITOR_LOCK:
+        if _LINK_MONITOR is None:
+            monitor = LinkMonitor(on_change=on_change)
+            if not monitor.start():
+                return None
+            _LINK_MONITOR = monitor
+        return _LINK_MONITOR
+
+
+def _link_monitor() -> LinkMonitor | None:
+    monitor = _LINK_MONITOR
+    if monitor is None or not monitor.ready:
+        return None
+    return monitor
 
 
 def _iface_exists(iface: str) -> bool:
+    monitor = _link_monitor()
+    if monitor is not None:
+        return monitor.get(iface) is not None
     return (Path("/sys/class/net") / iface).exists()
 
 
 def list_wifi_ifaces() -> list[str]:
+    monitor = _link_monitor()
+    if monitor is not None:
+        return monitor.wifi_ifaces()
     root = Path("/sys/class/net")
     if not root.exists():
         return []
@@ -153,6 +400,10 @@ def find_external_wifi(primary_iface: str | None) -> str | None:
 def get_ip_address(iface: str) -> str | None:
     if not iface:
         return None
+    monitor = _link_monitor()
+    if monitor is not None:
+        link = monitor.get(iface)
+        return link.addresses[0] if link and link.addresses else None
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         iface_bytes = iface.encode("utf-8")[:15]
@@ -169,6 +420,10 @@ def get_ip_address(iface: str) -> str | None:
 
 
 def _read_operstate(iface: str) -> str | None:
+    monitor = _link_monitor()
+    if monitor is not None:
+        link = monitor.get(iface)
+        return link.operstate if link else None
     path = Path("/sys/class/net") / iface / "operstate"
     if not path.exists():
         return None
@@ -200,12 +455,19 @@ def _read_wifi_mode_channel(iface: str) -> tuple[str | None, str | None]:
             if len(parts) >= 2:
                 mode = parts[1]
         if "channel" in line:
-            match = re.search(r"channel\\s+(\\d+)", line)
+            match = re.search(r"channel\s+(\d+)", line)
             if match:
                 channel = match.group(1)
     return mode, channel
 
 
+def _read_nl80211(iface: str, read_ssid: bool) -> WirelessInfo | None:
+    global _NL80211_CLIENT
+    if _NL80211_CLIENT is None:
+        _NL80211_CLIENT = Nl80211Client()
+    return _NL80211_CLIENT.interface_info(iface, read_ssid=read_ssid)
+
+
 def _read_stat_value(iface: str, name: str) -> int | None:
     path = Path("/sys/class/net") / iface / "statistics" / name
     try:
@@ -218,7 +480,25 @@ def _read_stat_value(iface: str, name: str) -> int | None:
         return None
 
 
+def _net_dev() -> NetDevCollector:
+    global _NET_DEV
+    if _NET_DEV is None:
+        _NET_DEV = NetDevCollector()
+    return _NET_DEV
+
+
+def read_net_counters() -> dict[str, NetCounters]:
+    return _net_dev().read()
+
+
+def _read_net_rates(iface: str) -> NetRates | None:
+    return _net_dev().rates(iface)
+
+
 def _read_packet_count(iface: str) -> int | None:
+    counters = read_net_counters().get(iface)
+    if counters is not None:
+        return counters.packets
     rx = _read_stat_value(iface, "rx_packets")
     tx = _read_stat_value(iface, "tx_packets")
     if rx is None and tx is None:
@@ -248,10 +528,17 @@ def read_wifi(iface: str, read_ssid: bool = True) -> WifiInfo:
             packets=None,
         )
     state = _read_operstate(iface)
-    ssid = _read_ssid(iface) if read_ssid else None
     ip = get_ip_address(iface)
-    mode, channel = _read_wifi_mode_channel(iface)
+    wireless = _read_nl80211(iface, read_ssid)
+    if wireless is not None:
+        ssid = wireless.ssid
+        mode = wireless.mode
+        channel = wireless.channel
+    else:
+        ssid = _read_ssid(iface) if read_ssid else None
+        mode, channel = _read_wifi_mode_channel(iface)
     packets = _read_packet_count(iface)
+    rates = _read_net_rates(iface)
     return WifiInfo(
         iface=iface,
         state=state,
@@ -260,12 +547,38 @@ def read_wifi(iface: str, read_ssid: bool = True) -> WifiInfo:
         mode=mode,
         channel=channel,
         packets=packets,
+        packet_rate=round(rates.pps, 1) if rates is not None else None,
+        bit_rate=round(rates.bps) if rates is not None else None,
     )
 
 
+def _unit_name(name: str) -> str:
+    return name if "." in name else f"{name}.service"
+
+
+def start_service_watcher(
+    name: str,
+    on_change: Callable[[], None] | None = None,
+) -> ServiceWatcher | None:
+    if not name:
+        return None
+    unit = _unit_name(name)
+    with _SERVICE_WATCHERS_LOCK:
+        watcher = _SERVICE_WATCHERS.get(unit)
+        if watcher is None:
+            watcher = ServiceWatcher(unit, on_change=on_change)
+            if not watcher.start():
+                return None
+            _SERVICE_WATCHERS[unit] = watcher
+        return watcher
+
+
 def read_service_state(name: str) -> ServiceInfo:
     if not name:
         return ServiceInfo(name=name, state=None)
+    watcher = _SERVICE_WATCHERS.get(_unit_name(name))
+    if watcher is not None and watcher.ready:
+        return ServiceInfo(name=name, state=watcher.state)
     if shutil.which("systemctl") is None:
         return ServiceInfo(name=name, state=None)
     output = _run_command(["systemctl", "is-active", name])
@@ -283,40 +596,21 @@ def _format_uptime(seconds: float) -> str:
     return f"{minutes}m"
 
 
-def _read_file_text(path: Path) -> str | None:
-    try:
-        return path.read_text(encoding="utf-8", errors="ignore").strip()
-    except OSError:
-        return None
-
-
 def read_uptime() -> str | None:
-    text = _read_file_text(Path("/proc/uptime"))
-    if not text:
-        return None
-    try:
-        seconds = float(text.split()[0])
-    except (ValueError, IndexError):
+    seconds = _SYSTEM.uptime_seconds()
+    if seconds is None:
         return None
     return _format_uptime(seconds)
 
 
 def read_load() -> str | None:
-    text = _read_file_text(Path("/proc/loadavg"))
-    if not text:
-        return None
-    try:
-        load_value = float(text.split()[0])
-    except (ValueError, IndexError):
+    load_value = _SYSTEM.load_average()
+    if load_value is None:
         return None
     return f"{load_value:.2f}"
 
 
-def _parse_temp_value(raw: str) -> str | None:
-    try:
-        value = int(raw.strip())
-    except ValueError:
-        return None
+def _format_temp(value: int) -> str | None:
     if value > 1000:
         value = int(round(value / 1000))
     if value < -20 or value > 150:
@@ -324,103 +618,85 @@ def _parse_temp_value(raw: str) -> str | None:
     return f"{value}C"
 
 
-def read_temperature() -> str | None:
-    root = Path("/sys/class/thermal")
-    if not root.exists():
+def _parse_temp_value(raw: str) -> str | None:
+    try:
+        value = int(raw.strip())
+    except ValueError:
         return None
-    for path in sorted(root.glob("thermal_zone*/temp")):
-        text = _read_file_text(path)
-        if not text:
-            continue
-        parsed = _parse_temp_value(text)
+    return _format_temp(value)
+
+
+def read_temperature() -> str | None:
+    for value in _SYSTEM.temperatures():
+        parsed = _format_temp(value)
         if parsed:
             return parsed
     return None
 
 
 def read_memory_percent() -> int | None:
-    text = _read_file_text(Path("/proc/meminfo"))
-    if not text:
+    total, available = _SYSTEM.memory()
+    if total is None or total <= 0 or available is None:
         return None
-    total = None
-    available = None
-    free = None
-    buffers = None
-    cached = None
-    for line in text.splitlines():
-        if line.startswith("MemTotal:"):
-            total = _parse_kib(line)
-        elif line.startswith("MemAvailable:"):
-            available = _parse_kib(line)
-        elif line.startswith("MemFree:"):
-            free = _parse_kib(line)
-        elif line.startswith("Buffers:"):
-            buffers = _parse_kib(line)
-        elif line.startswith("Cached:"):
-            cached = _parse_kib(line)
-    if total is None or total <= 0:
-        return None
-    if available is None:
-        if free is None:
-            return None
-        buffers = buffers or 0
-        cached = cached or 0
-        available = free + buffers + cached
     used = max(0, total - available)
     percent = int(round(used * 100 / total))
     return max(0, min(100, percent))
 
 
-def _parse_kib(line: str) -> int | None:
-    match = re.search(r"(\d+)", line)
-    if not match:
-        return None
-    try:
-        return int(match.group(1))
-    except ValueError:
-        return None
+def _cpu_sampler(consumer: str) -> CpuSampler:
+    with _SAMPLER_LOCK:
+        sampler = _CPU_SAMPLERS.get(consumer)
+        if sampler is None:
+            sampler = CpuSampler()
+            _CPU_SAMPLERS[consumer] = sampler
+        return sampler
 
 
-def read_cpu_percent() -> int | None:
-    global _CPU_SAMPLE
-    text = _read_file_text(Path("/proc/stat"))
-    if not text:
-        return None
-    line = text.splitlines()[0] if text else ""
-    parts = line.split()
-    if len(parts) < 5 or parts[0] != "cpu":
-        return None
-    try:
-        values = [int(value) for value in parts[1:]]
-    except ValueError:
-        return None
-    total = sum(values)
-    idle = values[3] + (values[4] if len(values) > 4 else 0)
-    if total <= 0:
-        return None
-    if _CPU_SAMPLE is None:
-        _CPU_SAMPLE = (total, idle)
-        return None
-    delta_total = total - _CPU_SAMPLE[0]
-    delta_idle = idle - _CPU_SAMPLE[1]
-    _CPU_SAMPLE = (total, idle)
-    if delta_total <= 0:
-        return None
-    usage = int(round((delta_total - delta_idle) * 100 / delta_total))
-    return max(0, min(100, usage))
+def _process_scanner(consumer: str) -> ProcessScanner:
+    with _SAMPLER_LOCK:
+        scanner = _PROCESS_SCANNERS.get(consumer)
+        if scanner is None:
+            scanner = ProcessScanner()
+            _PROCESS_SCANNERS[consumer] = scanner
+        return scanner
+
+
+def read_cpu_usage(consumer: str = "status") -> CpuUsage | None:
+    return _cpu_sampler(consumer).sample()
+
+
+def read_cpu_percent(consumer: str = "status") -> int | None:
+    usage = read_cpu_usage(consumer)
+    return usage.percent if usage is not None else None
+
+
+def read_top_processes(count: int = 3, consumer: str = "status") -> list[ProcessUsage]:
+    if count <= 0:
+        return []
+    return _process_scanner(consumer).top(count)
 
 
-def read_system() -> SystemInfo:
+def read_system(top: int = 0, consumer: str = "status") -> SystemInfo:
+    usage = read_cpu_usage(consumer)
     return SystemInfo(
         uptime=read_uptime(),
         load=read_load(),
         temp=read_temperature(),
         mem_percent=read_memory_percent(),
-        cpu_percent=read_cpu_percent(),
+        cpu_percent=usage.percent if usage is not None else None,
+        cpu_cores=usage.cores if usage is not None else (),
+        top_processes=tuple(read_top_processes(top, consumer)),
     )
 
 
+def _read_adjtimex_sync() -> bool | None:
+    return _CLOCK_SYNC.read()
+
+
 def read_time_sync() -> bool | None:
+    synced = _read_adjtimex_sync()
+    if synced is not None:
+        return synced
     if shutil.which("timedatectl") is None:
         return None
     output = _run_command(["timedatectl", "show", "-p", "NTPSynchronized", "--value"])
@@ -440,26 +716,80 @@ def read_time_sync() -> bool | None:
     return None
 
 
+def _run_fetch(repo: str, remote: str) -> None:
+    try:
+        subprocess.run(
+            ["git", "-C", repo, "fetch", "--quiet", remote],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=_FETCH_TIMEOUT,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return
+
+
+def _start_fetch(repo: str, remote: str) -> bool:
+    key = (repo, remote)
+    with _FETCH_LOCK:
+        running = _FETCH_THREADS.get(key)
+        if running is not None and running.is_alive():
+            return False
+        if shutil.which("git") is None:
+            return False
+        thread = threading.Thread(
+            target=_run_fetch,
+            args=(repo, remote),
+            name="zeroterm-git-fetch",
+            daemon=True,
+        )
+        _FETCH_THREADS[key] = thread
+        thread.start()
+        return True
+
+
+def start_update_fetch(repo_path: str | None, remote: str) -> bool:
+    if not repo_path or not Path(repo_path).exists():
+        return False
+    return _start_fetch(str(Path(repo_path)), remote)
+
+
+def _rev_list_update(repo: Path, remote: str, branch: str) -> bool | None:
+    if shutil.which("git") is None:
+        return None
+    output = _run_command(["git", "-C", str(repo), "rev-list", "--count", f"HEAD..{remote}/{branch}"])
+    if not output:
+        return None
+    try:
+        count = int(output.strip())
+    except ValueError:
+        return None
+    return count > 0
+
+
 def read_update_available(
     repo_path: str | None,
     remote: str,
     branch: str,
     fetch: bool,
+    fallback_interval: float = 0.0,
 ) -> bool | None:
     if not repo_path:
         return None
-    if shutil.which("git") is None:
-        return None
     repo = Path(repo_path)
     if not repo.exists():
         return None
     if fetch:
-        _run_command(["git", "-C", str(repo), "fetch", "--quiet", remote])
-    output = _run_command(["git", "-C", str(repo), "rev-list", "--count", f"HEAD..{remote}/{branch}"])
-    if not output:
-        return None
-    try:
-        count = int(output.strip())
-    except ValueError:
-        return None
-    return count > 0
+        _start_fetch(str(repo), remote)
+    behind = behind_upstream(repo, remote, branch)
+    if behind is not None:
+        return behind
+    # Refs or commits could not be read directly; fork git at most every fallback_interval.
+    key = (str(repo), remote, branch)
+    now = time.monotonic()
+    checked = _REV_LIST_CHECKS.get(key)
+    if checked is not None and now - checked[0] < fallback_interval:
+        return checked[1]
+    result = _rev_list_update(repo, remote, branch)
+    _REV_LIST_CHECKS[key] = (now, result)
+    return result
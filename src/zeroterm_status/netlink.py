@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import errno
+import os
+import socket
+import struct
+import threading
+from typing import Iterator
+
+NETLINK_ROUTE = 0
+NETLINK_GENERIC = 16
+
+NLM_F_REQUEST = 0x1
+NLM_F_MULTI = 0x2
+NLM_F_ACK = 0x4
+NLM_F_DUMP = 0x300
+
+NLMSG_NOOP = 1
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+NLA_TYPE_MASK = 0x3FFF
+
+_NLMSG_HEADER = struct.Struct("=IHHII")
+_NLA_HEADER = struct.Struct("=HH")
+_NLMSG_ERROR = struct.Struct("=i")
+_RECV_SIZE = 65536
+# A kernel reply is immediate; a missing one must not hang the caller forever.
+DEFAULT_TIMEOUT = 2.0
+
+
+class NetlinkError(OSError):
+    pass
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def pack_attr(attr_type: int, payload: bytes) -> bytes:
+    length = _NLA_HEADER.size + len(payload)
+    padding = b"\0" * (_align(length) - length)
+    return _NLA_HEADER.pack(length, attr_type) + payload + padding
+
+
+def pack_attr_u32(attr_type: int, value: int) -> bytes:
+    return pack_attr(attr_type, struct.pack("=I", value))
+
+
+def pack_attr_str(attr_type: int, value: str) -> bytes:
+    return pack_attr(attr_type, value.encode("utf-8") + b"\0")
+
+
+def pack_message(msg_type: int, flags: int, seq: int, payload: bytes, pid: int = 0) -> bytes:
+    length = _NLMSG_HEADER.size + len(payload)
+    return _NLMSG_HEADER.pack(length, msg_type, flags, seq, pid) + payload
+
+
+def iter_messages(data: bytes) -> Iterator[tuple[int, int, int, memoryview]]:
+    view = memoryview(data)
+    offset = 0
+    total = len(view)
+    while offset + _NLMSG_HEADER.size <= total:
+        length, msg_type, flags, seq, _ = _NLMSG_HEADER.unpack_from(view, offset)
+        if length < _NLMSG_HEADER.size or offset + length > total:
+            return
+        yield msg_type, flags, seq, view[offset + _NLMSG_HEADER.size : offset + length]
+        offset += _align(length)
+
+
+def parse_attrs(data, offset: int = 0) -> dict[int, memoryview]:
+    view = memoryview(data)
+    attrs: dict[int, memoryview] = {}
+    total = len(view)
+    while offset + _NLA_HEADER.size <= total:
+        length, attr_type = _NLA_HEADER.unpack_from(view, offset)
+        if length < _NLA_HEADER.size or offset + length > total:
+            break
+        attrs[attr_type & NLA_TYPE_MASK] = view[offset + _NLA_HEADER.size : offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def attr_u16(value: memoryview | None) -> int | None:
+    if value is None or len(value) < 2:
+        return None
+    return struct.unpack_from("=H", value)[0]
+
+
+def attr_u32(value: memoryview | None) -> int | None:
+    if value is None or len(value) < 4:
+        return None
+    return struct.unpack_from("=I", value)[0]
+
+
+def attr_str(value: memoryview | None) -> str | None:
+    if value is None:
+        return None
+    return bytes(value).split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+
+class NetlinkSocket:
+    def __init__(self, protocol: int, groups: int = 0, sock=None, timeout: float | None = DEFAULT_TIMEOUT) -> None:
+        self._protocol = protocol
+        self._groups = groups
+        self._timeout = timeout
+        self._sock = sock
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _ensure_socket(self):
+        if self._sock is not None:
+            return self._sock
+        family = getattr(socket, "AF_NETLINK", None)
+        if family is None:
+            raise NetlinkError("netlink sockets are not supported on this platform")
+        sock = socket.socket(family, socket.SOCK_RAW | getattr(socket, "SOCK_CLOEXEC", 0), self._protocol)
+        try:
+            sock.settimeout(self._timeout)
+            sock.bind((0, self._groups))
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        return sock
+
+    def fileno(self) -> int:
+        return self._ensure_socket().fileno()
+
+    def close(self) -> None:
+        if self._sock is None:
+            return
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        self._sock = None
+
+    def recv(self) -> bytes:
+        return self._recv(self._ensure_socket())
+
+    @staticmethod
+    def _recv(sock) -> bytes:
+        try:
+            return sock.recv(_RECV_SIZE)
+        except socket.timeout as exc:
+            raise NetlinkError(errno.ETIMEDOUT, "netlink receive timed out") from exc
+
+    def request(self, msg_type: int, flags: int, payload: bytes) -> list[tuple[int, memoryview]]:
+        with self._lock:
+            try:
+                return self._request_locked(msg_type, flags, payload)
+            except NetlinkError:
+                raise
+            except OSError:
+                self.close()
+                raise
+
+    def _request_locked(self, msg_type: int, flags: int, payload: bytes) -> list[tuple[int, memoryview]]:
+        sock = self._ensure_socket()
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        seq = self._seq
+        sock.send(pack_message(msg_type, flags | NLM_F_REQUEST | NLM_F_ACK, seq, payload))
+        replies: list[tuple[int, memoryview]] = []
+        while True:
+            data = self._recv(sock)
+            if not data:
+                raise NetlinkError("netlink socket closed")
+            for reply_type, reply_flags, reply_seq, body in iter_messages(data):
+                if reply_seq != seq:
+                    continue
+                if reply_type == NLMSG_DONE:
+                    return replies
+                if reply_type == NLMSG_ERROR:
+                    (code,) = _NLMSG_ERROR.unpack_from(body)
+                    if code == 0:
+                        if not reply_flags & NLM_F_MULTI and not flags & NLM_F_DUMP:
+                            return replies
+                        continue
+                    raise NetlinkError(-code, os.strerror(-code))
+                if reply_type == NLMSG_NOOP:
+                    continue
+                replies.append((reply_type, body))
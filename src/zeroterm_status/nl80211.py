@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import socket
+import struct
+import threading
+
+from .netlink import (
+    NETLINK_GENERIC,
+    NLM_F_DUMP,
+    NetlinkError,
+    NetlinkSocket,
+    attr_str,
+    attr_u16,
+    attr_u32,
+    pack_attr_str,
+    pack_attr_u32,
+    parse_attrs,
+)
+
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_SCAN = 32
+
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_IFNAME = 4
+NL80211_ATTR_IFTYPE = 5
+NL80211_ATTR_WIPHY_FREQ = 38
+NL80211_ATTR_BSS = 47
+NL80211_ATTR_SSID = 52
+
+NL80211_BSS_FREQUENCY = 2
+NL80211_BSS_INFORMATION_ELEMENTS = 6
+NL80211_BSS_STATUS = 9
+NL80211_BSS_STATUS_ASSOCIATED = 1
+NL80211_BSS_STATUS_IBSS_JOINED = 2
+
+_GENL_HEADER = struct.Struct("=BBH")
+
+IFTYPE_NAMES = {
+    1: "IBSS",
+    2: "managed",
+    3: "AP",
+    4: "AP/VLAN",
+    5: "WDS",
+    6: "monitor",
+    7: "mesh point",
+    8: "P2P-client",
+    9: "P2P-GO",
+    10: "P2P-device",
+    11: "outside context of a BSS",
+    12: "NAN",
+}
+
+
+@dataclass(frozen=True)
+class WirelessInfo:
+    iface: str
+    mode: str | None
+    frequency: int | None
+    channel: str | None
+    ssid: str | None
+
+
+def frequency_to_channel(freq: int | None) -> int | None:
+    if freq is None or freq <= 0:
+        return None
+    if freq == 2484:
+        return 14
+    if 2407 < freq < 2484:
+        return (freq - 2407) // 5
+    if 4910 <= freq <= 4980:
+        return (freq - 4000) // 5
+    if freq == 5935:
+        return 2
+    if 5000 < freq < 5950:
+        return (freq - 5000) // 5
+    if 5950 < freq <= 7115:
+        return (freq - 5950) // 5
+    if 58320 <= freq <= 70200:
+        return (freq - 56160) // 2160
+    return None
+
+
+def _ssid_from_ies(ies: memoryview | None) -> bytes | None:
+    if ies is None:
+        return None
+    data = bytes(ies)
+    offset = 0
+    while offset + 2 <= len(data):
+        element_id = data[offset]
+        length = data[offset + 1]
+        start = offset + 2
+        if start + length > len(data):
+            return None
+        if element_id == 0:
+            return data[start : start + length]
+        offset = start + length
+    return None
+
+
+def _decode_ssid(raw: bytes | None) -> str | None:
+    if not raw:
+        return None
+    text = raw.decode("utf-8", errors="replace").strip("\0")
+    return text or None
+
+
+def _genl_payload(cmd: int, attrs: bytes, version: int = 1) -> bytes:
+    return _GENL_HEADER.pack(cmd, version, 0) + attrs
+
+
+class Nl80211Client:
+    def __init__(self, sock=None) -> None:
+        self._netlink = NetlinkSocket(NETLINK_GENERIC, sock=sock)
+        self._family_id: int | None = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._netlink.close()
+        self._family_id = None
+
+    def _resolve_family(self) -> int:
+        if self._family_id is not None:
+            return self._family_id
+        payload = _genl_payload(CTRL_CMD_GETFAMILY, pack_attr_str(CTRL_ATTR_FAMILY_NAME, "nl80211"))
+        for _, body in self._netlink.request(GENL_ID_CTRL, 0, payload):
+            family_id = attr_u16(parse_attrs(body, _GENL_HEADER.size).get(CTRL_ATTR_FAMILY_ID))
+            if family_id is not None:
+                self._family_id = family_id
+                return family_id
+        raise NetlinkError("nl80211 family not available")
+
+    def _query(self, cmd: int, ifindex: int, flags: int = 0) -> list[dict[int, memoryview]]:
+        family_id = self._resolve_family()
+        payload = _genl_payload(cmd, pack_attr_u32(NL80211_ATTR_IFINDEX, ifindex))
+        return [
+            parse_attrs(body, _GENL_HEADER.size)
+            for msg_type, body in self._netlink.request(family_id, flags, payload)
+            if msg_type == family_id
+        ]
+
+    def _associated_bss(self, ifindex: int) -> tuple[bytes | None, int | None]:
+        for attrs in self._query(NL80211_CMD_GET_SCAN, ifindex, NLM_F_DUMP):
+            bss_raw = attrs.get(NL80211_ATTR_BSS)
+            if bss_raw is None:
+                continue
+            bss = parse_attrs(bss_raw)
+            status = attr_u32(bss.get(NL80211_BSS_STATUS))
+            if status not in {NL80211_BSS_STATUS_ASSOCIATED, NL80211_BSS_STATUS_IBSS_JOINED}:
+                continue
+            return (
+                _ssid_from_ies(bss.get(NL80211_BSS_INFORMATION_ELEMENTS)),
+                attr_u32(bss.get(NL80211_BSS_FREQUENCY)),
+            )
+        return None, None
+
+    def interface_info(self, iface: str, read_ssid: bool = True) -> WirelessInfo | None:
+        try:
+            ifindex = socket.if_nametoindex(iface)
+        except OSError:
+            return None
+        with self._lock:
+            try:
+                replies = self._query(NL80211_CMD_GET_INTERFACE, ifindex)
+                if not replies:
+                    return None
+                attrs = replies[0]
+                iftype = attr_u32(attrs.get(NL80211_ATTR_IFTYPE))
+                frequency = attr_u32(attrs.get(NL80211_ATTR_WIPHY_FREQ))
+                raw_ssid = bytes(attrs[NL80211_ATTR_SSID]) if NL80211_ATTR_SSID in attrs else None
+                if read_ssid and raw_ssid is None and iftype == 2:
+                    raw_ssid, bss_frequency = self._associated_bss(ifindex)
+                    frequency = frequency or bss_frequency
+            except NetlinkError as exc:
+                if exc.errno is None:
+                    self.close()
+                return None
+            except OSError:
+                self.close()
+                return None
+        channel = frequency_to_channel(frequency)
+        return WirelessInfo(
+            iface=attr_str(attrs.get(NL80211_ATTR_IFNAME)) or iface,
+            mode=IFTYPE_NAMES.get(iftype) if iftype is not None else None,
+            frequency=frequency,
+            channel=str(channel) if channel is not None else None,
+            ssid=_decode_ssid(raw_ssid) if read_ssid else None,
+        )
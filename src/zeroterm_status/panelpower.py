@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import time
+from typing import Callable
+
+
+@dataclass
+class PowerStats:
+    sleeps: int = 0
+    wakes: int = 0
+    inits: int = 0
+    wake_seconds: float = 0.0
+    wake_max: float = 0.0
+    init_seconds: float = 0.0
+    asleep_seconds: float = 0.0
+    awake_seconds: float = 0.0
+
+    def summary(self) -> str:
+        wake_avg = self.wake_seconds / self.wakes if self.wakes else 0.0
+        tracked = self.asleep_seconds + self.awake_seconds
+        asleep = self.asleep_seconds / tracked * 100 if tracked else 0.0
+        return (
+            f"sleeps={self.sleeps} wakes={self.wakes} inits={self.inits} "
+            f"wake avg={wake_avg * 1000:.0f}ms max={self.wake_max * 1000:.0f}ms "
+            f"setup={self.wake_seconds + self.init_seconds:.1f}s asleep={asleep:.0f}%"
+        )
+
+
+class PanelPower:
+    """Tracks the controller's deep-sleep state for a driver.
+
+    With ``simulated_wake`` set there is no hardware: wakes are booked at
+    that modelled latency instead of the measured time of the wake action.
+    """
+
+    def __init__(
+        self,
+        simulated_wake: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.stats = PowerStats()
+        self.asleep = False
+        self._simulated_wake = simulated_wake
+        self._clock = clock
+        self._since = clock()
+
+    def _elapsed(self, start: float) -> float:
+        if self._simulated_wake is not None:
+            return self._simulated_wake
+        return self._clock() - start
+
+    def _switch(self, asleep: bool) -> None:
+        now = self._clock()
+        if self.asleep:
+            self.stats.asleep_seconds += now - self._since
+        else:
+            self.stats.awake_seconds += now - self._since
+        self.asleep = asleep
+        self._since = now
+
+    def init(self, action: Callable[[], object] | None = None) -> None:
+        start = self._clock()
+        if action is not None:
+            action()
+        self.stats.inits += 1
+        self.stats.init_seconds += self._elapsed(start)
+        self._switch(False)
+
+    def wake(self, action: Callable[[], object] | None = None) -> bool:
+        if not self.asleep:
+            return False
+        start = self._clock()
+        if action is not None:
+            action()
+        elapsed = self._elapsed(start)
+        self.stats.wakes += 1
+        self.stats.wake_seconds += elapsed
+        self.stats.wake_max = max(self.stats.wake_max, elapsed)
+        self._switch(False)
+        return True
+
+    def sleep(self, action: Callable[[], object] | None = None) -> None:
+        if self.asleep:
+            return
+        if action is not None:
+            action()
+        self.stats.sleeps += 1
+        self._switch(True)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import socket
+import threading
+import time
+
+DEFAULT_ADDRESS = "127.0.0.1:8423"
+_QUERY = b"get battery\nget battery_charging\n"
+_MIN_BACKOFF = 1.0
+_MAX_BACKOFF = 60.0
+_MAX_LINE = 4096
+
+
+@dataclass(frozen=True)
+class PiSugarReading:
+    percent: int | None
+    charging: bool | None
+
+
+def parse_address(address: str) -> tuple[int, object]:
+    value = address.strip()
+    if value.startswith("unix:"):
+        return socket.AF_UNIX, value[5:]
+    if value.startswith("/"):
+        return socket.AF_UNIX, value
+    host, sep, port = value.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"invalid PiSugar address: {address}")
+    return socket.AF_INET, (host.strip("[]") or "127.0.0.1", int(port))
+
+
+def _parse_percent(value: str) -> int | None:
+    try:
+        percent = int(round(float(value)))
+    except ValueError:
+        return None
+    return max(0, min(100, percent))
+
+
+def _parse_bool(value: str) -> bool | None:
+    lowered = value.lower()
+    if lowered in {"true", "1"}:
+        return True
+    if lowered in {"false", "0"}:
+        return False
+    return None
+
+
+class PiSugarClient:
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 0.5) -> None:
+        self._family, self._target = parse_address(address)
+        self._timeout = timeout
+        self._sock: socket.socket | None = None
+        self._pending = b""
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._pending = b""
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self._timeout)
+            sock.connect(self._target)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _read_line(self, sock: socket.socket) -> str:
+        while b"\n" not in self._pending:
+            if len(self._pending) > _MAX_LINE:
+                raise OSError("PiSugar response too long")
+            chunk = sock.recv(1024)
+            if not chunk:
+                raise OSError("PiSugar server closed the connection")
+            self._pending += chunk
+        line, _, self._pending = self._pending.partition(b"\n")
+        return line.decode("utf-8", errors="ignore").strip()
+
+    def _query(self, sock: socket.socket) -> PiSugarReading:
+        sock.sendall(_QUERY)
+        values: dict[str, str] = {}
+        while "battery" not in values or "battery_charging" not in values:
+            key, sep, value = self._read_line(sock).partition(":")
+            if sep:
+                values[key.strip()] = value.strip()
+        return PiSugarReading(
+            percent=_parse_percent(values["battery"]),
+            charging=_parse_bool(values["battery_charging"]),
+        )
+
+    def read(self) -> PiSugarReading | None:
+        with self._lock:
+            now = time.monotonic()
+            if self._sock is None and now < self._next_attempt:
+                return None
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._sock = self._connect()
+                    reading = self._query(self._sock)
+                except OSError:
+                    reused = attempt == 0 and self._sock is not None
+                    self._disconnect()
+                    if reused:
+                        continue
+                    break
+                self._backoff = 0.0
+                return reading
+            self._backoff = min(_MAX_BACKOFF, max(_MIN_BACKOFF, self._backoff * 2))
+            self._next_attempt = time.monotonic() + self._backoff
+            return None
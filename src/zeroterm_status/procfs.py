@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import threading
+import time
+from typing import Callable
+
+_DEFAULT_BUFFER = 4096
+_MAX_BUFFER = 1 << 20
+_THERMAL_RESCAN = 60.0
+_MAX_PROCESS_FDS = 256
+
+_MEM_TOTAL = b"MemTotal:"
+_MEM_AVAILABLE = b"\nMemAvailable:"
+_MEM_FREE = b"\nMemFree:"
+_MEM_BUFFERS = b"\nBuffers:"
+_MEM_CACHED = b"\nCached:"
+
+
+class ProcFile:
+    def __init__(self, path: str | Path, size: int = _DEFAULT_BUFFER) -> None:
+        self.path = str(path)
+        self.buffer = bytearray(size)
+        self._fd: int | None = None
+
+    def _open(self) -> int | None:
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+            except OSError:
+                return None
+        return self._fd
+
+    def close(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+        self._fd = None
+
+    def read(self) -> int | None:
+        retried = False
+        while True:
+            fd = self._open()
+            if fd is None:
+                return None
+            try:
+                length = _pread_into(fd, self.buffer)
+            except OSError:
+                self.close()
+                if retried:
+                    return None
+                retried = True
+                continue
+            if length == len(self.buffer) and length < _MAX_BUFFER:
+                self.buffer = bytearray(length * 2)
+                continue
+            return length
+
+    def read_int(self) -> int | None:
+        length = self.read()
+        if not length:
+            return None
+        return parse_int(self.buffer, 0, length)
+
+
+def _pread_into(fd: int, buffer: bytearray) -> int:
+    preadv = getattr(os, "preadv", None)
+    if preadv is not None:
+        return preadv(fd, [buffer], 0)
+    data = os.pread(fd, len(buffer), 0)
+    buffer[: len(data)] = data
+    return len(data)
+
+
+def parse_int(buf: bytearray, start: int, end: int) -> int | None:
+    while start < end and buf[start] in b" \t":
+        start += 1
+    stop = start
+    if stop < end and buf[stop] == 0x2D:
+        stop += 1
+    while stop < end and 0x30 <= buf[stop] <= 0x39:
+        stop += 1
+    if stop == start or (stop == start + 1 and buf[start] == 0x2D):
+        return None
+    return int(buf[start:stop])
+
+
+def parse_field_kib(buf: bytearray, length: int, key: bytes) -> int | None:
+    index = buf.find(key, 0, length)
+    if index < 0:
+        return None
+    start = index + len(key)
+    end = buf.find(b"\n", start, length)
+    return parse_int(buf, start, end if end >= 0 else length)
+
+
+def parse_first_fixed(buf: bytearray, length: int) -> tuple[int, int] | None:
+    end = buf.find(b" ", 0, length)
+    if end < 0:
+        end = buf.find(b"\n", 0, length)
+        if end < 0:
+            end = length
+    dot = buf.find(b".", 0, end)
+    if dot < 0:
+        whole = parse_int(buf, 0, end)
+        return (whole, 0) if whole is not None else None
+    whole = parse_int(buf, 0, dot)
+    if whole is None:
+        return None
+    fraction = buf[dot + 1 : min(dot + 3, end)].ljust(2, b"0")
+    if not fraction.isdigit():
+        return None
+    return whole, int(fraction)
+
+
+def _cpu_line(buf: bytearray, start: int, end: int) -> tuple[int, int] | None:
+    fields = buf[start:end].split()
+    if len(fields) < 4:
+        return None
+    try:
+        values = [int(value) for value in fields]
+    except ValueError:
+        return None
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    return sum(values), idle
+
+
+def parse_cpu_table(buf: bytearray, length: int, cores: bool = True) -> list[tuple[int, int]]:
+    if not buf.startswith(b"cpu "):
+        return []
+    end = buf.find(b"\n", 0, length)
+    if end < 0:
+        end = length
+    aggregate = _cpu_line(buf, 4, end)
+    if aggregate is None:
+        return []
+    table = [aggregate]
+    while cores and end < length and buf.startswith(b"cpu", end + 1):
+        start = buf.find(b" ", end + 1, length)
+        next_end = buf.find(b"\n", end + 1, length)
+        if next_end < 0:
+            next_end = length
+        if start < 0 or start > next_end:
+            break
+        line = _cpu_line(buf, start, next_end)
+        if line is None:
+            break
+        table.append(line)
+        end = next_end
+    return table
+
+
+def _usage(current: tuple[int, int], previous: tuple[int, int]) -> int | None:
+    delta_total = current[0] - previous[0]
+    delta_idle = current[1] - previous[1]
+    if delta_total <= 0:
+        return None
+    usage = int(round((delta_total - delta_idle) * 100 / delta_total))
+    return max(0, min(100, usage))
+
+
+class SystemCollector:
+    def __init__(self, proc_root: str = "/proc", thermal_root: str = "/sys/class/thermal") -> None:
+        proc = Path(proc_root)
+        self._thermal_root = Path(thermal_root)
+        self._uptime = ProcFile(proc / "uptime", 128)
+        self._loadavg = ProcFile(proc / "loadavg", 128)
+        self._meminfo = ProcFile(proc / "meminfo")
+        self._thermal: list[ProcFile] | None = None
+        self._thermal_scanned_at = 0.0
+        # The read buffers are shared by the collector pool and zerotermd threads.
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            for handle in (self._uptime, self._loadavg, self._meminfo, *(self._thermal or [])):
+                handle.close()
+            self._thermal = None
+
+    def uptime_seconds(self) -> float | None:
+        with self._lock:
+            length = self._uptime.read()
+            if not length:
+                return None
+            parsed = parse_first_fixed(self._uptime.buffer, length)
+        if parsed is None:
+            return None
+        return parsed[0] + parsed[1] / 100
+
+    def load_average(self) -> float | None:
+        with self._lock:
+            length = self._loadavg.read()
+            if not length:
+                return None
+            parsed = parse_first_fixed(self._loadavg.buffer, length)
+        if parsed is None:
+            return None
+        return parsed[0] + parsed[1] / 100
+
+    def memory(self) -> tuple[int | None, int | None]:
+        with self._lock:
+            length = self._meminfo.read()
+            if not length:
+                return None, None
+            buf = self._meminfo.buffer
+            total = parse_field_kib(buf, length, _MEM_TOTAL)
+            available = parse_field_kib(buf, length, _MEM_AVAILABLE)
+            if available is None:
+                free = parse_field_kib(buf, length, _MEM_FREE)
+                if free is not None:
+                    buffers = parse_field_kib(buf, length, _MEM_BUFFERS) or 0
+                    cached = parse_field_kib(buf, length, _MEM_CACHED) or 0
+                    available = free + buffers + cached
+        return total, available
+
+    def _thermal_zones(self) -> list[ProcFile]:
+        now = time.monotonic()
+        if self._thermal is None or (not self._thermal and now - self._thermal_scanned_at >= _THERMAL_RESCAN):
+            self._thermal_scanned_at = now
+            if self._thermal_root.exists():
+                paths = sorted(self._thermal_root.glob("thermal_zone*/temp"))
+            else:
+                paths = []
+            self._thermal = [ProcFile(path, 64) for path in paths]
+        return self._thermal
+
+    def temperatures(self) -> list[int]:
+        values = []
+        with self._lock:
+            for handle in self._thermal_zones():
+                value = handle.read_int()
+                if value is not None:
+                    values.append(value)
+        return values
+
+
+@dataclass(frozen=True)
+class NetCounters:
+    rx_bytes: int
+    rx_packets: int
+    rx_errors: int
+    rx_drops: int
+    tx_bytes: int
+    tx_packets: int
+    tx_errors: int
+    tx_drops: int
+
+    @property
+    def packets(self) -> int:
+        return self.rx_packets + self.tx_packets
+
+
+@dataclass(frozen=True)
+class NetRates:
+    rx_pps: float
+    tx_pps: float
+    rx_bps: float
+    tx_bps: float
+
+    @property
+    def pps(self) -> float:
+        return self.rx_pps + self.tx_pps
+
+    @property
+    def bps(self) -> float:
+        return self.rx_bps + self.tx_bps
+
+
+def parse_net_dev(buf: bytearray, length: int) -> dict[str, NetCounters]:
+    table: dict[str, NetCounters] = {}
+    start = buf.find(b"\n", 0, length)
+    start = buf.find(b"\n", start + 1, length) if start >= 0 else -1
+    while 0 <= start < length:
+        end = buf.find(b"\n", start + 1, length)
+        if end < 0:
+            end = length
+        colon = buf.find(b":", start + 1, end)
+        if colon > 0:
+            fields = buf[colon + 1 : end].split()
+            if len(fields) >= 12:
+                try:
+                    values = [int(fields[index]) for index in (0, 1, 2, 3, 8, 9, 10, 11)]
+                except ValueError:
+                    values = None
+                if values is not None:
+                    name = bytes(buf[start + 1 : colon]).strip().decode("utf-8", errors="replace")
+                    table[name] = NetCounters(*values)
+        start = end
+    return table
+
+
+class NetDevCollector:
+    def __init__(self, proc_root: str = "/proc", max_age: float = 0.5) -> None:
+        self._file = ProcFile(Path(proc_root) / "net" / "dev", 8192)
+        self._max_age = max_age
+        self._table: dict[str, NetCounters] = {}
+        self._read_at: float | None = None
+        self._baselines: dict[str, tuple[float, NetCounters]] = {}
+        self._last_rates: dict[str, NetRates] = {}
+        # The buffer and rate baselines are shared by the collector pool and zerotermd threads.
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def read(self) -> dict[str, NetCounters]:
+        with self._lock:
+            return self._read_locked()
+
+    def _read_locked(self) -> dict[str, NetCounters]:
+        now = time.monotonic()
+        if self._read_at is not None and now - self._read_at < self._max_age:
+            return self._table
+        length = self._file.read()
+        self._table = parse_net_dev(self._file.buffer, length) if length else {}
+        self._read_at = now
+        return self._table
+
+    def rates(self, iface: str) -> NetRates | None:
+        with self._lock:
+            counters = self._read_locked().get(iface)
+            if counters is None:
+                self._baselines.pop(iface, None)
+                return None
+            now = self._read_at or time.monotonic()
+            baseline = self._baselines.get(iface)
+            if baseline is not None and baseline[0] == now:
+                return self._last_rates.get(iface)
+            self._baselines[iface] = (now, counters)
+            if baseline is None:
+                return None
+            elapsed = now - baseline[0]
+            previous = baseline[1]
+            deltas = (
+                counters.rx_packets - previous.rx_packets,
+                counters.tx_packets - previous.tx_packets,
+                counters.rx_bytes - previous.rx_bytes,
+                counters.tx_bytes - previous.tx_bytes,
+            )
+            if elapsed <= 0 or min(deltas) < 0:
+                return None
+            rates = NetRates(
+                rx_pps=deltas[0] / elapsed,
+                tx_pps=deltas[1] / elapsed,
+                rx_bps=deltas[2] * 8 / elapsed,
+                tx_bps=deltas[3] * 8 / elapsed,
+            )
+            self._last_rates[iface] = rates
+            return rates
+
+
+@dataclass(frozen=True)
+class CpuUsage:
+    percent: int | None
+    cores: tuple[int | None, ...]
+
+
+class CpuSampler:
+    def __init__(self, proc_root: str = "/proc") -> None:
+        self._stat = ProcFile(Path(proc_root) / "stat")
+        self._baseline: list[tuple[int, int]] | None = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._stat.close()
+
+    def sample(self) -> CpuUsage | None:
+        with self._lock:
+            length = self._stat.read()
+            if not length:
+                return None
+            table = parse_cpu_table(self._stat.buffer, length)
+            if not table or table[0][0] <= 0:
+                return None
+            previous = self._baseline
+            self._baseline = table
+        if previous is None:
+            return None
+        if len(previous) != len(table):
+            return CpuUsage(percent=_usage(table[0], previous[0]), cores=())
+        return CpuUsage(
+            percent=_usage(table[0], previous[0]),
+            cores=tuple(_usage(current, old) for current, old in zip(table[1:], previous[1:])),
+        )
+
+
+@dataclass(frozen=True)
+class ProcessUsage:
+    pid: int
+    name: str
+    percent: float
+
+
+def parse_pid_stat(buf: bytearray, length: int) -> tuple[str, int, int] | None:
+    open_paren = buf.find(b"(", 0, length)
+    close_paren = buf.rfind(b")", 0, length)
+    if open_paren < 0 or close_paren < open_paren:
+        return None
+    fields = buf[close_paren + 2 : length].split()
+    if len(fields) < 20:
+        return None
+    try:
+        ticks = int(fields[11]) + int(fields[12])
+        start_time = int(fields[19])
+    except ValueError:
+        return None
+    name = bytes(buf[open_paren + 1 : close_paren]).decode("utf-8", errors="replace")
+    return name, ticks, start_time
+
+
+class ProcessScanner:
+    def __init__(
+        self,
+        proc_root: str = "/proc",
+        max_open: int = _MAX_PROCESS_FDS,
+        clock: Callable[[], float] = time.monotonic,
+        clock_ticks: int | None = None,
+    ) -> None:
+        self._proc = Path(proc_root)
+        self._max_open = max_open
+        self._clock = clock
+        if clock_ticks is None:
+            try:
+                clock_ticks = os.sysconf("SC_CLK_TCK")
+            except (AttributeError, ValueError, OSError):
+                clock_ticks = 100
+        self._clock_ticks = max(1, clock_ticks)
+        self._files: dict[int, ProcFile] = {}
+        self._baseline: dict[int, tuple[int, int]] = {}
+        self._sampled_at: float | None = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            for handle in self._files.values():
+                handle.close()
+            self._files.clear()
+
+    def _pids(self) -> list[int]:
+        try:
+            with os.scandir(self._proc) as entries:
+                return [int(entry.name) for entry in entries if entry.name.isdigit()]
+        except OSError:
+            return []
+
+    def _read(self, pid: int) -> tuple[str, int, int] | None:
+        handle = self._files.get(pid)
+        cached = handle is not None
+        if handle is None:
+            handle = ProcFile(self._proc / str(pid) / "stat", 512)
+        length = handle.read()
+        if length and not cached and len(self._files) < self._max_open:
+            self._files[pid] = handle
+        elif not cached:
+            handle.close()
+        if not length:
+            return None
+        return parse_pid_stat(handle.buffer, length)
+
+    def top(self, count: int = 3) -> list[ProcessUsage]:
+        with self._lock:
+            now = self._clock()
+            pids = self._pids()
+            alive = set(pids)
+            for pid in [pid for pid in self._files if pid not in alive]:
+                self._files.pop(pid).close()
+            baseline: dict[int, tuple[int, int]] = {}
+            usage: list[ProcessUsage] = []
+            elapsed = now - self._sampled_at if self._sampled_at is not None else 0.0
+            for pid in pids:
+                parsed = self._read(pid)
+                if parsed is None:
+                    continue
+                name, ticks, start_time = parsed
+                baseline[pid] = (ticks, start_time)
+                previous = self._baseline.get(pid)
+                if previous is None or previous[1] != start_time or elapsed <= 0:
+                    continue
+                delta = ticks - previous[0]
+                if delta > 0:
+                    percent = delta * 100 / (elapsed * self._clock_ticks)
+                    usage.append(ProcessUsage(pid=pid, name=name, percent=round(percent, 1)))
+            self._baseline = baseline
+            self._sampled_at = now
+        usage.sort(key=lambda item: item.percent, reverse=True)
+        return usage[: max(0, count)]
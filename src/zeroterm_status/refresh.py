@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import time
+from typing import Callable
+
+from .framebuffer import PackedFrame
+
+FULL = "full"
+PARTIAL = "partial"
+SKIP = "skip"
+
+
+@dataclass(frozen=True)
+class RefreshCost:
+    full_seconds: float
+    partial_seconds: float | None
+    power_mw: float
+    # Reset + init sequence needed to bring the controller out of deep sleep.
+    wake_seconds: float = 0.1
+
+    def seconds(self, mode: str) -> float:
+        if mode == PARTIAL and self.partial_seconds is not None:
+            return self.partial_seconds
+        if mode == SKIP:
+            return 0.0
+        return self.full_seconds
+
+    def energy_mj(self, seconds: float) -> float:
+        return self.power_mw * seconds
+
+
+# Waveshare datasheet refresh times and typical refresh power.
+MODEL_COSTS: dict[str, RefreshCost] = {
+    "epd2in13_v3": RefreshCost(2.0, 0.3, 26.4),
+    "epd2in13_v4": RefreshCost(2.0, 0.3, 26.4),
+    "epd2in13_v2": RefreshCost(2.0, 0.3, 26.4),
+    "epd1in54_v2": RefreshCost(2.0, 0.3, 26.4),
+    "epd2in9_v2": RefreshCost(3.0, 0.3, 26.4),
+    "epd2in7_v2": RefreshCost(6.0, 0.3, 26.4),
+    "epd2in7": RefreshCost(6.0, None, 26.4),
+}
+DEFAULT_COST = RefreshCost(3.0, None, 26.4)
+
+
+def model_cost(model: str | None) -> RefreshCost:
+    return MODEL_COSTS.get((model or "").lower(), DEFAULT_COST)
+
+
+@dataclass(frozen=True)
+class RefreshPolicy:
+    partial: bool = True
+    full_every: int = 20
+    full_interval: float = 3600.0
+    max_partial_area: float = 0.6
+
+
+@dataclass(frozen=True)
+class RefreshPlan:
+    mode: str
+    rects: tuple[tuple[int, int, int, int], ...]
+    area: float
+    reason: str
+
+
+def diff_rows(
+    previous: bytes,
+    current: bytes,
+    width: int,
+    height: int,
+    merge_gap: int = 4,
+) -> list[tuple[int, int, int, int]]:
+    stride = (width + 7) // 8
+    rects: list[list[int]] = []
+    for y in range(height):
+        start = y * stride
+        end = start + stride
+        if previous[start:end] == current[start:end]:
+            continue
+        first = start
+        while previous[first] == current[first]:
+            first += 1
+        last = end - 1
+        while previous[last] == current[last]:
+            last -= 1
+        x0 = (first - start) * 8
+        x1 = min(width, (last - start + 1) * 8)
+        if rects and y - rects[-1][3] <= merge_gap:
+            rect = rects[-1]
+            rect[0] = min(rect[0], x0)
+            rect[2] = max(rect[2], x1)
+            rect[3] = y + 1
+        else:
+            rects.append([x0, y, x1, y + 1])
+    return [tuple(rect) for rect in rects]
+
+
+def _packed(frame) -> PackedFrame:
+    if isinstance(frame, PackedFrame):
+        return frame
+    return PackedFrame.from_image(frame)
+
+
+def dirty_rects(previous, current, merge_gap: int = 4) -> list[tuple[int, int, int, int]]:
+    previous = _packed(previous)
+    current = _packed(current)
+    return diff_rows(previous.data, current.data, current.width, current.height, merge_gap)
+
+
+@dataclass
+class RefreshStats:
+    full: int = 0
+    partial: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    energy_mj: float = 0.0
+    reasons: dict[str, int] = field(default_factory=dict)
+
+    def record(self, plan: RefreshPlan, seconds: float, energy_mj: float) -> None:
+        if plan.mode == SKIP:
+            self.skipped += 1
+            return
+        if plan.mode == PARTIAL:
+            self.partial += 1
+        else:
+            self.full += 1
+            self.reasons[plan.reason] = self.reasons.get(plan.reason, 0) + 1
+        self.seconds += seconds
+        self.energy_mj += energy_mj
+
+    def summary(self) -> str:
+        reasons = " ".join(f"{name}={count}" for name, count in sorted(self.reasons.items()))
+        return (
+            f"full={self.full} partial={self.partial} skipped={self.skipped} "
+            f"time={self.seconds:.1f}s energy={self.energy_mj:.0f}mJ [{reasons}]"
+        )
+
+
+class PartialRefresher:
+    def __init__(
+        self,
+        policy: RefreshPolicy,
+        partial_supported: bool,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.policy = policy
+        self.partial_supported = partial_supported and policy.partial
+        self.stats = RefreshStats()
+        self._clock = clock
+        self._last = None
+        self._partials = 0
+        self._full_at = 0.0
+
+    def reset(self) -> None:
+        self._last = None
+
+    def plan(self, image) -> RefreshPlan:
+        frame = _packed(image)
+        last = self._last
+        if last is None or last.size != frame.size:
+            return RefreshPlan(FULL, (), 1.0, "first")
+        if last.data == frame.data:
+            return RefreshPlan(SKIP, (), 0.0, "unchanged")
+        rects = tuple(dirty_rects(last, frame))
+        width, height = frame.size
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects) / float(width * height)
+        if not self.partial_supported:
+            return RefreshPlan(FULL, rects, area, "unsupported")
+        if self.policy.full_every > 0 and self._partials >= self.policy.full_every:
+            return RefreshPlan(FULL, rects, area, "count")
+        if self.policy.full_interval > 0 and self._clock() - self._full_at >= self.policy.full_interval:
+            return RefreshPlan(FULL, rects, area, "interval")
+        if area > self.policy.max_partial_area:
+            return RefreshPlan(FULL, rects, area, "area")
+        return RefreshPlan(PARTIAL, rects, area, "dirty")
+
+    def commit(self, plan: RefreshPlan, image, seconds: float, energy_mj: float) -> None:
+        self.stats.record(plan, seconds, energy_mj)
+        if plan.mode == SKIP:
+            return
+        self._last = _packed(image)
+        if plan.mode == FULL:
+            self._partials = 0
+            self._full_at = self._clock()
+        else:
+            self._partials += 1
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
+from .framebuffer import PackedFrame, pack_image
+from .layout import Slot, compile_layout, place_text, select_panel
+from .statusview import RenderConfig, status_text
+
 try:
     from PIL import Image, ImageDraw, ImageFont
 except ImportError:  # pragma: no cover - optional dependency
@@ -12,17 +17,6 @@ except ImportError:  # pragma: no cover - optional dependency
     ImageFont = None
 
 
-@dataclass(frozen=True)
-class RenderConfig:
-    width: int
-    height: int
-    rotate: int
-    font_path: str | None
-    font_size: int
-    margin: int = 6
-    line_gap: int = 2
-
-
 DEFAULT_FONT_CANDIDATES = [
   "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
   "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
@@ -31,6 +25,8 @@ DEFAULT_FONT_CANDIDATES = [
 ]
 
 _FONT_CACHE: dict[tuple[str | None, int], object] = {}
+_MEASURE_DRAW = None
+_ELLIPSIS = "..."
 
 
 def _load_font(font_path: str | None, font_size: int):
@@ -58,63 +54,61 @@ def _load_font(font_path: str | None, font_size: int):
     return font
 
 
-def _text_width(draw, text: str, font) -> int:
-    bbox = draw.textbbox((0, 0), text, font=font)
+@lru_cache(maxsize=4096)
+def _measure(font, text: str) -> int:
+    global _MEASURE_DRAW
+    if _MEASURE_DRAW is None:
+        _MEASURE_DRAW = ImageDraw.Draw(Image.new("1", (1, 1), 255))
+    bbox = _MEASURE_DRAW.textbbox((0, 0), text, font=font)
     return bbox[2] - bbox[0]
 
 
+@lru_cache(maxsize=64)
+def _monospace_advance(font) -> float | None:
+    getlength = getattr(font, "getlength", None)
+    if getlength is None:
+        return None
+    try:
+        advances = {getlength(char) for char in "iW0 ."}
+    except Exception:
+        return None
+    if len(advances) != 1:
+        return None
+    advance = advances.pop()
+    return advance if advance > 0 else None
+
+
+@lru_cache(maxsize=64)
 def _text_height(font) -> int:
     bbox = font.getbbox("Ag")
     return bbox[3] - bbox[1]
 
 
 def _fit_text(draw, text: str, font, max_width: int) -> str:
-    if _text_width(draw, text, font) <= max_width:
+    if _measure(font, text) <= max_width:
         return text
     if max_width <= 0:
         return ""
-    ellipsis = "..."
-    trimmed = text
-    while trimmed:
-        candidate = trimmed + ellipsis
-        if _text_width(draw, candidate, font) <= max_width:
-            return candidate
-        trimmed = trimmed[:-1]
-    return ""
-
-
-def _wrap_text(draw, text: str, font, max_width: int, max_lines: int = 2) -> list[str]:
-    words = text.split()
-    if not words:
-        return []
-    lines = []
-    current = ""
-    for word in words:
-        candidate = word if not current else f"{current} {word}"
-        if _text_width(draw, candidate, font) <= max_width:
-            current = candidate
-            continue
-        if current:
-            lines.append(current)
-        current = word
-        if len(lines) >= max_lines - 1:
-            break
-    if current and len(lines) < max_lines:
-        lines.append(current)
-    if len(lines) > max_lines:
-        lines = lines[:max_lines]
-    if len(lines) == max_lines and len(words) > 0:
-        lines[-1] = _fit_text(draw, lines[-1], font, max_width)
-    return lines
-
 
-def _center_text(draw, text: str, font, box, fill: int = 0) -> None:
-    x0, y0, x1, y1 = box
-    text_width = _text_width(draw, text, font)
-    text_height = _text_height(font)
-    x = x0 + max(0, (x1 - x0 - text_width) // 2)
-    y = y0 + max(0, (y1 - y0 - text_height) // 2)
-    draw.text((x, y), text, font=font, fill=fill)
+    def fits(length: int) -> bool:
+        return _measure(font, text[:length] + _ELLIPSIS) <= max_width
+
+    low, high = 0, len(text)
+    advance = _monospace_advance(font)
+    if advance is not None:
+        guess = int((max_width - _measure(font, _ELLIPSIS)) // advance)
+        guess = max(1, min(len(text), guess))
+        if fits(guess):
+            low = guess
+        else:
+            high = guess - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + _ELLIPSIS if low else ""
 
 
 def _draw_battery_bar(draw, box, percent: int | None) -> None:
@@ -135,194 +129,6 @@ def _draw_battery_bar(draw, box, percent: int | None) -> None:
     draw.rectangle((inner_x0, inner_y0, inner_x0 + fill_width, inner_y1), fill=0)
 
 
-def _draw_card(draw, box, label: str, value: str, font_label, font_value) -> None:
-    x0, y0, x1, y1 = box
-    draw.rectangle((x0, y0, x1, y1), outline=0)
-    box_height = max(1, y1 - y0)
-    label_height = _text_height(font_label)
-    header_height = min(label_height + 4, max(8, box_height - 6))
-    header_bottom = y0 + header_height
-    draw.rectangle((x0 + 1, y0 + 1, x1 - 1, header_bottom), fill=0)
-
-    label_text = _fit_text(draw, label, font_label, x1 - x0 - 6)
-    draw.text((x0 + 3, y0 + 2), label_text, font=font_label, fill=255)
-
-    value_area_top = header_bottom + 2
-    value_area_bottom = y1 - 2
-    if value_area_bottom <= value_area_top:
-        return
-    value_text = _fit_text(draw, value, font_value, x1 - x0 - 6)
-    value_y = value_area_bottom - _text_height(font_value)
-    if value_y < value_area_top:
-        value_y = value_area_top
-    draw.text((x0 + 3, value_y), value_text, font=font_value, fill=0)
-
-
-def _split_wifi_text(text: str) -> tuple[str | None, str | None]:
-    text = (text or "").strip()
-    if not text:
-        return None, None
-    parts = text.split()
-    state = parts[0].upper()
-    ssid = " ".join(parts[1:]).strip() if len(parts) > 1 else None
-    if ssid == "":
-        ssid = None
-    return state, ssid
-
-
-def _short_wifi_state(state: str | None) -> str:
-    if not state:
-        return "UNK"
-    state = state.upper()
-    mapping = {
-        "UP": "UP",
-        "DOWN": "DN",
-        "UNKNOWN": "UNK",
-        "MISSING": "MISS",
-        "DORMANT": "DORM",
-        "LOWERLAYERDOWN": "LLDN",
-    }
-    return mapping.get(state, state[:4])
-
-
-def _battery_short(percent: int | None, battery_text: str) -> str:
-    if percent is None:
-        return "--"
-    suffix = ""
-    text = (battery_text or "").upper()
-    if "CHARG" in text:
-        suffix = "C"
-    elif "FULL" in text:
-        suffix = "F"
-    return f"{percent}%{suffix}"
-
-
-def _format_packets(value: int | None) -> str:
-    if value is None:
-        return "--"
-    if value < 1000:
-        return str(value)
-    if value < 1_000_000:
-        scaled = value / 1000
-        text = f"{scaled:.1f}"
-        if text.endswith(".0"):
-            text = text[:-2]
-        return f"{text}k"
-    if value < 1_000_000_000:
-        scaled = value / 1_000_000
-        text = f"{scaled:.1f}"
-        if text.endswith(".0"):
-            text = text[:-2]
-        return f"{text}m"
-    scaled = value / 1_000_000_000
-    text = f"{scaled:.1f}"
-    if text.endswith(".0"):
-        text = text[:-2]
-    return f"{text}g"
-
-
-def _status_message(status_text: str) -> str:
-    status = status_text.strip().upper()
-    if status == "RUNNING":
-        return "SESSION LIVE"
-    if status in {"DOWN", "FAILED"}:
-        return "SERVICE DOWN"
-    if status == "READY":
-        return "WAITING FOR INPUT"
-    return "STATUS UNKNOWN"
-
-
-def _draw_eye_open(draw, center: tuple[int, int], radius: int) -> None:
-    x, y = center
-    draw.ellipse((x - radius, y - radius, x + radius, y + radius), outline=0)
-    pupil = max(1, radius // 2)
-    draw.ellipse((x - pupil, y - pupil, x + pupil, y + pupil), fill=0)
-
-
-def _draw_eye_line(draw, center: tuple[int, int], radius: int) -> None:
-    x, y = center
-    draw.line((x - radius, y, x + radius, y), fill=0)
-
-
-def _draw_eye_cross(draw, center: tuple[int, int], radius: int) -> None:
-    x, y = center
-    draw.line((x - radius, y - radius, x + radius, y + radius), fill=0)
-    draw.line((x - radius, y + radius, x + radius, y - radius), fill=0)
-
-
-def _draw_mouth(draw, box, mood: str) -> None:
-    x0, y0, x1, y1 = box
-    if mood == "happy" or mood == "wink":
-        draw.arc((x0, y0, x1, y1), 200, 340, fill=0)
-    elif mood == "sad":
-        draw.arc((x0, y0, x1, y1), 20, 160, fill=0)
-    else:
-        y = (y0 + y1) // 2
-        draw.line((x0, y, x1, y), fill=0)
-
-
-def _draw_face(draw, box, mood: str) -> None:
-    x0, y0, x1, y1 = box
-    width = max(1, x1 - x0)
-    height = max(1, y1 - y0)
-    pad = max(2, int(min(width, height) * 0.06))
-    head = (x0 + pad, y0 + pad, x1 - pad, y1 - pad)
-    draw.ellipse(head, outline=0)
-
-    center_x = (x0 + x1) // 2
-    eye_y = y0 + int(height * 0.38)
-    eye_dx = int(width * 0.22)
-    eye_radius = max(2, int(min(width, height) * 0.11))
-
-    left_eye = (center_x - eye_dx, eye_y)
-    right_eye = (center_x + eye_dx, eye_y)
-
-    if mood == "dead":
-        _draw_eye_cross(draw, left_eye, eye_radius)
-        _draw_eye_cross(draw, right_eye, eye_radius)
-    elif mood == "sad":
-        draw.arc(
-            (
-                left_eye[0] - eye_radius,
-                left_eye[1] - eye_radius,
-                left_eye[0] + eye_radius,
-                left_eye[1] + eye_radius,
-            ),
-            20,
-            160,
-            fill=0,
-        )
-        draw.arc(
-            (
-                right_eye[0] - eye_radius,
-                right_eye[1] - eye_radius,
-                right_eye[0] + eye_radius,
-                right_eye[1] + eye_radius,
-            ),
-            20,
-            160,
-            fill=0,
-        )
-    elif mood == "wink":
-        _draw_eye_open(draw, left_eye, eye_radius)
-        _draw_eye_line(draw, right_eye, eye_radius)
-    else:
-        _draw_eye_open(draw, left_eye, eye_radius)
-        _draw_eye_open(draw, right_eye, eye_radius)
-
-    mouth_width = int(width * 0.26)
-    mouth_height = int(height * 0.12)
-    mouth_x0 = center_x - mouth_width // 2
-    mouth_y0 = y0 + int(height * 0.62)
-    _draw_mouth(
-        draw,
-        (mouth_x0, mouth_y0, mouth_x0 + mouth_width, mouth_y0 + mouth_height),
-        mood,
-    )
-
-    # keep the face clean for low-resolution e-ink
-
-
 def render_lines(lines: Iterable[str], config: RenderConfig):
     if Image is None or ImageDraw is None or ImageFont is None:
         raise RuntimeError("Pillow is required for e-paper rendering.")
@@ -353,6 +159,65 @@ def render_lines(lines: Iterable[str], config: RenderConfig):
     return image
 
 
+@dataclass(frozen=True)
+class _StatusLayout:
+    base: object
+    slots: dict[str, Slot]
+    fonts: dict[str, object]
+
+
+_LAYOUT_CACHE: dict[RenderConfig, _StatusLayout] = {}
+_FRAME_CACHE: dict[str, object] = {}
+
+
+def _draw_text(draw, box, text: str, font, align: str = "left", valign: str = "top") -> None:
+    text = _fit_text(draw, text, font, box[2] - box[0])
+    if not text:
+        return
+    x, y = place_text(box, _measure(font, text), _text_height(font), align, valign)
+    draw.text((x, y), text, font=font, fill=0)
+
+
+def _face_font(font_path: str | None, size: int, box):
+    x0, y0, x1, y1 = box
+    font = _load_font(font_path, size)
+    while size > 8 and (_measure(font, "(^_^)") > x1 - x0 or _text_height(font) > y1 - y0):
+        size -= 2
+        font = _load_font(font_path, size)
+    return font
+
+
+def _status_layout(config: RenderConfig) -> _StatusLayout:
+    cached = _LAYOUT_CACHE.get(config)
+    if cached is not None:
+        return cached
+    panel = select_panel(config.layout, config.width, config.height)
+
+    def font_height(size: int) -> int:
+        font = _load_font(config.font_path, size)
+        if font is None:
+            raise RuntimeError("Pillow font unavailable.")
+        return _text_height(font)
+
+    compiled = compile_layout(panel, config.width, config.height, config.font_size, font_height)
+    fonts = {role: _load_font(config.font_path, size) for role, size in compiled.fonts.items()}
+    face = compiled.slots.get("face")
+    if face is not None:
+        fonts[face.font] = _face_font(config.font_path, compiled.fonts[face.font], face.box)
+    base = Image.new("1", (config.width, config.height), 255)
+    draw = ImageDraw.Draw(base)
+    for static in compiled.statics:
+        if static.kind == "rect":
+            draw.rectangle(static.box, outline=0)
+        elif static.kind == "line":
+            draw.rectangle(static.box, fill=0)
+        else:
+            _draw_text(draw, static.box, static.text, fonts[static.font], static.align, static.valign)
+    layout = _StatusLayout(base=base, slots=compiled.slots, fonts=fonts)
+    _LAYOUT_CACHE[config] = layout
+    return layout
+
+
 def render_status(
     status: str,
     ip: str,
@@ -371,196 +236,113 @@ def render_status(
     config: RenderConfig,
     wifi_channel: str | None = None,
     wifi_packets: int | None = None,
+    wifi_rate: float | None = None,
+    top: str | None = None,
+):
+    image = _draw_status(
+        status=status,
+        ip=ip,
+        wifi=wifi,
+        battery=battery,
+        adapter=adapter,
+        power=power,
+        alert=alert,
+        temp=temp,
+        load=load,
+        uptime=uptime,
+        mem=mem,
+        cpu=cpu,
+        battery_percent=battery_percent,
+        updated=updated,
+        config=config,
+        wifi_channel=wifi_channel,
+        wifi_packets=wifi_packets,
+        wifi_rate=wifi_rate,
+        top=top,
+    )
+    if config.rotate % 360:
+        image = image.rotate(config.rotate, expand=False)
+    return image
+
+
+def render_status_frame(
+    config: RenderConfig,
+    panel_size: tuple[int, int] | None = None,
+    **values,
+) -> PackedFrame:
+    panel = tuple(panel_size) if panel_size is not None else (config.width, config.height)
+    key = (config, panel, tuple(sorted(values.items())))
+    if _FRAME_CACHE.get("key") == key:
+        return _FRAME_CACHE["frame"]
+    width, height = panel if config.rotate % 180 == 0 else (panel[1], panel[0])
+    canvas = replace(config, width=width, height=height, rotate=0)
+    frame = pack_image(_draw_status(config=canvas, **values), config.rotate, panel)
+    _FRAME_CACHE["key"] = key
+    _FRAME_CACHE["frame"] = frame
+    return frame
+
+
+def _draw_status(
+    status: str,
+    ip: str,
+    wifi: str,
+    battery: str,
+    adapter: str | None,
+    power: str | None,
+    alert: str | None,
+    temp: str,
+    load: str,
+    uptime: str,
+    mem: str,
+    cpu: str,
+    battery_percent: int | None,
+    updated: str | None,
+    config: RenderConfig,
+    wifi_channel: str | None = None,
+    wifi_packets: int | None = None,
+    wifi_rate: float | None = None,
+    top: str | None = None,
 ):
     if Image is None or ImageDraw is None or ImageFont is None:
         raise RuntimeError("Pillow is required for e-paper rendering.")
 
-    image = Image.new("1", (config.width, config.height), 255)
+    layout = _status_layout(config)
+    image = layout.base.copy()
     draw = ImageDraw.Draw(image)
-    font_header = _load_font(config.font_path, max(9, config.font_size - 4))
-    font_body = _load_font(config.font_path, max(10, config.font_size - 2))
-    font_small = _load_font(config.font_path, max(8, config.font_size - 6))
-    font_face = _load_font(config.font_path, max(26, config.font_size + 22))
-    if font_body is None or font_header is None or font_small is None or font_face is None:
-        raise RuntimeError("Pillow font unavailable.")
-
-    margin = config.margin
-    header_height = min(config.height, max(12, _text_height(font_header) + 2))
-    footer_height = min(config.height, max(12, _text_height(font_header) + 2))
-
-    draw.rectangle((0, 0, config.width - 1, config.height - 1), outline=0)
-    draw.line((0, header_height, config.width - 1, header_height), fill=0)
-
-    status_text = status.strip().upper() or "READY"
-    wifi_state, wifi_ssid = _split_wifi_text(wifi)
-    wifi_short = _short_wifi_state(wifi_state)
-    uptime_text = uptime or "--"
-    battery_short = _battery_short(battery_percent, battery)
-
-    segments = [
-        f"IP {ip}",
-        f"WIFI {wifi_short}",
-        f"BAT {battery_short}",
-        f"UP {uptime_text}",
-    ]
-    weights = [1.6, 1.1, 0.9, 1.2]
-    header_width = max(1, config.width - margin * 2)
-    total_weight = sum(weights)
-    col_widths = [int(header_width * w / total_weight) for w in weights]
-    col_widths[-1] = header_width - sum(col_widths[:-1])
-    header_text_y = max(0, (header_height - _text_height(font_header)) // 2)
-    x = margin
-    for segment, col_width in zip(segments, col_widths):
-        text = _fit_text(draw, segment, font_header, col_width - 2)
-        draw.text((x, header_text_y), text, font=font_header, fill=0)
-        x += col_width
-
-    footer_top = config.height - footer_height
-    draw.line((0, footer_top, config.width - 1, footer_top), fill=0)
-
-    footer_left = f"WIFI {wifi_ssid or _short_wifi_state(wifi_state)}"
-    footer_right = f"LOAD {load or '--'}"
-    footer_left_text = _fit_text(draw, footer_left, font_header, config.width - margin * 2)
-    draw.text((margin, footer_top + 2), footer_left_text, font=font_header, fill=0)
-    footer_right_text = _fit_text(draw, footer_right, font_header, config.width - margin * 2)
-    right_width = _text_width(draw, footer_right_text, font_header)
-    draw.text(
-        (config.width - margin - right_width, footer_top + 2),
-        footer_right_text,
-        font=font_header,
-        fill=0,
-    )
 
-    body_top = header_height + 2
-    body_bottom = footer_top - 2
-    content_width = config.width - margin * 2
-    gap = 6
-    right_width = max(90, int(content_width * 0.38))
-    left_width = content_width - right_width - gap
-    if left_width < 80:
-        left_width = 80
-        right_width = max(60, content_width - left_width - gap)
-
-    left_x0 = margin
-    left_x1 = left_x0 + left_width
-    right_x0 = left_x1 + gap
-    right_x1 = right_x0 + right_width
-
-    row1_y = body_top
-    name_text = _fit_text(draw, "zeroterm>", font_body, left_width - 4)
-    draw.text((left_x0, row1_y), name_text, font=font_body, fill=0)
-
-    status_line = _fit_text(draw, _status_message(status_text), font_body, right_width - 4)
-    draw.text((right_x0, row1_y), status_line, font=font_body, fill=0)
-
-    row1_height = _text_height(font_body) + 2
-
-    label_height = _text_height(font_small)
-    bar_height = max(6, label_height // 2 + 2)
-    battery_block = label_height + bar_height + 6
-    face_top = row1_y + row1_height + 2
-
-    face_box = (
-        left_x0 + 2,
-        face_top,
-        left_x1 - 2,
-        body_bottom - battery_block - 4,
+    text = status_text(
+        status=status,
+        ip=ip,
+        wifi=wifi,
+        battery=battery,
+        adapter=adapter,
+        power=power,
+        alert=alert,
+        temp=temp,
+        load=load,
+        uptime=uptime,
+        mem=mem,
+        cpu=cpu,
+        battery_percent=battery_percent,
+        updated=updated,
+        wifi_channel=wifi_channel,
+        wifi_packets=wifi_packets,
+        wifi_rate=wifi_rate,
+        top=top,
     )
-    face_text = _pick_face(status_text, battery_percent)
-    if face_box[2] > face_box[0] and face_box[3] > face_box[1]:
-        face_text = _fit_text(draw, face_text, font_face, face_box[2] - face_box[0] - 4)
-        _center_text(draw, face_text, font_face, face_box, fill=0)
-
-    bat_label = "BAT"
-    bat_value = f"{battery_percent}%" if battery_percent is not None else "--"
-    bat_y = body_bottom - battery_block + 2
-    draw.text((left_x0 + 4, bat_y), bat_label, font=font_small, fill=0)
-    bat_value_width = _text_width(draw, bat_value, font_small)
-    draw.text((left_x1 - 4 - bat_value_width, bat_y), bat_value, font=font_small, fill=0)
-
-    bar_y = bat_y + label_height + 2
-    bar_box = (left_x0 + 4, bar_y, left_x1 - 6, bar_y + bar_height)
-    _draw_battery_bar(draw, bar_box, battery_percent)
-
-    message_x = right_x0
-    message_y = face_top
-    state_line = _fit_text(draw, f"STATE {status_text}", font_small, right_width - 4)
-    draw.text((message_x, message_y), state_line, font=font_small, fill=0)
-    message_y += _text_height(font_small) + 2
-    ssid_line = _fit_text(draw, f"SSID {wifi_ssid or '--'}", font_small, right_width - 4)
-    draw.text((message_x, message_y), ssid_line, font=font_small, fill=0)
-    message_y += _text_height(font_small) + 2
-    channel_text = wifi_channel or "--"
-    packets_text = _format_packets(wifi_packets)
-    channel_line = _fit_text(draw, f"CH {channel_text}", font_small, right_width - 4)
-    draw.text((message_x, message_y), channel_line, font=font_small, fill=0)
-    message_y += _text_height(font_small) + 2
-    packets_line = _fit_text(draw, f"PKT {packets_text}", font_small, right_width - 4)
-    draw.text((message_x, message_y), packets_line, font=font_small, fill=0)
-    message_y += _text_height(font_small) + 2
-    if adapter:
-        adapter_line = _fit_text(draw, f"EXT {adapter.upper()}", font_small, right_width - 4)
-        draw.text((message_x, message_y), adapter_line, font=font_small, fill=0)
-        message_y += _text_height(font_small) + 2
-    if power:
-        power_line = _fit_text(draw, f"PWR {power}", font_small, right_width - 4)
-        draw.text((message_x, message_y), power_line, font=font_small, fill=0)
-        message_y += _text_height(font_small) + 2
-    if alert:
-        alert_line = _fit_text(draw, f"ALRT {alert}", font_small, right_width - 4)
-        draw.text((message_x, message_y), alert_line, font=font_small, fill=0)
-        message_y += _text_height(font_small) + 2
-    message_y += 2
-
-    metrics_top = body_bottom - (_text_height(font_body) + _text_height(font_small) + 6)
-    if metrics_top < message_y:
-        metrics_top = message_y
-    metric_labels = [("MEM", mem), ("CPU", cpu), ("TMP", temp)]
-    columns = 3
-    inner_width = right_width - 8
-    col_width = max(1, inner_width // columns)
-    for index, (label, value) in enumerate(metric_labels):
-        x0 = right_x0 + 4 + index * col_width
-        x1 = x0 + col_width
-        _center_text(draw, label, font_small, (x0, metrics_top, x1, metrics_top + _text_height(font_small)), fill=0)
-        _center_text(
-            draw,
-            value or "--",
-            font_body,
-            (
-                x0,
-                metrics_top + _text_height(font_small) + 2,
-                x1,
-                metrics_top + _text_height(font_small) + 2 + _text_height(font_body),
-            ),
-            fill=0,
-        )
-
-    if updated:
-        updated_text = _fit_text(draw, updated, font_small, config.width - margin * 2)
-        updated_width = _text_width(draw, updated_text, font_small)
-        updated_y = footer_top - 2 - _text_height(font_small)
-        if updated_y > body_top:
-            draw.text(
-                (config.width - margin - updated_width, updated_y),
-                updated_text,
-                font=font_small,
-                fill=0,
-            )
-
-    if config.rotate % 360:
-        image = image.rotate(config.rotate, expand=False)
+    for name, slot in layout.slots.items():
+        font = layout.fonts.get(slot.font)
+        if slot.kind == "bar":
+            _draw_battery_bar(draw, slot.box, text.battery_percent)
+        elif slot.kind == "lines":
+            x0, y, x1, _ = slot.box
+            for line in text.visible_lines(slot.capacity):
+                _draw_text(draw, (x0, y, x1, y + slot.step), line, font)
+                y += slot.step
+        elif slot.kind == "metrics":
+            value_font = layout.fonts[slot.value_font]
+            for field, x0, x1 in slot.columns:
+                _draw_text(draw, (x0, slot.value_top, x1, slot.box[3]), text.fields[field], value_font, "center")
+        elif text.fields.get(name):
+            _draw_text(draw, slot.box, text.fields[name], font, slot.align, slot.valign)
     return image
-
-
-def _pick_face(status_text: str, battery_percent: int | None) -> str:
-    status = status_text.strip().upper()
-    if status in {"DOWN", "FAILED"}:
-        return "(x_x)"
-    if battery_percent is not None and battery_percent <= 15:
-        return "(T_T)"
-    if status == "RUNNING":
-        return "(^_^)"
-    if status == "READY":
-        return "(^_~)"
-    return "(^_^)"
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+import errno
+import logging
+import socket
+import struct
+import threading
+from typing import Callable
+
+from .netlink import (
+    NETLINK_ROUTE,
+    NLM_F_DUMP,
+    NetlinkSocket,
+    attr_str,
+    iter_messages,
+    parse_attrs,
+)
+
+logger = logging.getLogger(__name__)
+
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+_IFINFOMSG = struct.Struct("=BxHiII")
+_IFADDRMSG = struct.Struct("=BBBBI")
+# Events can be hours apart; the timeout only bounds how long stop() waits.
+_EVENT_TIMEOUT = 30.0
+
+OPERSTATES = {
+    0: "unknown",
+    1: "notpresent",
+    2: "down",
+    3: "lowerlayerdown",
+    4: "testing",
+    5: "dormant",
+    6: "up",
+}
+
+
+@dataclass(frozen=True)
+class LinkState:
+    index: int
+    name: str
+    operstate: str | None
+    addresses: tuple[str, ...] = ()
+
+
+class LinkMonitor:
+    def __init__(
+        self,
+        on_change: Callable[[], None] | None = None,
+        event_sock=None,
+        request_sock=None,
+    ) -> None:
+        self._on_change = on_change
+        self._events = NetlinkSocket(
+            NETLINK_ROUTE, RTMGRP_LINK | RTMGRP_IPV4_IFADDR, sock=event_sock, timeout=_EVENT_TIMEOUT
+        )
+        self._requests = NetlinkSocket(NETLINK_ROUTE, sock=request_sock)
+        self._links: dict[int, LinkState] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.ready = False
+
+    def start(self) -> bool:
+        try:
+            self._events.fileno()
+            self.resync()
+        except OSError as exc:
+            logger.debug("rtnetlink monitor unavailable: %s", exc)
+            self._events.close()
+            self._requests.close()
+            return False
+        self._thread = threading.Thread(target=self._run, name="zeroterm-rtnetlink", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.ready = False
+        self._events.close()
+        self._requests.close()
+
+    def resync(self) -> None:
+        link_replies = self._requests.request(RTM_GETLINK, NLM_F_DUMP, _IFINFOMSG.pack(0, 0, 0, 0, 0))
+        addr_replies = self._requests.request(RTM_GETADDR, NLM_F_DUMP, _IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0))
+        with self._lock:
+            self._links = {}
+            for msg_type, body in link_replies + addr_replies:
+                self._apply_locked(msg_type, body)
+        self.ready = True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data = self._events.recv()
+            except OSError as exc:
+                if self._stop.is_set():
+                    return
+                if exc.errno == errno.ETIMEDOUT:
+                    continue
+                if exc.errno == errno.ENOBUFS:
+                    self._resync_after_overflow()
+                    continue
+                logger.warning("rtnetlink monitor stopped: %s", exc)
+                self.ready = False
+                return
+            if not data:
+                self.ready = False
+                return
+            changed = False
+            with self._lock:
+                for msg_type, _, _, body in iter_messages(data):
+                    changed = self._apply_locked(msg_type, body) or changed
+            if changed and self._on_change is not None:
+                self._on_change()
+
+    def _resync_after_overflow(self) -> None:
+        try:
+            self.resync()
+        except OSError as exc:
+            logger.warning("rtnetlink resync failed: %s", exc)
+            return
+        if self._on_change is not None:
+            self._on_change()
+
+    def apply(self, msg_type: int, body) -> bool:
+        with self._lock:
+            return self._apply_locked(msg_type, body)
+
+    def _apply_locked(self, msg_type: int, body) -> bool:
+        if msg_type in {RTM_NEWLINK, RTM_DELLINK}:
+            if len(body) < _IFINFOMSG.size:
+                return False
+            _, _, index, _, _ = _IFINFOMSG.unpack_from(body)
+            if msg_type == RTM_DELLINK:
+                return self._links.pop(index, None) is not None
+            attrs = parse_attrs(body, _IFINFOMSG.size)
+            current = self._links.get(index)
+            name = attr_str(attrs.get(IFLA_IFNAME)) or (current.name if current else str(index))
+            operstate_raw = attrs.get(IFLA_OPERSTATE)
+            if operstate_raw is not None and len(operstate_raw) >= 1:
+                operstate = OPERSTATES.get(operstate_raw[0], "unknown")
+            else:
+                operstate = current.operstate if current else None
+            updated = LinkState(
+                index=index,
+                name=name,
+                operstate=operstate,
+                addresses=current.addresses if current else (),
+            )
+            self._links[index] = updated
+            return updated != current
+        if msg_type in {RTM_NEWADDR, RTM_DELADDR}:
+            if len(body) < _IFADDRMSG.size:
+                return False
+            family, _, _, _, index = _IFADDRMSG.unpack_from(body)
+            if family != socket.AF_INET:
+                return False
+            attrs = parse_attrs(body, _IFADDRMSG.size)
+            raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+            if raw is None or len(raw) != 4:
+                return False
+            address = socket.inet_ntoa(bytes(raw))
+            current = self._links.get(index)
+            if current is None:
+                if msg_type == RTM_DELADDR:
+                    return False
+                current = LinkState(index=index, name=str(index), operstate=None)
+            addresses = tuple(value for value in current.addresses if value != address)
+            if msg_type == RTM_NEWADDR:
+                addresses = addresses + (address,)
+            if addresses == current.addresses and index in self._links:
+                return False
+            self._links[index] = replace(current, addresses=addresses)
+            return True
+        return False
+
+    def get(self, name: str) -> LinkState | None:
+        with self._lock:
+            for link in self._links.values():
+                if link.name == name:
+                    return link
+        return None
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(link.name for link in self._links.values())
+
+    def wifi_ifaces(self) -> list[str]:
+        return [name for name in self.names() if name.startswith("wlan")]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable
+
+from .collectors import COST_CHEAP, CollectorPool, CollectorRegistry, Sample
+
+logger = logging.getLogger(__name__)
+
+_STALE_RETRY = 5.0
+
+
+class TimerWheel:
+    def __init__(self, tick: float = 1.0, slots: int = 64, start: float = 0.0) -> None:
+        self.tick = tick
+        self._slots: list[dict[str, float]] = [{} for _ in range(slots)]
+        self._where: dict[str, int] = {}
+        self._cursor = int(start // tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _slot(self, due: float) -> int:
+        return max(int(due // self.tick), self._cursor) % len(self._slots)
+
+    def schedule(self, name: str, due: float) -> None:
+        self.cancel(name)
+        slot = self._slot(due)
+        self._slots[slot][name] = due
+        self._where[name] = slot
+
+    def cancel(self, name: str) -> None:
+        slot = self._where.pop(name, None)
+        if slot is not None:
+            self._slots[slot].pop(name, None)
+
+    def due(self, name: str) -> float | None:
+        slot = self._where.get(name)
+        if slot is None:
+            return None
+        return self._slots[slot].get(name)
+
+    def pop_due(self, now: float) -> list[str]:
+        now_tick = int(now // self.tick)
+        steps = min(now_tick - self._cursor + 1, len(self._slots))
+        ready: list[tuple[float, str]] = []
+        for step in range(max(steps, 1)):
+            bucket = self._slots[(self._cursor + step) % len(self._slots)]
+            for name, due in list(bucket.items()):
+                if due <= now:
+                    ready.append((due, name))
+                    del bucket[name]
+                    del self._where[name]
+        self._cursor = max(self._cursor, now_tick)
+        return [name for _, name in sorted(ready)]
+
+    def next_due(self) -> float | None:
+        if not self._where:
+            return None
+        size = len(self._slots)
+        for step in range(size):
+            tick = self._cursor + step
+            bucket = self._slots[tick % size]
+            current = [due for due in bucket.values() if int(due // self.tick) <= tick]
+            if current:
+                return min(current)
+        return min(due for bucket in self._slots for due in bucket.values())
+
+
+class Scheduler:
+    def __init__(
+        self,
+        registry: CollectorRegistry,
+        pool: CollectorPool,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.registry = registry
+        self.pool = pool
+        self._clock = clock
+        now = clock()
+        self.wheel = TimerWheel(start=now)
+        # name -> (value, collected_at, scheduled period)
+        self._values: dict[str, tuple[object, float, float]] = {}
+        self.stale: set[str] = set()
+        for collector in registry:
+            self.wheel.schedule(collector.name, now)
+
+    def next_due(self) -> float | None:
+        return self.wheel.next_due()
+
+    def trigger(self, name: str) -> None:
+        if self.registry.get(name) is not None:
+            self.wheel.schedule(name, self._clock())
+
+    def wait_time(self) -> float:
+        due = self.next_due()
+        if due is None:
+            return 60.0
+        return max(0.0, due - self._clock())
+
+    def run_due(self, woken: bool = False, min_period: float = 0.0, scale: float = 1.0) -> set[str]:
+        now = self._clock()
+        names = self.wheel.pop_due(now)
+        if woken:
+            for collector in self.registry:
+                if collector.on_wake and collector.name not in names:
+                    self.wheel.cancel(collector.name)
+                    names.append(collector.name)
+        if not names:
+            return set()
+        samples: dict[str, Sample] = {}
+        jobs = {}
+        for name in names:
+            collector = self.registry.get(name)
+            if collector is None:
+                continue
+            if collector.cost == COST_CHEAP:
+                samples[name] = self._run_inline(name, collector.func)
+            else:
+                jobs[name] = (collector.func, collector.deadline)
+        if jobs:
+            samples.update(self.pool.collect(jobs))
+        finished = self._clock()
+        updated = set()
+        for name, sample in samples.items():
+            collector = self.registry.get(name)
+            period = max(collector.period * scale, min_period)
+            if sample.stale:
+                self.stale.add(name)
+                self.wheel.schedule(name, finished + min(period, _STALE_RETRY))
+                continue
+            self.stale.discard(name)
+            self._values[name] = (sample.value, finished, period)
+            self.wheel.schedule(name, now + period)
+            updated.add(name)
+        return updated
+
+    def _run_inline(self, name: str, func: Callable[[], object]) -> Sample:
+        start = self._clock()
+        try:
+            value = func()
+        except Exception:
+            logger.exception("Collector %s failed", name)
+            previous = self._values.get(name)
+            return Sample(previous[0] if previous else None, stale=True, elapsed=None)
+        return Sample(value, stale=False, elapsed=self._clock() - start)
+
+    def value(self, name: str, default: object = None) -> object:
+        entry = self._values.get(name)
+        if entry is None:
+            return default
+        value, collected_at, period = entry
+        collector = self.registry.get(name)
+        if collector is not None and self._clock() - collected_at > collector.staleness_budget(period):
+            return default
+        return value if value is not None else default
+
+    def age(self, name: str) -> float | None:
+        entry = self._values.get(name)
+        if entry is None:
+            return None
+        return self._clock() - entry[1]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+import re
+import time
+from typing import Callable
+
+_DIGITS = re.compile(r"[0-9.]+")
+
+
+@dataclass(frozen=True)
+class FieldPolicy:
+    immediate: bool = False
+    deadband: float = 0.0
+    hold: float = 0.0
+    buckets: tuple[float, ...] = ()
+    hysteresis: float = 0.0
+
+
+IMMEDIATE = FieldPolicy(immediate=True)
+
+DEFAULT_POLICIES: dict[str, FieldPolicy] = {
+    "status": IMMEDIATE,
+    "ip": IMMEDIATE,
+    "wifi": IMMEDIATE,
+    "channel": IMMEDIATE,
+    "adapter": IMMEDIATE,
+    "alert": IMMEDIATE,
+    "battery": FieldPolicy(deadband=2),
+    "power": FieldPolicy(hold=600),
+    "top": FieldPolicy(deadband=10, hold=60),
+    "temp": FieldPolicy(deadband=2),
+    "load": FieldPolicy(buckets=(0.5, 1.0, 2.0, 4.0), hysteresis=0.1),
+    "uptime": FieldPolicy(hold=900),
+    "mem": FieldPolicy(deadband=5),
+    "cpu": FieldPolicy(deadband=10, hold=60),
+    "pkt": FieldPolicy(buckets=(1.0, 10.0, 100.0, 1000.0, 10000.0), hysteresis=0.25),
+}
+
+
+def _shape(text: str) -> str:
+    return _DIGITS.sub("#", text)
+
+
+def _bucket_changed(value: float, shown: float, policy: FieldPolicy) -> bool:
+    edges = policy.buckets
+    current = bisect_right(edges, shown)
+    candidate = bisect_right(edges, value)
+    if candidate > current:
+        return value >= edges[current] * (1 + policy.hysteresis)
+    if candidate < current:
+        return value < edges[current - 1] * (1 - policy.hysteresis)
+    return False
+
+
+@dataclass
+class _Shown:
+    text: str
+    value: float | None
+    shown_at: float
+
+
+class SignificanceFilter:
+    def __init__(
+        self,
+        policies: dict[str, FieldPolicy] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self._clock = clock
+        self._shown: dict[str, _Shown] = {}
+        self.refreshes = 0
+        self.avoided = 0
+        self.suppressed: dict[str, int] = {}
+
+    def _significant(self, name: str, text: str, value: float | None, now: float) -> bool:
+        shown = self._shown.get(name)
+        if shown is None:
+            return True
+        if shown.text == text:
+            return False
+        policy = self.policies.get(name, IMMEDIATE)
+        if policy.immediate or _shape(shown.text) != _shape(text):
+            return True
+        if policy.hold > 0 and now - shown.shown_at < policy.hold:
+            return False
+        if value is None or shown.value is None:
+            return True
+        if policy.buckets:
+            return _bucket_changed(value, shown.value, policy)
+        return abs(value - shown.value) >= policy.deadband
+
+    def update(self, fields: dict[str, tuple[str, float | None]]) -> dict[str, str]:
+        now = self._clock()
+        pending = [
+            name
+            for name, (text, _) in fields.items()
+            if name not in self._shown or self._shown[name].text != text
+        ]
+        refresh = any(self._significant(name, *fields[name], now) for name in pending)
+        if refresh:
+            self.refreshes += 1
+            for name in pending:
+                text, value = fields[name]
+                self._shown[name] = _Shown(text, value, now)
+        elif pending:
+            self.avoided += 1
+            for name in pending:
+                self.suppressed[name] = self.suppressed.get(name, 0) + 1
+        return {name: self._shown[name].text for name in fields}
+
+    def value(self, name: str) -> float | None:
+        shown = self._shown.get(name)
+        return shown.value if shown is not None else None
+
+    def summary(self) -> str:
+        fields = " ".join(f"{name}={count}" for name, count in sorted(self.suppressed.items()))
+        return f"refreshes={self.refreshes} avoided={self.avoided} [{fields}]"
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RenderConfig:
+    width: int
+    height: int
+    rotate: int
+    font_path: str | None
+    font_size: int
+    margin: int = 6
+    line_gap: int = 2
+    # Panel layout name from layout.PANELS; None picks one by canvas size.
+    layout: str | None = None
+
+
+def _split_wifi_text(text: str) -> tuple[str | None, str | None]:
+    text = (text or "").strip()
+    if not text:
+        return None, None
+    parts = text.split()
+    state = parts[0].upper()
+    ssid = " ".join(parts[1:]).strip() if len(parts) > 1 else None
+    if ssid == "":
+        ssid = None
+    return state, ssid
+
+
+def _short_wifi_state(state: str | None) -> str:
+    if not state:
+        return "UNK"
+    state = state.upper()
+    mapping = {
+        "UP": "UP",
+        "DOWN": "DN",
+        "UNKNOWN": "UNK",
+        "MISSING": "MISS",
+        "DORMANT": "DORM",
+        "LOWERLAYERDOWN": "LLDN",
+    }
+    return mapping.get(state, state[:4])
+
+
+def _battery_short(percent: int | None, battery_text: str) -> str:
+    if percent is None:
+        return "--"
+    suffix = ""
+    text = (battery_text or "").upper()
+    if "CHARG" in text:
+        suffix = "C"
+    elif "FULL" in text:
+        suffix = "F"
+    return f"{percent}%{suffix}"
+
+
+def _format_rate(value: float | None) -> str:
+    if value is None:
+        return "--"
+    if value < 10:
+        text = f"{value:.1f}"
+        if text.endswith(".0"):
+            text = text[:-2]
+        return f"{text}/s"
+    return f"{_format_packets(int(round(value)))}/s"
+
+
+def _format_packets(value: int | None) -> str:
+    if value is None:
+        return "--"
+    if value < 1000:
+        return str(value)
+    if value < 1_000_000:
+        scaled = value / 1000
+        text = f"{scaled:.1f}"
+        if text.endswith(".0"):
+            text = text[:-2]
+        return f"{text}k"
+    if value < 1_000_000_000:
+        scaled = value / 1_000_000
+        text = f"{scaled:.1f}"
+        if text.endswith(".0"):
+            text = text[:-2]
+        return f"{text}m"
+    scaled = value / 1_000_000_000
+    text = f"{scaled:.1f}"
+    if text.endswith(".0"):
+        text = text[:-2]
+    return f"{text}g"
+
+
+def _status_message(status_text: str) -> str:
+    status = status_text.strip().upper()
+    if status == "RUNNING":
+        return "SESSION LIVE"
+    if status in {"DOWN", "FAILED"}:
+        return "SERVICE DOWN"
+    if status == "READY":
+        return "WAITING FOR INPUT"
+    return "STATUS UNKNOWN"
+
+
+def _pick_face(status_text: str, battery_percent: int | None) -> str:
+    status = status_text.strip().upper()
+    if status in {"DOWN", "FAILED"}:
+        return "(x_x)"
+    if battery_percent is not None and battery_percent <= 15:
+        return "(T_T)"
+    if status == "RUNNING":
+        return "(^_^)"
+    if status == "READY":
+        return "(^_~)"
+    return "(^_^)"
+
+
+# Extra lines in the order they are dropped when a layout has no room.
+_LINE_PRIORITY = ("STATE ", "CH ", "EXT ", "PKT ", "SSID ", "PWR ", "TOP ", "ALRT ")
+
+
+@dataclass(frozen=True)
+class StatusText:
+    fields: dict[str, str]
+    battery_percent: int | None
+    lines: tuple[str, ...]
+
+    def visible_lines(self, capacity: int) -> tuple[str, ...]:
+        if len(self.lines) <= capacity:
+            return self.lines
+        if capacity <= 0:
+            return ()
+
+        def rank(line: str) -> int:
+            for index, prefix in enumerate(_LINE_PRIORITY):
+                if line.startswith(prefix):
+                    return index
+            return len(_LINE_PRIORITY)
+
+        keep = sorted(range(len(self.lines)), key=lambda index: rank(self.lines[index]))[-capacity:]
+        return tuple(self.lines[index] for index in sorted(keep))
+
+
+def status_text(
+    status: str,
+    ip: str,
+    wifi: str,
+    battery: str,
+    adapter: str | None,
+    power: str | None,
+    alert: str | None,
+    temp: str,
+    load: str,
+    uptime: str,
+    mem: str,
+    cpu: str,
+    battery_percent: int | None,
+    updated: str | None,
+    wifi_channel: str | None = None,
+    wifi_packets: int | None = None,
+    wifi_rate: float | None = None,
+    top: str | None = None,
+) -> StatusText:
+    state = status.strip().upper() or "READY"
+    wifi_state, wifi_ssid = _split_wifi_text(wifi)
+    wifi_short = _short_wifi_state(wifi_state)
+    packets_text = _format_rate(wifi_rate) if wifi_rate is not None else _format_packets(wifi_packets)
+    lines = [
+        f"STATE {state}",
+        f"SSID {wifi_ssid or '--'}",
+        f"CH {wifi_channel or '--'}",
+        f"PKT {packets_text}",
+    ]
+    if adapter:
+        lines.append(f"EXT {adapter.upper()}")
+    if power:
+        lines.append(f"PWR {power}")
+    if alert:
+        lines.append(f"ALRT {alert}")
+    if top:
+        lines.append(f"TOP {top}")
+    return StatusText(
+        fields={
+            "ip": f"IP {ip}",
+            "wifi": f"WIFI {wifi_short}",
+            "bat": f"BAT {_battery_short(battery_percent, battery)}",
+            "uptime": f"UP {uptime or '--'}",
+            "ssid": f"WIFI {wifi_ssid or wifi_short}",
+            "load": f"LOAD {load or '--'}",
+            "message": _status_message(state),
+            "face": _pick_face(state, battery_percent),
+            "battery": f"{battery_percent}%" if battery_percent is not None else "--",
+            "mem": mem or "--",
+            "cpu": cpu or "--",
+            "temp": temp or "--",
+            "updated": updated or "",
+        },
+        battery_percent=battery_percent,
+        lines=tuple(lines),
+    )
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import threading
+import time
+
+STA_UNSYNC = 0x0040
+TIME_ERROR = 5
+MAX_ERROR_US = 16_000_000
+
+
+class _Timeval(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_usec", ctypes.c_long)]
+
+
+class Timex(ctypes.Structure):
+    _fields_ = [
+        ("modes", ctypes.c_uint),
+        ("offset", ctypes.c_long),
+        ("freq", ctypes.c_long),
+        ("maxerror", ctypes.c_long),
+        ("esterror", ctypes.c_long),
+        ("status", ctypes.c_int),
+        ("constant", ctypes.c_long),
+        ("precision", ctypes.c_long),
+        ("tolerance", ctypes.c_long),
+        ("time", _Timeval),
+        ("tick", ctypes.c_long),
+        ("ppsfreq", ctypes.c_long),
+        ("jitter", ctypes.c_long),
+        ("shift", ctypes.c_int),
+        ("stabil", ctypes.c_long),
+        ("jitcnt", ctypes.c_long),
+        ("calcnt", ctypes.c_long),
+        ("errcnt", ctypes.c_long),
+        ("stbcnt", ctypes.c_long),
+        ("tai", ctypes.c_int),
+        ("_reserved", ctypes.c_int * 11),
+    ]
+
+
+def is_synchronized(state: int, status: int, maxerror: int) -> bool:
+    if state == TIME_ERROR or status & STA_UNSYNC:
+        return False
+    return 0 <= maxerror < MAX_ERROR_US
+
+
+def _load_adjtimex():
+    name = ctypes.util.find_library("c")
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        func = libc.adjtimex
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.POINTER(Timex)]
+    func.restype = ctypes.c_int
+    return func
+
+
+class ClockSync:
+    def __init__(self, adjtimex=None, ttl: float = 10.0) -> None:
+        self._adjtimex = adjtimex
+        self._loaded = adjtimex is not None
+        self._ttl = ttl
+        self._buf = Timex()
+        self._lock = threading.Lock()
+        self._cached: bool | None = None
+        self._cached_at: float | None = None
+
+    def read(self) -> bool | None:
+        with self._lock:
+            if not self._loaded:
+                self._adjtimex = _load_adjtimex()
+                self._loaded = True
+            if self._adjtimex is None:
+                return None
+            now = time.monotonic()
+            if self._cached_at is not None and now - self._cached_at < self._ttl:
+                return self._cached
+            self._buf.modes = 0
+            state = self._adjtimex(ctypes.byref(self._buf))
+            if state < 0:
+                return None
+            self._cached = is_synchronized(state, self._buf.status, self._buf.maxerror)
+            self._cached_at = now
+            return self._cached
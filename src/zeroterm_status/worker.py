@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import threading
+import time
+
+from .collectors import LatencyHistogram
+from .drivers.base import BaseDisplay, DisplayError
+
+logger = logging.getLogger(__name__)
+
+REFRESH_BUCKETS_MS = (100, 250, 500, 1000, 2000, 4000, 8000)
+
+
+@dataclass
+class WorkerStats:
+    submitted: int = 0
+    shown: int = 0
+    dropped: int = 0
+    failures: int = 0
+    reinits: int = 0
+    last_seconds: float = 0.0
+
+
+class DisplayWorker:
+    """Shows frames on a background thread; only the newest pending frame is kept.
+
+    With ``sleep_between`` the panel is put into deep sleep after every update;
+    drivers wake it on the next frame that actually changes.
+    """
+
+    def __init__(
+        self,
+        display: BaseDisplay,
+        backoff_min: float = 5.0,
+        backoff_max: float = 60.0,
+        sleep_between: bool = False,
+    ) -> None:
+        self.display = display
+        self.sleep_between = sleep_between
+        self.stats = WorkerStats()
+        self.histogram = LatencyHistogram(REFRESH_BUCKETS_MS)
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._needs_init = False
+        self._pending = None
+        self._held = False
+        self._busy = False
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="zeroterm-display", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, frame) -> None:
+        with self._cond:
+            if self._held:
+                # A new frame goes out now; only failure backoff delays it.
+                self._retry_at = 0.0
+            elif self._pending is not None:
+                self.stats.dropped += 1
+            self._pending = frame
+            self._held = False
+            self.stats.submitted += 1
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (
+            f"shown={stats.shown} dropped={stats.dropped} failures={stats.failures} "
+            f"reinits={stats.reinits} refresh {self.histogram.summary()}"
+        )
+
+    def _next_frame(self):
+        with self._cond:
+            while not self._stopping:
+                if self._pending is not None:
+                    delay = self._retry_at - time.monotonic()
+                    if delay <= 0:
+                        frame = self._pending
+                        self._pending = None
+                        self._held = False
+                        self._busy = True
+                        return frame
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+            return None
+
+    def _run(self) -> None:
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return
+            try:
+                self._deliver(frame)
+            except Exception:
+                logger.exception("Display worker failed")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, frame) -> None:
+        if self._needs_init:
+            try:
+                self.display.init()
+            except DisplayError as exc:
+                logger.error("Display re-init failed: %s", exc)
+                self._failed(frame)
+                return
+            self._needs_init = False
+            self.stats.reinits += 1
+        start = time.monotonic()
+        try:
+            self.display.show(frame)
+        except DisplayError as exc:
+            logger.error("Display update failed: %s", exc)
+            self._needs_init = True
+            self._failed(frame)
+            return
+        elapsed = time.monotonic() - start
+        self._backoff = 0.0
+        self.stats.shown += 1
+        self.stats.last_seconds = elapsed
+        self.histogram.record(elapsed)
+        if self.sleep_between:
+            with self._cond:
+                # No point sleeping if the next frame is already waiting.
+                idle = self._pending is None
+            if idle:
+                self.display.sleep()
+        delay = self.display.due_in()
+        if delay is not None:
+            with self._cond:
+                # Re-show the frame once a rate-limited sink may take it.
+                if self._pending is None:
+                    self._pending = frame
+                    self._held = True
+                    self._retry_at = time.monotonic() + delay
+
+    def _failed(self, frame) -> None:
+        self.stats.failures += 1
+        self._backoff = min(self._backoff_max, max(self._backoff_min, self._backoff * 2))
+        logger.info("Retrying display in %.0fs", self._backoff)
+        with self._cond:
+            self._retry_at = time.monotonic() + self._backoff
+            # Retry the failed frame unless a newer one arrived meanwhile.
+            if self._pending is None:
+                self._pending = frame
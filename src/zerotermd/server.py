@@ -14,6 +14,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import parse_qs, urlsplit
 
+from zeroterm_status.config import DEFAULT_BATTERY_STORE_PATH, DEFAULT_HISTORY_PATH, is_disabled
+
 from .config import Config
 from .http_utils import read_http_request, send_response, serve_static
 from .pty_session import resize_pty, spawn_pty
@@ -57,6 +59,15 @@ _ENV_CACHE: dict[str, object] = {
     "data": {},
 }
 _ENV_CACHE_LOCK = threading.Lock()
+_HISTORY_CACHE: dict[str, object] = {
+    "path": None,
+    "mtime": None,
+    "history": None,
+}
+_HISTORY_CACHE_LOCK = threading.Lock()
+_BATTERY_DEFAULT_WINDOW = 7 * 24 * 3600
+_ESTIMATE_WINDOW = 2 * 3600
+_TOP_PROCESSES = 5
 
 
 def run_server(config: Config) -> None:
@@ -111,6 +122,20 @@ def _handle_client(conn: socket.socket, addr: tuple[str, int], config: Config) -
                 _handle_status_request(conn, config)
                 return
 
+            if _is_history_path(request.target):
+                if request.method != "GET":
+                    _send_text(conn, 405, b"Method Not Allowed")
+                    return
+                _handle_history_request(conn, config, request.target)
+                return
+
+            if _is_battery_path(request.target):
+                if request.method != "GET":
+                    _send_text(conn, 405, b"Method Not Allowed")
+                    return
+                _handle_battery_request(conn, config, request.target)
+                return
+
             if _is_power_path(request.target):
                 if request.method != "POST":
                     _send_text(conn, 405, b"Method Not Allowed")
@@ -168,6 +193,14 @@ def _is_status_path(target: str) -> bool:
     return urlsplit(target).path == "/api/status"
 
 
+def _is_history_path(target: str) -> bool:
+    return urlsplit(target).path == "/api/history"
+
+
+def _is_battery_path(target: str) -> bool:
+    return urlsplit(target).path == "/api/battery"
+
+
 def _is_power_path(target: str) -> bool:
     return urlsplit(target).path == "/api/power"
 
@@ -332,25 +365,57 @@ def _restart_status_service() -> bool:
     return result.returncode == 0
 
 
-def _read_battery_snapshot(battery_path: str | None, battery_cmd: str | None) -> tuple[int | None, str | None]:
+def _read_battery_snapshot(
+    battery_path: str | None,
+    battery_cmd: str | None,
+    battery_pisugar: str | None = None,
+) -> tuple[int | None, str | None]:
     try:
         from zeroterm_status.metrics import read_battery
     except Exception:
         return None, None
-    info = read_battery(battery_path, battery_cmd)
+    info = read_battery(battery_path, battery_cmd, battery_pisugar)
     return info.percent, info.status
 
 
+def _read_battery_estimate(env_data: dict[str, str]) -> dict[str, object]:
+    estimate: dict[str, object] = {
+        "battery_rate": None,
+        "battery_time_to_empty": None,
+        "battery_time_to_full": None,
+    }
+    path_value = _get_env_value(env_data, "ZEROTERM_BATTERY_STORE_PATH", DEFAULT_BATTERY_STORE_PATH)
+    if not path_value or is_disabled(path_value):
+        return estimate
+    try:
+        from zeroterm_status.batterylog import read_range
+        from zeroterm_status.discharge import DischargeModel
+    except Exception:
+        return estimate
+    now = time.time()
+    model = DischargeModel(window=_ESTIMATE_WINDOW)
+    for timestamp, percent, status in read_range(path_value, now - _ESTIMATE_WINDOW, now, step=1):
+        model.add(timestamp, percent, status)
+    result = model.estimate()
+    estimate["battery_rate"] = result.rate_per_hour
+    estimate["battery_time_to_empty"] = result.time_to_empty
+    estimate["battery_time_to_full"] = result.time_to_full
+    return estimate
+
+
 def _handle_status_request(conn: socket.socket, config: Config) -> None:
     env_data = _load_env_file(config.env_path)
     battery_path = _get_env_value(env_data, "ZEROTERM_BATTERY_PATH")
     battery_cmd = _get_env_value(env_data, "ZEROTERM_BATTERY_CMD")
+    battery_pisugar = _get_env_value(env_data, "ZEROTERM_BATTERY_PISUGAR")
+    if is_disabled(battery_pisugar):
+        battery_pisugar = ""
     profile = _get_env_value(env_data, "ZEROTERM_STATUS_PROFILE")
     wifi_iface = _get_env_value(env_data, "ZEROTERM_STATUS_IFACE", "wlan0") or "wlan0"
     wifi_auto = _get_env_bool(env_data, "ZEROTERM_STATUS_IFACE_AUTO", False)
     wifi_ssid = _get_env_bool(env_data, "ZEROTERM_STATUS_WIFI_SSID", True)
 
-    battery_percent, battery_status = _read_battery_snapshot(battery_path, battery_cmd)
+    battery_percent, battery_status = _read_battery_snapshot(battery_path, battery_cmd, battery_pisugar)
     power_state = _format_power_state(battery_status)
     wifi_payload: dict[str, object] = {
         "wifi_iface": wifi_iface,
@@ -359,11 +424,14 @@ def _handle_status_request(conn: socket.socket, config: Config) -> None:
         "wifi_mode": None,
         "wifi_channel": None,
         "wifi_packets": None,
+        "wifi_pps": None,
+        "wifi_bps": None,
         "wifi_ip": None,
     }
     try:
-        from zeroterm_status.metrics import read_wifi, select_wifi_iface
+        from zeroterm_status.metrics import read_wifi, select_wifi_iface, start_link_monitor
 
+        start_link_monitor()
         selected_iface = select_wifi_iface(wifi_iface, wifi_auto)
         wifi = read_wifi(selected_iface, read_ssid=wifi_ssid)
         wifi_payload = {
@@ -373,10 +441,27 @@ def _handle_status_request(conn: socket.socket, config: Config) -> None:
             "wifi_mode": wifi.mode,
             "wifi_channel": wifi.channel,
             "wifi_packets": wifi.packets,
+            "wifi_pps": wifi.packet_rate,
+            "wifi_bps": wifi.bit_rate,
             "wifi_ip": wifi.ip,
         }
     except Exception:
         pass
+    cpu_payload: dict[str, object] = {"cpu_percent": None, "cpu_cores": [], "top_processes": []}
+    try:
+        from zeroterm_status.metrics import read_cpu_usage, read_top_processes
+
+        usage = read_cpu_usage(consumer="api")
+        top = read_top_processes(_TOP_PROCESSES, consumer="api")
+        cpu_payload = {
+            "cpu_percent": usage.percent if usage is not None else None,
+            "cpu_cores": list(usage.cores) if usage is not None else [],
+            "top_processes": [
+                {"pid": process.pid, "name": process.name, "percent": process.percent} for process in top
+            ],
+        }
+    except Exception:
+        pass
     payload = {
         "battery_percent": battery_percent,
         "battery_status": battery_status,
@@ -384,10 +469,127 @@ def _handle_status_request(conn: socket.socket, config: Config) -> None:
         "profile": profile or None,
         "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
     }
+    payload.update(_read_battery_estimate(env_data))
     payload.update(wifi_payload)
+    payload.update(cpu_payload)
     _send_json(conn, 200, payload)
 
 
+def _load_history(path: Path):
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    with _HISTORY_CACHE_LOCK:
+        if _HISTORY_CACHE.get("path") == path and _HISTORY_CACHE.get("mtime") == mtime:
+            return _HISTORY_CACHE.get("history")
+    try:
+        from zeroterm_status.history import MetricsHistory
+    except Exception:
+        return None
+    history = MetricsHistory.load(path)
+    with _HISTORY_CACHE_LOCK:
+        _HISTORY_CACHE["path"] = path
+        _HISTORY_CACHE["mtime"] = mtime
+        _HISTORY_CACHE["history"] = history
+    return history
+
+
+def _query_int(query: dict[str, list[str]], key: str) -> int | None:
+    values = query.get(key)
+    if not values:
+        return None
+    try:
+        return int(values[0])
+    except ValueError:
+        return None
+
+
+def _handle_history_request(conn: socket.socket, config: Config, target: str) -> None:
+    env_data = _load_env_file(config.env_path)
+    path_value = _get_env_value(env_data, "ZEROTERM_STATUS_HISTORY_PATH", DEFAULT_HISTORY_PATH)
+    if not path_value or is_disabled(path_value):
+        _send_json(conn, 404, {"ok": False, "error": "history disabled"})
+        return
+    history = _load_history(Path(path_value))
+    if history is None:
+        _send_json(conn, 404, {"ok": False, "error": "history unavailable"})
+        return
+    query = parse_qs(urlsplit(target).query)
+    resolution = _query_int(query, "res") or 300
+    if resolution not in history.resolutions:
+        _send_json(conn, 400, {"ok": False, "error": "invalid resolution"})
+        return
+    names = history.metrics
+    requested = query.get("metric")
+    if requested:
+        wanted = {name.strip() for value in requested for name in value.split(",")}
+        names = [name for name in names if name in wanted]
+    window = _query_int(query, "window")
+    now = time.time()
+    since = now - window if window and window > 0 else None
+    metrics: dict[str, object] = {}
+    for name in names:
+        points = history.series(name, resolution, since)
+        summary = history.window(name, window, now) if since is not None else None
+        metrics[name] = {
+            "t": [point[0] for point in points],
+            "min": [round(point[1], 2) for point in points],
+            "max": [round(point[2], 2) for point in points],
+            "avg": [round(point[3], 2) for point in points],
+            "summary": (
+                {"min": round(summary[0], 2), "max": round(summary[1], 2), "avg": round(summary[2], 2)}
+                if summary
+                else None
+            ),
+        }
+    _send_json(
+        conn,
+        200,
+        {
+            "ok": True,
+            "resolution": resolution,
+            "resolutions": history.resolutions,
+            "metrics": metrics,
+        },
+    )
+
+
+def _handle_battery_request(conn: socket.socket, config: Config, target: str) -> None:
+    env_data = _load_env_file(config.env_path)
+    path_value = _get_env_value(env_data, "ZEROTERM_BATTERY_STORE_PATH", DEFAULT_BATTERY_STORE_PATH)
+    if not path_value or is_disabled(path_value):
+        _send_json(conn, 404, {"ok": False, "error": "battery store disabled"})
+        return
+    try:
+        from zeroterm_status.batterylog import read_range
+    except Exception:
+        _send_json(conn, 500, {"ok": False, "error": "battery store unavailable"})
+        return
+    query = parse_qs(urlsplit(target).query)
+    now = int(time.time())
+    until = _query_int(query, "until") or now
+    since = _query_int(query, "since")
+    if since is None:
+        window = _query_int(query, "window") or _BATTERY_DEFAULT_WINDOW
+        since = until - max(1, window)
+    step = _query_int(query, "step")
+    points = max(1, min(5000, _query_int(query, "points") or 500))
+    series = read_range(path_value, since, until, step=step, max_points=points)
+    _send_json(
+        conn,
+        200,
+        {
+            "ok": True,
+            "since": since,
+            "until": until,
+            "t": [point[0] for point in series],
+            "percent": [point[1] for point in series],
+            "status": [point[2] for point in series],
+        },
+    )
+
+
 def _normalize_profile(value: str | None) -> str | None:
     if value is None:
         return None
@@ -5,6 +5,7 @@ import sys
 import types
 from pathlib import Path
 
+# Runs before any test module when discovered with `-t .`, as CI does.
 ROOT_DIR = Path(__file__).resolve().parents[1]
 SRC_DIR = ROOT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from zeroterm_status import batterylog
+
+
+class TestBatteryLog(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.path = Path(self._temp.name) / "battery.bin"
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def test_range_query_downsamples(self) -> None:
+        writer = batterylog.BatteryLogWriter(self.path)
+        for step in range(12):
+            writer.append(1000 + step * 60, 90 - step, "Discharging")
+        writer.close()
+        points = batterylog.read_range(self.path, 1120, 1600, step=240)
+        self.assertEqual(points, [(1120, 86, "Discharging"), (1360, 82, "Discharging"), (1600, 80, "Discharging")])
+        self.assertEqual(batterylog.read_range(self.path, 5000, 6000), [])
+
+    def test_reopen_appends_and_drops_partial_record(self) -> None:
+        writer = batterylog.BatteryLogWriter(self.path)
+        writer.append(100, 50, "Charging")
+        writer.close()
+        with open(self.path, "ab") as handle:
+            handle.write(b"\x01\x02\x03")
+        writer = batterylog.BatteryLogWriter(self.path)
+        writer.append(200, None, None)
+        writer.close()
+        points = batterylog.read_range(self.path, 0, 300, step=100)
+        self.assertEqual(points, [(100, 50, "Charging"), (200, None, None)])
+
+    def test_reader_sees_unclosed_samples(self) -> None:
+        writer = batterylog.BatteryLogWriter(self.path)
+        writer.append(100, 70, "Discharging")
+        self.assertEqual(batterylog.read_range(self.path, 0, 200, step=100), [(100, 70, "Discharging")])
+        writer.close()
+
+    def test_rotates_by_size(self) -> None:
+        writer = batterylog.BatteryLogWriter(self.path, max_bytes=16 + 8 * 4, keep=1)
+        for step in range(6):
+            writer.append(step * 10, step, "Full")
+        writer.close()
+        self.assertTrue(Path(f"{self.path}.1").exists())
+        self.assertEqual(os.path.getsize(self.path), 16 + 8 * 2)
+        points = batterylog.read_range(self.path, 0, 100, step=10, keep=1)
+        self.assertEqual([point[1] for point in points], [0, 1, 2, 3, 4, 5])
+
+    def test_backward_clock_step_reads_in_time_order(self) -> None:
+        writer = batterylog.BatteryLogWriter(self.path, keep=1)
+        writer.append(500, 50, "Discharging")
+        writer.append(600, 49, "Discharging")
+        writer.append(100, 60, "Charging")
+        writer.close()
+        self.assertTrue(Path(f"{self.path}.1").exists())
+        points = batterylog.read_range(self.path, 0, 1000, step=100, keep=1)
+        self.assertEqual(points, [(100, 60, "Charging"), (500, 50, "Discharging"), (600, 49, "Discharging")])
+
+    def test_week_of_samples_downsamples_to_max_points(self) -> None:
+        writer = batterylog.BatteryLogWriter(self.path, max_bytes=1 << 20)
+        start = 1_700_000_000
+        for index in range(7 * 24 * 12):
+            writer.append(start + index * 300, 100 - index % 100, "Discharging")
+        writer.close()
+        points = batterylog.read_range(self.path, start, start + 7 * 86400, max_points=500)
+        step = -(-7 * 86400 // 500)
+        self.assertEqual(len(points), 500)
+        self.assertEqual(points[0][0], start)
+        self.assertEqual(points[-1][0], start + (2015 * 300 // step) * step)
+        # Samples before the range are skipped by the bisect, not bucketed.
+        points = batterylog.read_range(self.path, start + 600, start + 600, step=1)
+        self.assertEqual(points, [(start + 600, 98, "Discharging")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from zeroterm_status import bitmap
+from zeroterm_status.bitmap import BitmapCanvas, fit_text, render_status_bitmap, text_width
+from zeroterm_status.drivers.file import FileDisplay
+from zeroterm_status.statusview import RenderConfig
+
+_VALUES = dict(
+    status="RUNNING",
+    ip="10.0.0.5",
+    wifi="UP TEST",
+    battery="55% CHARGING",
+    adapter="wlan1",
+    power="CHG",
+    alert="UPD",
+    temp="42C",
+    load="0.42",
+    uptime="1h2m",
+    mem="50%",
+    cpu="20%",
+    battery_percent=55,
+    updated=None,
+    wifi_channel="6",
+    wifi_rate=42.5,
+    top="airodump-ng 97%",
+)
+
+
+def _pixel(canvas: BitmapCanvas, x: int, y: int) -> int:
+    return canvas.buffer[y * canvas.stride + x // 8] >> (7 - x % 8) & 1
+
+
+class TestBitmapCanvas(unittest.TestCase):
+    def test_blank_rows_have_zero_padding(self) -> None:
+        canvas = BitmapCanvas(13, 2)
+        self.assertEqual(bytes(canvas.buffer), b"\xff\xf8\xff\xf8")
+
+    def test_spans_and_rectangles(self) -> None:
+        canvas = BitmapCanvas(40, 6)
+        canvas.span(1, 3, 29)
+        canvas.rectangle((0, 3, 39, 5), outline=0)
+        for x in range(40):
+            self.assertEqual(_pixel(canvas, x, 1), 0 if 3 <= x < 29 else 1)
+            self.assertEqual(_pixel(canvas, x, 3), 0)
+        self.assertEqual([_pixel(canvas, x, 4) for x in (0, 1, 38, 39)], [0, 1, 1, 0])
+        canvas.span(1, 8, 16, fill=1)
+        self.assertEqual(canvas.buffer[1 * 5 + 1], 0xFF)
+
+    def test_text(self) -> None:
+        canvas = BitmapCanvas(16, 8)
+        canvas.text(0, 0, "I")
+        self.assertEqual([_pixel(canvas, x, 0) for x in range(5)], [1, 0, 0, 0, 1])
+        self.assertEqual([_pixel(canvas, 2, y) for y in range(7)], [0] * 7)
+        self.assertEqual(text_width("ABC"), 17)
+        self.assertEqual(text_width("ABC", 2), 34)
+
+    def test_fit_text(self) -> None:
+        self.assertEqual(fit_text("HELLO", 1, 29), "HELLO")
+        self.assertEqual(fit_text("HELLO WORLD", 1, 35), "HEL...")
+        self.assertLessEqual(text_width(fit_text("HELLO WORLD", 2, 50), 2), 50)
+        self.assertEqual(fit_text("HELLO", 1, 10), "")
+
+
+class TestRenderStatusBitmap(unittest.TestCase):
+    def test_frame_orientation_and_cache(self) -> None:
+        config = RenderConfig(width=122, height=250, rotate=90, font_path=None, font_size=14)
+        frame = render_status_bitmap(config=config, panel_size=(122, 250), **_VALUES)
+        self.assertEqual(frame.size, (122, 250))
+        self.assertEqual(len(frame.data), 16 * 250)
+        self.assertIs(render_status_bitmap(config=config, panel_size=(122, 250), **_VALUES), frame)
+        self.assertIsNot(render_status_bitmap(config=config, panel_size=(122, 250), **dict(_VALUES, cpu="99%")), frame)
+
+    def test_layout_is_cached(self) -> None:
+        config = RenderConfig(width=250, height=122, rotate=0, font_path=None, font_size=14)
+        bitmap._LAYOUT_CACHE.pop(config, None)
+        first = bitmap.draw_status(config, **_VALUES)
+        layout = bitmap._LAYOUT_CACHE[config]
+        second = bitmap.draw_status(config, **_VALUES)
+        self.assertIs(bitmap._LAYOUT_CACHE[config], layout)
+        self.assertEqual(first.buffer, second.buffer)
+        self.assertNotEqual(layout.base.buffer, first.buffer)
+
+    def test_does_not_import_pillow(self) -> None:
+        src = str(Path(bitmap.__file__).resolve().parents[1])
+        script = (
+            f"import sys; sys.path.insert(0, {src!r})\n"
+            "from zeroterm_status.bitmap import render_status_bitmap\n"
+            "from zeroterm_status.statusview import RenderConfig\n"
+            f"render_status_bitmap(config=RenderConfig(250, 122, 0, None, 14), **{_VALUES!r})\n"
+            "print('PIL' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_file_display_writes_pbm(self) -> None:
+        frame = render_status_bitmap(config=RenderConfig(250, 122, 0, None, 14), **_VALUES)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "epaper.pbm"
+            display = FileDisplay(250, 122, str(output))
+            display.init()
+            display.show(frame)
+            data = output.read_bytes()
+        header = b"P4\n250 122\n"
+        self.assertTrue(data.startswith(header))
+        self.assertEqual(len(data), len(header) + 32 * 122)
+        self.assertEqual(data[len(header)], frame.data[0] ^ 0xFF)
+
+    def test_file_display_falls_back_to_pbm_without_pillow(self) -> None:
+        frame = render_status_bitmap(config=RenderConfig(250, 122, 0, None, 14), **_VALUES)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "epaper.png"
+            with mock.patch("zeroterm_status.drivers.file.importlib.util.find_spec", return_value=None):
+                with self.assertLogs("zeroterm_status.drivers.file", level="WARNING"):
+                    display = FileDisplay(250, 122, str(output))
+            display.init()
+            display.show(frame)
+            self.assertFalse(output.exists())
+            self.assertTrue((Path(temp_dir) / "epaper.pbm").read_bytes().startswith(b"P4\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
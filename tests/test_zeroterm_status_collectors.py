@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from zeroterm_status.collectors import CollectorPool, LatencyHistogram
+
+
+class TestCollectorPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = CollectorPool(max_workers=2)
+        self.release = threading.Event()
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.pool.shutdown()
+
+    def test_hung_collector_uses_last_value(self) -> None:
+        calls = []
+        finished = threading.Event()
+
+        def slow() -> str:
+            calls.append(1)
+            if len(calls) > 1:
+                self.release.wait(5)
+                finished.set()
+            return f"value-{len(calls)}"
+
+        first = self.pool.collect({"slow": (slow, 1.0), "fast": (lambda: 1, 1.0)})
+        self.assertEqual(first["slow"].value, "value-1")
+        self.assertFalse(first["slow"].stale)
+
+        second = self.pool.collect({"slow": (slow, 0.05), "fast": (lambda: 2, 1.0)})
+        self.assertTrue(second["slow"].stale)
+        self.assertEqual(second["slow"].value, "value-1")
+        self.assertEqual(second["fast"].value, 2)
+
+        third = self.pool.collect({"slow": (slow, 0.05)})
+        self.assertTrue(third["slow"].stale)
+        self.assertEqual(len(calls), 2)
+
+        # The late result lands between cycles and is used, not re-run.
+        self.release.set()
+        self.assertTrue(finished.wait(5))
+        fourth = self.pool.collect({"slow": (slow, 1.0)})
+        self.assertEqual(fourth["slow"].value, "value-2")
+        self.assertFalse(fourth["slow"].stale)
+        self.assertEqual(len(calls), 2)
+
+    def test_failing_collector_is_stale(self) -> None:
+        def broken() -> None:
+            raise RuntimeError("boom")
+
+        with self.assertLogs("zeroterm_status.collectors", level="ERROR"):
+            samples = self.pool.collect({"broken": (broken, 1.0)})
+        self.assertTrue(samples["broken"].stale)
+        self.assertIsNone(samples["broken"].value)
+        self.assertEqual(self.pool.histogram.total, 1)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self) -> None:
+        histogram = LatencyHistogram()
+        for _ in range(9):
+            histogram.record(0.004)
+        histogram.record(1.5)
+        self.assertEqual(histogram.percentile(0.5), 5)
+        self.assertEqual(histogram.percentile(0.95), 2000)
+        self.assertEqual(histogram.snapshot()["le5"], 9)
+        self.assertIn("n=10", histogram.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.helpers import FakeClock, temp_env
+from zeroterm_status.config import load_config
+from zeroterm_status.display import create_display, parse_sinks
+from zeroterm_status.drivers.base import BaseDisplay, DisplayError
+from zeroterm_status.drivers.composite import CompositeDisplay, Sink
+from zeroterm_status.drivers.file import FileDisplay
+from zeroterm_status.drivers.raw import RawDisplay
+from zeroterm_status.drivers.null import NullDisplay
+from zeroterm_status.framebuffer import PackedFrame
+from zeroterm_status.main import _fallback_display
+from zeroterm_status.worker import DisplayWorker
+
+
+class RecordingDisplay(BaseDisplay):
+    accepts_frames = True
+
+    def __init__(self, fail_init: int = 0) -> None:
+        self.width = 8
+        self.height = 2
+        self.fail_init = fail_init
+        self.inits = 0
+        self.shown: list[object] = []
+
+    def init(self) -> None:
+        self.inits += 1
+        if self.fail_init:
+            self.fail_init -= 1
+            raise DisplayError("no panel")
+
+    def show(self, image) -> None:
+        self.shown.append(image)
+
+    def sleep(self) -> None:
+        return None
+
+
+def _frame(value: int) -> PackedFrame:
+    return PackedFrame(8, 2, bytes([value, 0xFF]))
+
+
+class TestCompositeDisplay(unittest.TestCase):
+    def test_rate_limits_and_skips_unchanged_per_sink(self) -> None:
+        clock = FakeClock()
+        panel = RecordingDisplay()
+        preview = RecordingDisplay()
+        display = CompositeDisplay([Sink("panel", panel, 30.0), Sink("preview", preview)], clock=clock)
+        display.init()
+        display.show(_frame(1))
+        clock.now += 10
+        display.show(_frame(2))
+        display.show(_frame(2))
+        self.assertEqual(preview.shown, [_frame(1), _frame(2)])
+        self.assertEqual(panel.shown, [_frame(1)])
+        self.assertAlmostEqual(display.due_in(), 20.0)
+        clock.now += 25
+        display.show(_frame(2))
+        self.assertEqual(panel.shown, [_frame(1), _frame(2)])
+        self.assertIsNone(display.due_in())
+        panel_stats = display.sinks[0].stats
+        self.assertEqual((panel_stats.shown, panel_stats.limited), (2, 2))
+        self.assertEqual(display.sinks[1].stats.unchanged, 2)
+        self.assertIn("preview shown=2", display.summary())
+
+    def test_failing_secondary_sink_does_not_block_panel(self) -> None:
+        clock = FakeClock()
+        panel = RecordingDisplay()
+        preview = RecordingDisplay(fail_init=2)
+        display = CompositeDisplay([Sink("panel", panel), Sink("preview", preview)], clock=clock)
+        display.init()
+        display.show(_frame(1))
+        self.assertEqual(panel.shown, [_frame(1)])
+        self.assertEqual(preview.inits, 1)
+        clock.now += 10
+        display.show(_frame(2))
+        self.assertEqual(preview.inits, 2)
+        clock.now += 5
+        display.show(_frame(3))
+        self.assertEqual(preview.inits, 2)
+        clock.now += 5
+        display.show(_frame(4))
+        self.assertEqual(preview.inits, 3)
+        self.assertEqual(panel.shown, [_frame(1), _frame(2), _frame(3), _frame(4)])
+        self.assertEqual(preview.shown, [_frame(4)])
+        self.assertEqual(display.sinks[1].stats.failures, 2)
+
+    def test_unwritable_secondary_sinks_are_reported_not_raised(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            blocker = Path(temp_dir) / "file"
+            blocker.write_text("", encoding="utf-8")
+            panel = RecordingDisplay()
+            raw = Path(temp_dir) / "epaper.raw"
+            sinks = [
+                Sink("panel", panel),
+                Sink("raw-bad", RawDisplay(8, 2, str(blocker / "x.raw"))),
+                Sink("pbm-bad", FileDisplay(8, 2, str(blocker / "x.pbm"))),
+                Sink("raw", RawDisplay(8, 2, str(raw))),
+            ]
+            display = CompositeDisplay(sinks)
+            with self.assertLogs("zeroterm_status.drivers.composite", level="ERROR"):
+                display.init()
+                display.show(_frame(1))
+            self.assertEqual(panel.shown, [_frame(1)])
+            self.assertEqual(raw.read_bytes(), _frame(1).data)
+        self.assertEqual([sink.stats.failures for sink in sinks], [0, 1, 1, 0])
+
+    def test_unwritable_sink_show_is_a_display_error(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "out" / "epaper.raw"
+            raw = RawDisplay(8, 2, str(target))
+            raw.init()
+            target.parent.rmdir()
+            with self.assertRaises(DisplayError):
+                raw.show(_frame(1))
+
+    def test_failing_panel_raises_after_feeding_other_sinks(self) -> None:
+        panel = RecordingDisplay()
+        preview = RecordingDisplay()
+        display = CompositeDisplay([Sink("panel", panel), Sink("preview", preview)])
+        display.init()
+
+        def broken(image) -> None:
+            raise DisplayError("spi timeout")
+
+        panel.show = broken
+        with self.assertRaises(DisplayError):
+            display.show(_frame(1))
+        self.assertEqual(preview.shown, [_frame(1)])
+        del panel.show
+        display.init()
+        display.show(_frame(1))
+        self.assertEqual((panel.inits, preview.inits), (2, 1))
+        self.assertEqual(panel.shown, [_frame(1)])
+        self.assertEqual(preview.shown, [_frame(1)])
+
+    def test_init_fails_when_panel_fails(self) -> None:
+        display = CompositeDisplay([Sink("panel", RecordingDisplay(fail_init=1)), Sink("preview", RecordingDisplay())])
+        with self.assertRaises(DisplayError):
+            display.init()
+
+    def test_fallback_replaces_only_the_panel(self) -> None:
+        preview = RecordingDisplay()
+        display = CompositeDisplay([Sink("panel", RecordingDisplay(fail_init=1)), Sink("preview", preview)])
+        with temp_env({"ZEROTERM_EPAPER_OUTPUT": "", "ZEROTERM_EPAPER_WIDTH": "8", "ZEROTERM_EPAPER_HEIGHT": "2"}):
+            config = load_config()
+        with self.assertRaises(DisplayError):
+            display.init()
+        self.assertIs(_fallback_display(config, display), display)
+        self.assertIsInstance(display.sinks[0].display, NullDisplay)
+        display.show(_frame(1))
+        self.assertEqual(preview.inits, 1)
+        self.assertEqual(preview.shown, [_frame(1)])
+
+    def test_worker_reshows_rate_limited_frame(self) -> None:
+        panel = RecordingDisplay()
+        preview = RecordingDisplay()
+        display = CompositeDisplay([Sink("panel", panel, 0.05), Sink("preview", preview)])
+        display.init()
+        worker = DisplayWorker(display)
+        worker.start()
+        self.addCleanup(worker.stop)
+        worker.submit(_frame(1))
+        self.assertTrue(worker.wait_idle(5))
+        worker.submit(_frame(2))
+        self.assertTrue(worker.wait_idle(5))
+        self.assertEqual(panel.shown, [_frame(1), _frame(2)])
+        self.assertEqual(preview.shown, [_frame(1), _frame(2)])
+        self.assertEqual(worker.stats.dropped, 0)
+
+    def test_worker_keeps_updating_panel_when_preview_fails(self) -> None:
+        panel = RecordingDisplay()
+        preview = RecordingDisplay(fail_init=100)
+        display = CompositeDisplay([Sink("panel", panel), Sink("preview", preview)])
+        display.init()
+        worker = DisplayWorker(display)
+        worker.start()
+        self.addCleanup(worker.stop)
+        for value in range(1, 5):
+            worker.submit(_frame(value))
+            self.assertTrue(worker.wait_idle(5))
+        self.assertEqual(panel.shown, [_frame(value) for value in range(1, 5)])
+        self.assertEqual((worker.stats.shown, worker.stats.failures), (4, 0))
+
+
+class TestSinkConfig(unittest.TestCase):
+    def test_parse_sinks(self) -> None:
+        self.assertEqual(
+            parse_sinks(" file:/run/a.png , raw:/run/b.raw@60,bad, file:/x@y@5"),
+            [("file", "/run/a.png", 0.0), ("raw", "/run/b.raw", 60.0), ("file", "/x@y", 5.0)],
+        )
+        self.assertEqual(parse_sinks(None), [])
+
+    def test_create_display_fans_out(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            raw = Path(temp_dir) / "epaper.raw"
+            env = {
+                "ZEROTERM_EPAPER_DRIVER": "null",
+                "ZEROTERM_EPAPER_SINKS": f"raw:{raw}@5,pipe:/dev/null",
+                "ZEROTERM_EPAPER_MIN_INTERVAL": "30",
+            }
+            with temp_env(env):
+                display = create_display(load_config())
+            self.assertIsInstance(display, CompositeDisplay)
+            self.assertEqual([sink.min_interval for sink in display.sinks], [30.0, 5.0])
+            display.init()
+            frame = PackedFrame(display.width, display.height, bytes(display.height * ((display.width + 7) // 8)))
+            display.show(frame)
+            self.assertEqual(raw.read_bytes(), frame.data)
+        with temp_env({"ZEROTERM_EPAPER_DRIVER": "null"}):
+            self.assertNotIsInstance(create_display(load_config()), CompositeDisplay)
+
+
+if __name__ == "__main__":
+    unittest.main()
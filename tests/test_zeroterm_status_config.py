@@ -3,7 +3,7 @@ from __future__ import annotations
 import unittest
 
 from tests.helpers import temp_env
-from zeroterm_status.config import load_config
+from zeroterm_status.config import is_disabled, load_config
 
 
 class TestStatusConfig(unittest.TestCase):
@@ -21,10 +21,10 @@ class TestStatusConfig(unittest.TestCase):
                 "ZEROTERM_STATUS_WIFI_INTERVAL": "20",
                 "ZEROTERM_STATUS_SERVICE_INTERVAL": "30",
                 "ZEROTERM_STATUS_METRICS_INTERVAL": "45",
+                "ZEROTERM_STATUS_BATTERY_INTERVAL": "50",
                 "ZEROTERM_STATUS_IDLE_INTERVAL": "90",
                 "ZEROTERM_STATUS_WIFI_SSID": "0",
-                "ZEROTERM_BATTERY_LOG_PATH": "/tmp/battery.csv",
-                "ZEROTERM_BATTERY_LOG_INTERVAL": "300",
+                "ZEROTERM_STATUS_SIGNIFICANCE": "0",
                 "ZEROTERM_POWER_LOG_PATH": "/tmp/power.log",
                 "ZEROTERM_UPDATE_CHECK": "1",
                 "ZEROTERM_UPDATE_INTERVAL": "600",
@@ -46,10 +46,9 @@ class TestStatusConfig(unittest.TestCase):
         self.assertEqual(config.wifi_interval, 20)
         self.assertEqual(config.service_interval, 30)
         self.assertEqual(config.metrics_interval, 45)
+        self.assertEqual(config.battery_interval, 50)
         self.assertEqual(config.idle_interval, 90)
         self.assertFalse(config.wifi_ssid)
-        self.assertEqual(config.battery_log_path, "/tmp/battery.csv")
-        self.assertEqual(config.battery_log_interval, 300)
         self.assertEqual(config.power_log_path, "/tmp/power.log")
         self.assertTrue(config.update_check)
         self.assertEqual(config.update_interval, 600)
@@ -57,6 +56,7 @@ class TestStatusConfig(unittest.TestCase):
         self.assertEqual(config.update_remote, "origin")
         self.assertEqual(config.update_branch, "main")
         self.assertTrue(config.update_fetch)
+        self.assertFalse(config.significance)
 
     def test_clamping(self) -> None:
         with temp_env(
@@ -64,15 +64,43 @@ class TestStatusConfig(unittest.TestCase):
                 "ZEROTERM_STATUS_NIGHT_START": "44",
                 "ZEROTERM_STATUS_NIGHT_END": "-1",
                 "ZEROTERM_STATUS_LOW_BATTERY": "999",
+                "ZEROTERM_STATUS_TOP_THRESHOLD": "-5",
             }
         ):
             config = load_config()
         self.assertEqual(config.night_start, 22)
         self.assertEqual(config.night_end, 6)
         self.assertEqual(config.low_battery_threshold, 100)
+        self.assertEqual(config.top_threshold, 0)
 
     def test_profile_defaults(self) -> None:
         with temp_env({"ZEROTERM_STATUS_PROFILE": "eco"}):
             config = load_config()
         self.assertGreaterEqual(config.interval, 60)
         self.assertEqual(config.wifi_ssid, False)
+
+    def test_battery_pisugar_address(self) -> None:
+        with temp_env({"ZEROTERM_BATTERY_PISUGAR": "unix:/tmp/pisugar-server.sock"}):
+            self.assertEqual(load_config().battery_pisugar, "unix:/tmp/pisugar-server.sock")
+        with temp_env({"ZEROTERM_BATTERY_PISUGAR": "off"}):
+            self.assertEqual(load_config().battery_pisugar, "")
+        with temp_env({"ZEROTERM_BATTERY_PISUGAR": None}):
+            self.assertIsNone(load_config().battery_pisugar)
+
+    def test_history_path(self) -> None:
+        with temp_env({"ZEROTERM_STATUS_HISTORY_PATH": None}):
+            self.assertEqual(load_config().history_path, "/run/zeroterm/history.bin")
+        with temp_env({"ZEROTERM_STATUS_HISTORY_PATH": "off"}):
+            self.assertIsNone(load_config().history_path)
+
+    def test_is_disabled(self) -> None:
+        for value in ("0", " Off ", "none", "FALSE", "no"):
+            self.assertTrue(is_disabled(value), value)
+        for value in (None, "", "/run/zeroterm/history.bin", "1"):
+            self.assertFalse(is_disabled(value), value)
+
+    def test_epaper_renderer(self) -> None:
+        with temp_env({"ZEROTERM_EPAPER_RENDERER": "Bitmap"}):
+            self.assertEqual(load_config().epaper_renderer, "bitmap")
+        with temp_env({"ZEROTERM_EPAPER_RENDERER": "vector"}):
+            self.assertEqual(load_config().epaper_renderer, "auto")
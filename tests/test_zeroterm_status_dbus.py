@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from zeroterm_status import dbus
+
+
+class MockBus:
+    def __init__(self, path: str, state: str = "active") -> None:
+        self.path = path
+        self.state = state
+        self.calls: list[str] = []
+        self._serial = 100
+        self._conn: socket.socket | None = None
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen(1)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _next_serial(self) -> int:
+        self._serial += 1
+        return self._serial
+
+    def _serve(self) -> None:
+        try:
+            conn, _ = self._server.accept()
+        except OSError:
+            return
+        self._conn = conn
+        buffer = bytearray()
+        try:
+            while b"BEGIN\r\n" not in buffer:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return
+                buffer += chunk
+                if b"AUTH EXTERNAL" in buffer and b"OK" not in buffer:
+                    conn.sendall(b"OK 0123456789abcdef\r\n")
+                    buffer += b"OK"
+            del buffer[: buffer.index(b"BEGIN\r\n") + 7]
+            while True:
+                parsed = dbus.parse_message(buffer)
+                if parsed is None:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        return
+                    buffer += chunk
+                    continue
+                message, consumed = parsed
+                del buffer[:consumed]
+                self._reply(conn, message)
+        except OSError:
+            return
+
+    def _reply(self, conn: socket.socket, message: dbus.Message) -> None:
+        self.calls.append(message.member or "")
+        fields = {dbus.FIELD_REPLY_SERIAL: message.serial}
+        signature = ""
+        body: list[object] = []
+        if message.member == "Hello":
+            signature, body = "s", [":1.42"]
+        elif message.member == "Get":
+            signature, body = "v", [("s", self.state)]
+        conn.sendall(
+            dbus.build_message(dbus.MESSAGE_METHOD_RETURN, self._next_serial(), fields, signature, body)
+        )
+
+    def emit_active_state(self, unit_path: str, state: str) -> None:
+        self.state = state
+        fields = {
+            dbus.FIELD_PATH: unit_path,
+            dbus.FIELD_INTERFACE: dbus.PROPERTIES_IFACE,
+            dbus.FIELD_MEMBER: "PropertiesChanged",
+            dbus.FIELD_SENDER: ":1.1",
+        }
+        body = [dbus.SYSTEMD_UNIT_IFACE, {"ActiveState": ("s", state), "SubState": ("s", "dead")}, []]
+        assert self._conn is not None
+        self._conn.sendall(
+            dbus.build_message(dbus.MESSAGE_SIGNAL, self._next_serial(), fields, "sa{sv}as", body)
+        )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        self._server.close()
+
+
+class TestDBusMarshalling(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        body = ["unit", {"ActiveState": ("s", "active"), "NRestarts": ("u", 3)}, ["Result"]]
+        data = dbus.build_message(dbus.MESSAGE_SIGNAL, 7, {dbus.FIELD_PATH: "/a/b"}, "sa{sv}as", body)
+        parsed = dbus.parse_message(data)
+        self.assertIsNotNone(parsed)
+        message, consumed = parsed
+        self.assertEqual(consumed, len(data))
+        self.assertEqual(message.serial, 7)
+        self.assertEqual(message.path, "/a/b")
+        self.assertEqual(message.body, ["unit", {"ActiveState": "active", "NRestarts": 3}, ["Result"]])
+
+    def test_incomplete_message(self) -> None:
+        data = dbus.build_message(dbus.MESSAGE_METHOD_CALL, 1, {dbus.FIELD_MEMBER: "Hello"}, "s", ["x"])
+        self.assertIsNone(dbus.parse_message(data[:-1]))
+
+    def test_unit_object_path(self) -> None:
+        self.assertEqual(
+            dbus.unit_object_path("zeroterm-status.service"),
+            "/org/freedesktop/systemd1/unit/zeroterm_2dstatus_2eservice",
+        )
+
+
+class TestServiceWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._temp.name, "bus.sock")
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def test_signal_updates_state(self) -> None:
+        bus = MockBus(self.path, state="active")
+        changed = threading.Event()
+        watcher = dbus.ServiceWatcher("zeroterm.service", on_change=changed.set, address=self.path)
+        try:
+            self.assertTrue(watcher.start())
+            self.assertEqual(watcher.state, "active")
+            self.assertEqual(bus.calls, ["Hello", "Subscribe", "AddMatch", "Get"])
+            changed.clear()
+            bus.emit_active_state(watcher.path, "failed")
+            self.assertTrue(changed.wait(2))
+            self.assertEqual(watcher.state, "failed")
+        finally:
+            watcher.stop()
+            bus.close()
+
+    def test_start_fails_without_bus(self) -> None:
+        watcher = dbus.ServiceWatcher("zeroterm.service", address=self.path)
+        self.assertFalse(watcher.start())
+        self.assertFalse(watcher.ready)
+
+    def test_read_service_state_uses_watcher(self) -> None:
+        from zeroterm_status import metrics
+
+        watcher = mock.Mock(ready=True, state="inactive")
+        with mock.patch.dict(metrics._SERVICE_WATCHERS, {"zeroterm.service": watcher}), mock.patch(
+            "zeroterm_status.metrics._run_command"
+        ) as run_command:
+            info = metrics.read_service_state("zeroterm")
+        run_command.assert_not_called()
+        self.assertEqual(info.state, "inactive")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import unittest
+
+from zeroterm_status import discharge, main
+
+
+class TestDischargeModel(unittest.TestCase):
+    def test_time_to_empty(self) -> None:
+        model = discharge.DischargeModel()
+        for minute in range(0, 31, 5):
+            model.add(minute * 60, 80 - minute // 5, "Discharging")
+        estimate = model.estimate()
+        self.assertAlmostEqual(estimate.rate_per_hour, -12.0)
+        self.assertEqual(estimate.time_to_empty, 74 * 300)
+        self.assertIsNone(estimate.time_to_full)
+
+    def test_time_to_full(self) -> None:
+        model = discharge.DischargeModel()
+        for minute in range(0, 21, 10):
+            model.add(minute * 60, 50 + minute, "Charging")
+        estimate = model.estimate()
+        self.assertEqual(estimate.time_to_full, 30 * 60)
+        self.assertIsNone(estimate.time_to_empty)
+
+    def test_status_change_resets(self) -> None:
+        model = discharge.DischargeModel(min_span=60)
+        for second in range(0, 300, 60):
+            model.add(second, 90 - second // 60, "Discharging")
+        self.assertIsNotNone(model.rate())
+        model.add(300, 86, "Charging")
+        self.assertIsNone(model.rate())
+
+    def test_needs_span(self) -> None:
+        model = discharge.DischargeModel(min_span=600)
+        for second in range(0, 300, 60):
+            model.add(second, 90, "Discharging")
+        self.assertIsNone(model.estimate().rate_per_hour)
+
+    def test_interval_scale(self) -> None:
+        self.assertEqual(discharge.interval_scale(None, 4 * 3600, 3), 1.0)
+        self.assertEqual(discharge.interval_scale(8 * 3600, 4 * 3600, 3), 1.0)
+        self.assertEqual(discharge.interval_scale(2 * 3600, 4 * 3600, 3), 2.0)
+        self.assertEqual(discharge.interval_scale(600, 4 * 3600, 3), 3)
+        self.assertEqual(discharge.interval_scale(600, 4 * 3600, 1), 1.0)
+
+    def test_power_text(self) -> None:
+        self.assertEqual(discharge.format_duration(3 * 3600 + 27 * 60), "3h20")
+        self.assertEqual(discharge.format_duration(45 * 60), "45m")
+        estimate = discharge.Estimate(rate_per_hour=-10.0, time_to_empty=5400, time_to_full=None)
+        self.assertEqual(main._format_power_text("DIS", estimate), "DIS 1h30")
+        empty = discharge.Estimate(rate_per_hour=None, time_to_empty=None, time_to_full=None)
+        self.assertEqual(main._format_power_text("CHG", empty), "CHG")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from zeroterm_status import framebuffer
+from zeroterm_status.framebuffer import PackedFrame, pack_bytes, pack_image
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - exercised when Pillow is missing
+    Image = None
+
+
+def _noise(width: int, height: int):
+    rng = random.Random(width * 1000 + height)
+    image = Image.new("1", (width, height), 255)
+    for _ in range(width * height // 4):
+        image.putpixel((rng.randrange(width), rng.randrange(height)), 0)
+    return image
+
+
+@unittest.skipIf(Image is None, "Pillow not available")
+class TestPackedTransforms(unittest.TestCase):
+    def test_rotate_matches_pil(self) -> None:
+        for width, height in ((8, 8), (250, 122), (122, 250), (13, 21)):
+            image = _noise(width, height)
+            data = image.tobytes()
+            for angle in (90, 180, 270):
+                with self.subTest(size=(width, height), angle=angle):
+                    rotated, out_w, out_h = framebuffer.rotate(data, width, height, angle)
+                    expected = image.rotate(angle, expand=True)
+                    self.assertEqual((out_w, out_h), expected.size)
+                    self.assertEqual(rotated, expected.tobytes())
+
+    def test_round_trip(self) -> None:
+        image = _noise(122, 250)
+        frame = PackedFrame.from_image(image)
+        self.assertEqual(frame.stride, 16)
+        self.assertEqual(len(frame.data), 16 * 250)
+        self.assertEqual(frame.to_image().tobytes(), image.tobytes())
+
+    def test_pack_to_panel_orientation(self) -> None:
+        image = _noise(250, 122)
+        frame = pack_image(image, 0, panel_size=(122, 250))
+        self.assertEqual(frame.size, (122, 250))
+        self.assertEqual(frame, pack_bytes(image.tobytes(), 250, 122, 0, panel_size=(122, 250)))
+        self.assertEqual(pack_image(image, 180), PackedFrame.from_image(image.rotate(180)))
+
+
+if __name__ == "__main__":
+    unittest.main()
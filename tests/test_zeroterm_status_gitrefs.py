@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+from unittest import mock
+
+from zeroterm_status import gitrefs, metrics
+
+HEAD_SHA = "a" * 40
+REMOTE_SHA = "b" * 40
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+def _write_commit(root: Path, message: str, *parents: str) -> str:
+    body = f"tree {EMPTY_TREE}\n" + "".join(f"parent {parent}\n" for parent in parents) + f"\n{message}\n"
+    data = f"commit {len(body)}\0{body}".encode("utf-8")
+    object_id = hashlib.sha1(data).hexdigest()
+    path = root / ".git" / "objects" / object_id[:2] / object_id[2:]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(zlib.compress(data))
+    return object_id
+
+
+def _make_repo(root: Path, remote_sha: str, packed: bool, head_sha: str = HEAD_SHA) -> Path:
+    git_dir = root / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    (git_dir / "refs" / "heads" / "main").write_text(f"{head_sha}\n", encoding="utf-8")
+    if packed:
+        (git_dir / "packed-refs").write_text(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            f"{remote_sha} refs/remotes/origin/main\n"
+            f"^{'c' * 40}\n",
+            encoding="utf-8",
+        )
+    else:
+        remote_dir = git_dir / "refs" / "remotes" / "origin"
+        remote_dir.mkdir(parents=True)
+        (remote_dir / "main").write_text(f"{remote_sha}\n", encoding="utf-8")
+    return git_dir
+
+
+class TestGitRefs(unittest.TestCase):
+    def test_loose_refs(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            head = _write_commit(root, "base")
+            _make_repo(root, _write_commit(root, "next", head), packed=False, head_sha=head)
+            self.assertTrue(gitrefs.behind_upstream(temp_dir, "origin", "main"))
+
+    def test_packed_refs(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _make_repo(Path(temp_dir), HEAD_SHA, packed=True)
+            self.assertFalse(gitrefs.behind_upstream(temp_dir, "origin", "main"))
+
+    def test_gitdir_file(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            head = _write_commit(root / "store", "base")
+            _make_repo(root / "store", _write_commit(root / "store", "next", head), packed=True, head_sha=head)
+            checkout = root / "checkout"
+            checkout.mkdir()
+            (checkout / ".git").write_text("gitdir: ../store/.git\n", encoding="utf-8")
+            self.assertTrue(gitrefs.behind_upstream(checkout, "origin", "main"))
+
+    def test_missing_remote(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _make_repo(Path(temp_dir), REMOTE_SHA, packed=False)
+            self.assertIsNone(gitrefs.behind_upstream(temp_dir, "upstream", "main"))
+
+    def test_local_commits_ahead_are_not_an_update(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            remote = _write_commit(root, "base")
+            head = _write_commit(root, "local 2", _write_commit(root, "local 1", remote))
+            _make_repo(root, remote, packed=False, head_sha=head)
+            self.assertFalse(gitrefs.behind_upstream(temp_dir, "origin", "main"))
+
+    def test_diverged_branch_is_an_update(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            base = _write_commit(root, "base")
+            local = _write_commit(root, "local", base)
+            _make_repo(root, _write_commit(root, "remote", base), packed=False, head_sha=local)
+            self.assertTrue(gitrefs.behind_upstream(temp_dir, "origin", "main"))
+
+    def test_packed_commits_leave_it_to_git(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _make_repo(Path(temp_dir), REMOTE_SHA, packed=False)
+            self.assertIsNone(gitrefs.behind_upstream(temp_dir, "origin", "main"))
+
+    def test_update_check_does_not_spawn_git(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            head = _write_commit(root, "base")
+            _make_repo(root, _write_commit(root, "next", head), packed=False, head_sha=head)
+            with mock.patch("zeroterm_status.metrics._run_command") as run_command, mock.patch(
+                "zeroterm_status.metrics.subprocess.run"
+            ) as run:
+                self.assertTrue(metrics.read_update_available(temp_dir, "origin", "main", fetch=False))
+        run_command.assert_not_called()
+        run.assert_not_called()
+
+    def test_fetch_runs_in_background(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _make_repo(Path(temp_dir), HEAD_SHA, packed=False)
+            with mock.patch("zeroterm_status.metrics._start_fetch") as start_fetch:
+                self.assertFalse(metrics.read_update_available(temp_dir, "origin", "main", fetch=True))
+        start_fetch.assert_called_once_with(temp_dir, "origin")
+
+    def test_rev_list_fallback_is_rate_limited(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _make_repo(Path(temp_dir), REMOTE_SHA, packed=False)
+            with mock.patch("zeroterm_status.metrics.shutil.which", return_value="/bin/git"), mock.patch(
+                "zeroterm_status.metrics._run_command", return_value="1"
+            ) as run_command:
+                for _ in range(3):
+                    self.assertTrue(
+                        metrics.read_update_available(temp_dir, "upstream", "main", False, fallback_interval=3600)
+                    )
+        run_command.assert_called_once()
+
+    def test_update_fetch_only_fetches(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch("zeroterm_status.metrics._start_fetch", return_value=True) as start_fetch, mock.patch(
+                "zeroterm_status.metrics.behind_upstream"
+            ) as differ:
+                self.assertTrue(metrics.start_update_fetch(temp_dir, "origin"))
+        start_fetch.assert_called_once_with(temp_dir, "origin")
+        differ.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
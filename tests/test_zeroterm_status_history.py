@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from zeroterm_status.history import MetricRing, MetricsHistory
+
+
+class TestMetricRing(unittest.TestCase):
+    def test_downsamples_into_buckets(self) -> None:
+        ring = MetricRing(10, 6)
+        for offset, value in ((0, 50.0), (3, 70.0), (9, 60.0), (12, 40.0)):
+            ring.add(1000 + offset, value)
+        self.assertEqual(ring.series(), [(1000, 50.0, 70.0, 60.0), (1010, 40.0, 40.0, 40.0)])
+
+    def test_wraps_and_skips_gaps(self) -> None:
+        ring = MetricRing(10, 4)
+        for step in range(6):
+            ring.add(step * 10, float(step))
+        ring.add(100, 9.0)
+        self.assertEqual([point[0] for point in ring.series()], [100])
+        ring.add(5, 1.0)
+        self.assertEqual(len(ring.series()), 1)
+
+    def test_window(self) -> None:
+        ring = MetricRing(10, 10)
+        for step in range(10):
+            ring.add(step * 10, float(step))
+        self.assertEqual(ring.window(50, 90), (5.0, 9.0, 7.0))
+        self.assertIsNone(MetricRing(10, 10).window())
+
+
+class TestMetricsHistory(unittest.TestCase):
+    def test_multi_resolution_and_round_trip(self) -> None:
+        history = MetricsHistory(resolutions=((10, 6), (60, 10)))
+        for step in range(12):
+            history.record(600 + step * 10, {"battery": 90 - step, "cpu": None, "unknown": 5})
+        self.assertEqual(len(history.series("battery", 10)), 6)
+        self.assertEqual(len(history.series("battery", 60)), 2)
+        self.assertEqual(history.series("cpu", 10), [])
+        self.assertEqual(history.window("battery", 30, 720), (79.0, 81.0, 80.0))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "run", "history.bin")
+            history.save(path)
+            loaded = MetricsHistory.load(path)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.metrics, history.metrics)
+        self.assertEqual(loaded.resolutions, [10, 60])
+        self.assertEqual(loaded.series("battery", 60), history.series("battery", 60))
+
+    def test_merge_keeps_metrics_added_since_snapshot(self) -> None:
+        old = MetricsHistory(metrics=("battery", "retired"), resolutions=((10, 6), (60, 10)))
+        old.record(600, {"battery": 80, "retired": 1})
+        snapshot = MetricsHistory.from_bytes(old.to_bytes())
+        history = MetricsHistory(metrics=("battery", "wifi_pps"), resolutions=((10, 6), (60, 10)))
+        history.merge(snapshot)
+        self.assertEqual(history.metrics, ["battery", "wifi_pps"])
+        self.assertEqual(history.series("battery", 10), [(600, 80.0, 80.0, 80.0)])
+        history.record(610, {"wifi_pps": 12.5})
+        self.assertEqual(history.series("wifi_pps", 10), [(610, 12.5, 12.5, 12.5)])
+
+    def test_load_rejects_garbage(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "history.bin")
+            with open(path, "wb") as handle:
+                handle.write(b"nope")
+            self.assertIsNone(MetricsHistory.load(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import unittest
+
+from zeroterm_status import layout
+from zeroterm_status.layout import Field, PanelLayout, column, compile_layout, flex, px, row, select_panel, share, text
+from zeroterm_status.statusview import status_text
+
+
+def _height(size: int) -> int:
+    return size - 2
+
+
+class TestCompileLayout(unittest.TestCase):
+    def test_sizes_resolve_along_axis(self) -> None:
+        root = column(
+            (text("body", pad=2), Field("title", "body")),
+            (flex(), row((flex(min=40), Field("left", "body")), (share(0.4, min=30), Field("right", "body")), gap=4)),
+            (px(10), Field("footer", "body")),
+            gap=1,
+            rules=True,
+            border=True,
+        )
+        panel = PanelLayout("test", (100, 60), (("body", 0, 8),), root)
+        compiled = compile_layout(panel, 100, 60, 12, _height)
+        self.assertEqual(compiled.fonts, {"body": 12})
+        self.assertEqual(compiled.slots["title"].box, (0, 0, 100, 12))
+        self.assertEqual(compiled.slots["left"].box, (0, 13, 58, 49))
+        self.assertEqual(compiled.slots["right"].box, (62, 13, 100, 49))
+        self.assertEqual(compiled.slots["footer"].box, (0, 50, 100, 60))
+        kinds = [(static.kind, static.box) for static in compiled.statics]
+        self.assertEqual(kinds, [("rect", (0, 0, 99, 59)), ("line", (0, 12, 99, 12)), ("line", (0, 49, 99, 49))])
+
+    def test_flexible_minimum_takes_from_ratio(self) -> None:
+        sizes = [layout.flex(min=80), layout.share(0.5, min=20)]
+        self.assertEqual(layout._resolve(sizes, 120, {}), [80, 40])
+
+    def test_builtin_panels_fit_their_canvas(self) -> None:
+        for panel in layout.PANELS.values():
+            width, height = panel.size
+            for font_size in (12, 14, 18):
+                with self.subTest(panel=panel.name, font_size=font_size):
+                    compiled = compile_layout(panel, width, height, font_size, _height)
+                    for name in ("ip", "bat", "message", "face", "battery", "battery_bar", "lines", "metrics", "load"):
+                        self.assertIn(name, compiled.slots)
+                    for slot in compiled.slots.values():
+                        x0, y0, x1, y1 = slot.box
+                        self.assertTrue(0 <= x0 <= x1 <= width and 0 <= y0 <= y1 <= height, slot)
+                    self.assertGreaterEqual(compiled.slots["lines"].capacity, 3)
+
+    def test_select_panel(self) -> None:
+        self.assertEqual(select_panel(None, 250, 122).name, "2in13")
+        self.assertEqual(select_panel(None, 296, 128).name, "2in9")
+        self.assertEqual(select_panel("1in54", 250, 122).name, "1in54")
+        self.assertEqual(select_panel(None, 128, 296).name, "2in13_portrait")
+        self.assertEqual(select_panel("bogus", 400, 300).name, "2in7")
+
+
+class TestVisibleLines(unittest.TestCase):
+    def test_low_priority_lines_drop_first(self) -> None:
+        text = status_text(
+            status="RUNNING",
+            ip="10.0.0.5",
+            wifi="UP LAB",
+            battery="",
+            adapter="wlan1",
+            power="DIS 2h",
+            alert="LOW",
+            temp="40C",
+            load="0.1",
+            uptime="1h",
+            mem="10%",
+            cpu="5%",
+            battery_percent=40,
+            updated=None,
+            wifi_channel="6",
+            top="python 90%",
+        )
+        self.assertEqual(len(text.lines), 8)
+        self.assertEqual(text.visible_lines(8), text.lines)
+        self.assertEqual(
+            text.visible_lines(4),
+            ("SSID LAB", "PWR DIS 2h", "ALRT LOW", "TOP python 90%"),
+        )
+        self.assertEqual(text.visible_lines(0), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
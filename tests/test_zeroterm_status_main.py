@@ -5,6 +5,7 @@ from unittest import mock
 from datetime import datetime as real_datetime
 
 from zeroterm_status import main
+from zeroterm_status.procfs import ProcessUsage
 
 
 class FixedLateNight:
@@ -44,3 +45,28 @@ class TestStatusMainHelpers(unittest.TestCase):
         self.assertEqual(main._format_power_state("Discharging"), "DIS")
         self.assertEqual(main._format_power_state("Full"), "FULL")
         self.assertEqual(main._format_power_state("Unknown"), "UNK")
+
+    def test_format_top_text(self) -> None:
+        system = main.SystemInfo(
+            uptime=None,
+            load=None,
+            temp=None,
+            mem_percent=None,
+            cpu_percent=None,
+            top_processes=(ProcessUsage(pid=42, name="airodump-ng", percent=97.4),),
+        )
+        self.assertEqual(main._format_top_text(system, 50), "airodump-ng 97%")
+        self.assertIsNone(main._format_top_text(system, 98))
+        self.assertIsNone(main._format_top_text(system, 0))
+
+    def test_interface_change_keeps_last_wifi_until_reread(self) -> None:
+        wifi = main.WifiInfo(iface="wlan0", state="up", ssid="lab", ip="10.0.0.2", mode=None, channel="6", packets=None)
+        scheduler = mock.Mock()
+        scheduler.value.return_value = wifi
+        self.assertIs(main._current_wifi(scheduler, "wlan1"), wifi)
+        scheduler.trigger.assert_called_once_with("wifi")
+        scheduler.reset_mock()
+        self.assertIs(main._current_wifi(scheduler, "wlan0"), wifi)
+        scheduler.trigger.assert_not_called()
+        scheduler.value.return_value = None
+        self.assertEqual(main._current_wifi(scheduler, "wlan1"), main._empty_wifi("wlan1"))
@@ -5,7 +5,7 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
-from zeroterm_status import metrics
+from zeroterm_status import metrics, procfs
 
 
 class TestMetricsHelpers(unittest.TestCase):
@@ -15,9 +15,10 @@ class TestMetricsHelpers(unittest.TestCase):
         self.assertIsNone(metrics._parse_percent("nope"))
         self.assertIsNone(metrics._parse_percent("999"))
 
-    def test_parse_kib(self) -> None:
-        self.assertEqual(metrics._parse_kib("MemTotal: 12345 kB"), 12345)
-        self.assertIsNone(metrics._parse_kib("MemTotal:"))
+    def test_parse_field_kib(self) -> None:
+        buf = bytearray(b"MemTotal: 12345 kB\nMemFree:\n")
+        self.assertEqual(procfs.parse_field_kib(buf, len(buf), b"MemTotal:"), 12345)
+        self.assertIsNone(procfs.parse_field_kib(buf, len(buf), b"\nMemFree:"))
 
     def test_parse_temp_value(self) -> None:
         self.assertEqual(metrics._parse_temp_value("42000"), "42C")
@@ -40,6 +41,69 @@ class TestMetricsHelpers(unittest.TestCase):
         self.assertEqual(info.percent, 55)
         self.assertEqual(info.status, "Charging")
 
+    def test_battery_source_fuses_supplies(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            for name, capacity, status, energy in (
+                ("BAT0", "80", "Full", "3000"),
+                ("BAT1", "20", "Discharging", "1000"),
+            ):
+                entry = root / name
+                entry.mkdir()
+                (entry / "capacity").write_text(f"{capacity}\n", encoding="utf-8")
+                (entry / "status").write_text(f"{status}\n", encoding="utf-8")
+                (entry / "energy_full").write_text(f"{energy}\n", encoding="utf-8")
+            (root / "AC").mkdir()
+            (root / "AC" / "capacity").write_text("0\n", encoding="utf-8")
+            (root / "AC" / "type").write_text("Mains\n", encoding="utf-8")
+            source = metrics.BatterySource(temp_dir, None)
+            info = source.read()
+            source.close()
+        self.assertEqual(info.percent, 65)
+        self.assertEqual(info.status, "Discharging")
+
+    def test_battery_source_rediscovers_on_hotplug(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            first = root / "BAT0"
+            first.mkdir()
+            (first / "capacity").write_text("40\n", encoding="utf-8")
+            source = metrics.BatterySource(temp_dir, None)
+            self.assertEqual(source.read().percent, 40)
+            (first / "capacity").unlink()
+            first.rmdir()
+            second = root / "BAT1"
+            second.mkdir()
+            (second / "capacity").write_text("90\n", encoding="utf-8")
+            self.assertEqual(source.read().percent, 40)
+            source._supplies[0].capacity.close()
+            self.assertEqual(source.read().percent, 90)
+            source.close()
+
+    def test_battery_source_lists_supplies_at_most_every_rescan(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            battery = Path(temp_dir) / "BAT0"
+            battery.mkdir()
+            (battery / "capacity").write_text("40\n", encoding="utf-8")
+            source = metrics.BatterySource(temp_dir, None)
+            with mock.patch("zeroterm_status.metrics.time.monotonic", return_value=1000.0):
+                source.read()
+            with mock.patch("zeroterm_status.metrics.os.listdir", wraps=metrics.os.listdir) as listdir:
+                for now in (1011.0, 1012.0, 1015.0, 1022.0):
+                    with mock.patch("zeroterm_status.metrics.time.monotonic", return_value=now):
+                        self.assertEqual(source.read().percent, 40)
+            source.close()
+        self.assertEqual(listdir.call_count, 2)
+
+    def test_battery_source_resolves_command_once(self) -> None:
+        source = metrics.BatterySource(None, "pisugar-power -c")
+        with mock.patch("zeroterm_status.metrics.shutil.which", return_value="/usr/bin/pisugar-power") as which:
+            with mock.patch("zeroterm_status.metrics._run_command", return_value="battery: 77"):
+                source.read()
+                info = source.read()
+        self.assertEqual(which.call_count, 1)
+        self.assertEqual(info.percent, 77)
+
     def test_read_battery_cmd_missing(self) -> None:
         info = metrics.read_battery(None, "missing-command --foo")
         self.assertIsNone(info.percent)
@@ -64,7 +128,9 @@ class TestMetricsHelpers(unittest.TestCase):
         self.assertEqual(info.state, "missing")
 
     def test_read_wifi_with_data(self) -> None:
-        with mock.patch("zeroterm_status.metrics._iface_exists", return_value=True):
+        with mock.patch("zeroterm_status.metrics._iface_exists", return_value=True), mock.patch(
+            "zeroterm_status.metrics._read_nl80211", return_value=None
+        ):
             with mock.patch("zeroterm_status.metrics._read_operstate", return_value="up"):
                 with mock.patch("zeroterm_status.metrics._read_ssid", return_value="TEST"):
                     with mock.patch("zeroterm_status.metrics.get_ip_address", return_value="10.0.0.5"):
@@ -75,6 +141,9 @@ class TestMetricsHelpers(unittest.TestCase):
                             with mock.patch(
                                 "zeroterm_status.metrics._read_packet_count",
                                 return_value=1234,
+                            ), mock.patch(
+                                "zeroterm_status.metrics._read_net_rates",
+                                return_value=metrics.NetRates(rx_pps=2.0, tx_pps=1.5, rx_bps=800.0, tx_bps=400.0),
                             ):
                                 info = metrics.read_wifi("wlan0")
         self.assertEqual(info.state, "up")
@@ -83,17 +152,52 @@ class TestMetricsHelpers(unittest.TestCase):
         self.assertEqual(info.mode, "managed")
         self.assertEqual(info.channel, "11")
         self.assertEqual(info.packets, 1234)
+        self.assertEqual(info.packet_rate, 3.5)
+        self.assertEqual(info.bit_rate, 1200)
+
+    def test_read_wifi_prefers_nl80211(self) -> None:
+        wireless = metrics.WirelessInfo(
+            iface="wlan0",
+            mode="monitor",
+            frequency=2462,
+            channel="11",
+            ssid=None,
+        )
+        with mock.patch("zeroterm_status.metrics._iface_exists", return_value=True), mock.patch(
+            "zeroterm_status.metrics._read_nl80211", return_value=wireless
+        ), mock.patch("zeroterm_status.metrics._run_command") as run_command:
+            info = metrics.read_wifi("wlan0")
+        run_command.assert_not_called()
+        self.assertEqual(info.mode, "monitor")
+        self.assertEqual(info.channel, "11")
+
+    def test_read_wifi_mode_channel_fallback(self) -> None:
+        output = "Interface wlan0\n\ttype managed\n\tchannel 6 (2437 MHz), width: 20 MHz"
+        with mock.patch("zeroterm_status.metrics.shutil.which", return_value="/sbin/iw"):
+            with mock.patch("zeroterm_status.metrics._run_command", return_value=output):
+                self.assertEqual(metrics._read_wifi_mode_channel("wlan0"), ("managed", "6"))
 
     def test_read_time_sync_yes(self) -> None:
-        with mock.patch("zeroterm_status.metrics.shutil.which", return_value="/bin/timedatectl"):
+        with mock.patch("zeroterm_status.metrics._read_adjtimex_sync", return_value=None), mock.patch(
+            "zeroterm_status.metrics.shutil.which", return_value="/bin/timedatectl"
+        ):
             with mock.patch("zeroterm_status.metrics._run_command", return_value="yes"):
                 self.assertTrue(metrics.read_time_sync())
 
     def test_read_time_sync_no(self) -> None:
-        with mock.patch("zeroterm_status.metrics.shutil.which", return_value="/bin/timedatectl"):
+        with mock.patch("zeroterm_status.metrics._read_adjtimex_sync", return_value=None), mock.patch(
+            "zeroterm_status.metrics.shutil.which", return_value="/bin/timedatectl"
+        ):
             with mock.patch("zeroterm_status.metrics._run_command", return_value="no"):
                 self.assertFalse(metrics.read_time_sync())
 
+    def test_read_time_sync_prefers_adjtimex(self) -> None:
+        with mock.patch("zeroterm_status.metrics._read_adjtimex_sync", return_value=False), mock.patch(
+            "zeroterm_status.metrics._run_command"
+        ) as run_command:
+            self.assertFalse(metrics.read_time_sync())
+        run_command.assert_not_called()
+
     def test_read_update_available(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
             with mock.patch("zeroterm_status.metrics.shutil.which", return_value="/bin/git"):
@@ -101,3 +205,24 @@ class TestMetricsHelpers(unittest.TestCase):
                     self.assertTrue(
                         metrics.read_update_available(temp_dir, "origin", "main", fetch=False)
                     )
+
+
+class TestCpuSampling(unittest.TestCase):
+    def test_consumers_keep_independent_baselines(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stat = Path(temp_dir) / "stat"
+            stat.write_text("cpu  100 0 0 900 0\ncpu0 100 0 0 900 0\n", encoding="utf-8")
+            samplers = {
+                name: procfs.CpuSampler(temp_dir) for name in ("status", "api")
+            }
+            with mock.patch.dict(metrics._CPU_SAMPLERS, samplers, clear=True):
+                self.assertIsNone(metrics.read_cpu_percent("status"))
+                stat.write_text("cpu  150 0 0 950 0\ncpu0 150 0 0 950 0\n", encoding="utf-8")
+                self.assertIsNone(metrics.read_cpu_percent("api"))
+                self.assertEqual(metrics.read_cpu_percent("status"), 50)
+                stat.write_text("cpu  250 0 0 950 0\ncpu0 250 0 0 950 0\n", encoding="utf-8")
+                usage = metrics.read_cpu_usage("api")
+            for sampler in samplers.values():
+                sampler.close()
+        self.assertEqual(usage.percent, 100)
+        self.assertEqual(usage.cores, (100,))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import struct
+import unittest
+from unittest import mock
+
+from zeroterm_status import netlink, nl80211
+
+_FAMILY_ID = 0x1C
+
+
+def _genl(cmd: int, attrs: bytes) -> bytes:
+    return struct.pack("=BBH", cmd, 1, 0) + attrs
+
+
+class FakeGenlSocket:
+    def __init__(self, iface_attrs: bytes, scan_attrs: list[bytes] | None = None) -> None:
+        self.iface_attrs = iface_attrs
+        self.scan_attrs = scan_attrs or []
+        self.sent: list[tuple[int, int]] = []
+        self._pending: list[bytes] = []
+
+    def send(self, data: bytes) -> int:
+        msg_type, flags, seq, body = next(netlink.iter_messages(data))
+        cmd = body[0]
+        self.sent.append((msg_type, cmd))
+        ack = netlink.pack_message(netlink.NLMSG_ERROR, 0, seq, struct.pack("=i", 0) + data[:16])
+        if msg_type == nl80211.GENL_ID_CTRL:
+            reply = _genl(1, netlink.pack_attr(nl80211.CTRL_ATTR_FAMILY_ID, struct.pack("=H", _FAMILY_ID)))
+            self._pending.append(netlink.pack_message(nl80211.GENL_ID_CTRL, 0, seq, reply) + ack)
+        elif cmd == nl80211.NL80211_CMD_GET_INTERFACE:
+            reply = _genl(7, self.iface_attrs)
+            self._pending.append(netlink.pack_message(_FAMILY_ID, 0, seq, reply) + ack)
+        elif cmd == nl80211.NL80211_CMD_GET_SCAN:
+            chunk = b"".join(
+                netlink.pack_message(_FAMILY_ID, netlink.NLM_F_MULTI, seq, _genl(34, attrs))
+                for attrs in self.scan_attrs
+            )
+            done = netlink.pack_message(netlink.NLMSG_DONE, netlink.NLM_F_MULTI, seq, struct.pack("=i", 0))
+            self._pending.append(chunk + done)
+        return len(data)
+
+    def recv(self, size: int) -> bytes:
+        return self._pending.pop(0)
+
+    def close(self) -> None:
+        return None
+
+
+class TestNl80211(unittest.TestCase):
+    def test_frequency_to_channel(self) -> None:
+        self.assertEqual(nl80211.frequency_to_channel(2412), 1)
+        self.assertEqual(nl80211.frequency_to_channel(2484), 14)
+        self.assertEqual(nl80211.frequency_to_channel(5180), 36)
+        self.assertEqual(nl80211.frequency_to_channel(5955), 1)
+        self.assertIsNone(nl80211.frequency_to_channel(None))
+
+    def test_interface_info_with_ssid(self) -> None:
+        attrs = (
+            netlink.pack_attr_str(nl80211.NL80211_ATTR_IFNAME, "wlan0")
+            + netlink.pack_attr_u32(nl80211.NL80211_ATTR_IFTYPE, 2)
+            + netlink.pack_attr_u32(nl80211.NL80211_ATTR_WIPHY_FREQ, 2437)
+            + netlink.pack_attr(nl80211.NL80211_ATTR_SSID, b"ZEROTERM")
+        )
+        sock = FakeGenlSocket(attrs)
+        client = nl80211.Nl80211Client(sock=sock)
+        with mock.patch("zeroterm_status.nl80211.socket.if_nametoindex", return_value=3):
+            info = client.interface_info("wlan0")
+            client.interface_info("wlan0")
+        self.assertIsNotNone(info)
+        self.assertEqual(info.mode, "managed")
+        self.assertEqual(info.channel, "6")
+        self.assertEqual(info.ssid, "ZEROTERM")
+        self.assertEqual([entry[0] for entry in sock.sent].count(nl80211.GENL_ID_CTRL), 1)
+
+    def test_interface_info_ssid_from_scan(self) -> None:
+        attrs = netlink.pack_attr_u32(nl80211.NL80211_ATTR_IFTYPE, 2)
+        ies = bytes([0, 4]) + b"LAB5" + bytes([1, 1, 0x82])
+        bss = (
+            netlink.pack_attr_u32(nl80211.NL80211_BSS_FREQUENCY, 5180)
+            + netlink.pack_attr(nl80211.NL80211_BSS_INFORMATION_ELEMENTS, ies)
+            + netlink.pack_attr_u32(nl80211.NL80211_BSS_STATUS, nl80211.NL80211_BSS_STATUS_ASSOCIATED)
+        )
+        scan = [netlink.pack_attr(nl80211.NL80211_ATTR_BSS, bss)]
+        client = nl80211.Nl80211Client(sock=FakeGenlSocket(attrs, scan))
+        with mock.patch("zeroterm_status.nl80211.socket.if_nametoindex", return_value=3):
+            info = client.interface_info("wlan0")
+        self.assertEqual(info.ssid, "LAB5")
+        self.assertEqual(info.channel, "36")
+
+    def test_monitor_skips_scan(self) -> None:
+        attrs = netlink.pack_attr_u32(nl80211.NL80211_ATTR_IFTYPE, 6)
+        sock = FakeGenlSocket(attrs)
+        client = nl80211.Nl80211Client(sock=sock)
+        with mock.patch("zeroterm_status.nl80211.socket.if_nametoindex", return_value=4):
+            info = client.interface_info("wlan1")
+        self.assertEqual(info.mode, "monitor")
+        self.assertIsNone(info.ssid)
+        self.assertNotIn((_FAMILY_ID, nl80211.NL80211_CMD_GET_SCAN), sock.sent)
+
+    def test_unknown_iface(self) -> None:
+        client = nl80211.Nl80211Client(sock=FakeGenlSocket(b""))
+        with mock.patch("zeroterm_status.nl80211.socket.if_nametoindex", side_effect=OSError):
+            self.assertIsNone(client.interface_info("wlan9"))
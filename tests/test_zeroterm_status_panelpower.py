@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import unittest
+
+from tests.helpers import FakeClock
+from zeroterm_status.drivers.null import NullDisplay
+from zeroterm_status.panelpower import PanelPower
+
+
+class TestPanelPower(unittest.TestCase):
+    def test_measures_wake_latency_and_sleep_time(self) -> None:
+        clock = FakeClock()
+        power = PanelPower(clock=clock)
+
+        def slow_init() -> None:
+            clock.now += 0.25
+
+        power.init(slow_init)
+        clock.now += 1.0
+        power.sleep()
+        power.sleep()
+        clock.now += 8.0
+        self.assertTrue(power.wake(slow_init))
+        self.assertFalse(power.wake(slow_init))
+        clock.now += 0.75
+        power.sleep()
+        stats = power.stats
+        self.assertEqual((stats.inits, stats.sleeps, stats.wakes), (1, 2, 1))
+        self.assertAlmostEqual(stats.wake_max, 0.25)
+        self.assertAlmostEqual(stats.init_seconds, 0.25)
+        self.assertAlmostEqual(stats.asleep_seconds, 8.25)
+        self.assertIn("setup=0.5s", stats.summary())
+
+    def test_simulated_controller_books_modelled_latency(self) -> None:
+        display = NullDisplay(250, 122)
+        display.init()
+        display.show("a")
+        display.sleep()
+        display.show("a")
+        self.assertEqual(display.power_stats.wakes, 0)
+        display.show("b")
+        display.sleep()
+        self.assertEqual((display.power_stats.wakes, display.power_stats.sleeps), (1, 2))
+        self.assertAlmostEqual(display.power_stats.wake_seconds, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
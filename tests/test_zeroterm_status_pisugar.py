@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from zeroterm_status import pisugar
+
+
+class StandInServer:
+    def __init__(self, path: str, battery: str = "85.6", charging: str = "true") -> None:
+        self.path = path
+        self.battery = battery
+        self.charging = charging
+        self.connections = 0
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen(4)
+        self._clients: list[socket.socket] = []
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            self._clients.append(conn)
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        reader = conn.makefile("rb")
+        try:
+            for raw in reader:
+                command = raw.decode("utf-8").strip()
+                if command == "get battery":
+                    conn.sendall(f"battery: {self.battery}\n".encode("utf-8"))
+                elif command == "get battery_charging":
+                    conn.sendall(b"single\n")
+                    conn.sendall(f"battery_charging: {self.charging}\n".encode("utf-8"))
+        except OSError:
+            return
+
+    def drop_clients(self) -> None:
+        for conn in self._clients:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        self._clients.clear()
+
+    def close(self) -> None:
+        self.drop_clients()
+        self._server.close()
+
+
+class TestPiSugarClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._temp.name, "pisugar.sock")
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def test_parse_address(self) -> None:
+        self.assertEqual(pisugar.parse_address("127.0.0.1:8423"), (socket.AF_INET, ("127.0.0.1", 8423)))
+        self.assertEqual(pisugar.parse_address("unix:/tmp/p.sock"), (socket.AF_UNIX, "/tmp/p.sock"))
+        with self.assertRaises(ValueError):
+            pisugar.parse_address("nope")
+
+    def test_reuses_one_connection(self) -> None:
+        server = StandInServer(self.path)
+        client = pisugar.PiSugarClient(f"unix:{self.path}")
+        try:
+            for _ in range(5):
+                reading = client.read()
+        finally:
+            client.close()
+            server.close()
+        self.assertEqual(reading, pisugar.PiSugarReading(percent=86, charging=True))
+        self.assertEqual(server.connections, 1)
+
+    def test_reconnects_after_drop(self) -> None:
+        server = StandInServer(self.path, battery="40", charging="false")
+        client = pisugar.PiSugarClient(f"unix:{self.path}")
+        try:
+            self.assertIsNotNone(client.read())
+            server.drop_clients()
+            reading = client.read()
+        finally:
+            client.close()
+            server.close()
+        self.assertEqual(reading, pisugar.PiSugarReading(percent=40, charging=False))
+        self.assertEqual(server.connections, 2)
+
+    def test_backoff_when_server_missing(self) -> None:
+        client = pisugar.PiSugarClient(f"unix:{self.path}")
+        with mock.patch.object(client, "_connect", side_effect=OSError("down")) as connect:
+            self.assertIsNone(client.read())
+            self.assertIsNone(client.read())
+        self.assertEqual(connect.call_count, 1)
+        client._next_attempt = 0.0
+        server = StandInServer(self.path)
+        try:
+            self.assertIsNotNone(client.read())
+        finally:
+            client.close()
+            server.close()
+
+    def test_battery_source_prefers_server(self) -> None:
+        from zeroterm_status.metrics import BatterySource
+
+        server = StandInServer(self.path, battery="55", charging="true")
+        source = BatterySource(None, "pisugar-power -c", f"unix:{self.path}")
+        try:
+            with mock.patch("zeroterm_status.metrics._run_command") as run_command:
+                info = source.read()
+        finally:
+            source.close()
+            server.close()
+        run_command.assert_not_called()
+        self.assertEqual(info.percent, 55)
+        self.assertEqual(info.status, "Charging")
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from zeroterm_status import procfs
+
+_MEMINFO = (
+    "MemTotal:         443524 kB\n"
+    "MemFree:          120000 kB\n"
+    "MemAvailable:     221762 kB\n"
+    "Buffers:           10000 kB\n"
+    "Cached:            90000 kB\n"
+    "SwapCached:            0 kB\n"
+)
+_NET_DEV_HEADER = (
+    "Inter-|   Receive                                                |  Transmit\n"
+    " face |bytes    packets errs drop fifo frame compressed multicast|"
+    "bytes    packets errs drop fifo colls carrier compressed\n"
+)
+
+
+def _net_dev_line(name: str, rx_bytes: int, rx_packets: int, tx_bytes: int, tx_packets: int) -> str:
+    return (
+        f"{name:>6}: {rx_bytes} {rx_packets} 1 2 0 0 0 0 "
+        f"{tx_bytes} {tx_packets} 3 4 0 0 0 0\n"
+    )
+
+
+_STAT = "cpu  100 0 50 800 50 0 0 0 0 0\ncpu0 100 0 50 800 50 0 0 0 0 0\nintr 1\n"
+
+
+def _write_fixture(root: Path) -> tuple[Path, Path]:
+    proc = root / "proc"
+    proc.mkdir()
+    (proc / "uptime").write_text("11520.37 40000.00\n", encoding="utf-8")
+    (proc / "loadavg").write_text("0.42 0.30 0.25 1/80 1234\n", encoding="utf-8")
+    (proc / "meminfo").write_text(_MEMINFO, encoding="utf-8")
+    (proc / "stat").write_text(_STAT, encoding="utf-8")
+    thermal = root / "thermal"
+    for index, value in enumerate(["garbage", "48312"]):
+        zone = thermal / f"thermal_zone{index}"
+        zone.mkdir(parents=True)
+        (zone / "temp").write_text(f"{value}\n", encoding="utf-8")
+    return proc, thermal
+
+
+class TestProcFile(unittest.TestCase):
+    def test_parse_int(self) -> None:
+        buf = bytearray(b"  -42 rest")
+        self.assertEqual(procfs.parse_int(buf, 0, len(buf)), -42)
+        self.assertIsNone(procfs.parse_int(buf, 5, len(buf)))
+
+    def test_parse_first_fixed(self) -> None:
+        buf = bytearray(b"123.4 99.00\n")
+        self.assertEqual(procfs.parse_first_fixed(buf, len(buf)), (123, 40))
+
+    def test_reread_reuses_fd_and_grows(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "value"
+            path.write_text("1" * 40, encoding="utf-8")
+            handle = procfs.ProcFile(path, 16)
+            self.assertEqual(handle.read(), 40)
+            fd = handle._fd
+            with open(path, "r+", encoding="utf-8") as writer:
+                writer.write("7\n")
+                writer.truncate()
+            self.assertEqual(handle.read_int(), 7)
+            self.assertEqual(handle._fd, fd)
+            handle.close()
+
+    def test_missing_file(self) -> None:
+        handle = procfs.ProcFile("/nonexistent/zeroterm")
+        self.assertIsNone(handle.read())
+
+
+class TestSystemCollector(unittest.TestCase):
+    def test_reads_fixture(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc, thermal = _write_fixture(Path(temp_dir))
+            collector = procfs.SystemCollector(str(proc), str(thermal))
+            self.assertAlmostEqual(collector.uptime_seconds(), 11520.37)
+            self.assertAlmostEqual(collector.load_average(), 0.42)
+            self.assertEqual(collector.memory(), (443524, 221762))
+            self.assertEqual(collector.temperatures(), [48312])
+            collector.close()
+
+    def test_memory_without_available(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc, thermal = _write_fixture(Path(temp_dir))
+            text = "".join(line + "\n" for line in _MEMINFO.splitlines() if "Available" not in line)
+            (proc / "meminfo").write_text(text, encoding="utf-8")
+            collector = procfs.SystemCollector(str(proc), str(thermal))
+            self.assertEqual(collector.memory(), (443524, 220000))
+            collector.close()
+
+    def test_thermal_discovered_once(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc, thermal = _write_fixture(Path(temp_dir))
+            collector = procfs.SystemCollector(str(proc), str(thermal))
+            collector.temperatures()
+            zone = thermal / "thermal_zone9"
+            zone.mkdir()
+            (zone / "temp").write_text("30000\n", encoding="utf-8")
+            self.assertEqual(collector.temperatures(), [48312])
+            collector.close()
+
+    def test_concurrent_readers_share_buffers_safely(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc, thermal = _write_fixture(Path(temp_dir))
+            collector = procfs.SystemCollector(str(proc), str(thermal))
+            results = []
+
+            def worker() -> None:
+                for _ in range(200):
+                    results.append((collector.uptime_seconds(), collector.load_average(), collector.memory()))
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            collector.close()
+        self.assertEqual(set(results), {(11520.37, 0.42, (443524, 221762))})
+
+
+class TestCpuSampler(unittest.TestCase):
+    def test_parse_cpu_table(self) -> None:
+        buf = bytearray(b"cpu  10 0 10 70 10\ncpu0 5 0 5 35 5\ncpu1 5 0 5 35 5\nintr 1\n")
+        self.assertEqual(procfs.parse_cpu_table(buf, len(buf)), [(100, 80), (50, 40), (50, 40)])
+        self.assertEqual(procfs.parse_cpu_table(buf, len(buf), cores=False), [(100, 80)])
+
+    def test_per_core_usage(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stat = Path(temp_dir) / "stat"
+            stat.write_text("cpu  0 0 0 200 0\ncpu0 0 0 0 100 0\ncpu1 0 0 0 100 0\n", encoding="utf-8")
+            sampler = procfs.CpuSampler(temp_dir)
+            self.assertIsNone(sampler.sample())
+            stat.write_text("cpu  100 0 0 300 0\ncpu0 100 0 0 100 0\ncpu1 0 0 0 200 0\n", encoding="utf-8")
+            usage = sampler.sample()
+            sampler.close()
+        self.assertEqual(usage.percent, 50)
+        self.assertEqual(usage.cores, (100, 0))
+
+
+def _pid_stat(pid: int, name: str, utime: int, stime: int, start_time: int) -> str:
+    fields = ["S", "1", str(pid), str(pid), "0", "-1", "0", "0", "0", "0", "0"]
+    fields += [str(utime), str(stime), "0", "0", "20", "0", "1", "0", str(start_time), "0"]
+    return f"{pid} ({name}) " + " ".join(fields) + "\n"
+
+
+class TestProcessScanner(unittest.TestCase):
+    def test_parse_pid_stat_with_spaces(self) -> None:
+        buf = bytearray(_pid_stat(7, "tmux: server (1)", 30, 12, 999).encode())
+        self.assertEqual(procfs.parse_pid_stat(buf, len(buf)), ("tmux: server (1)", 42, 999))
+
+    def test_top_processes(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc = Path(temp_dir)
+            stats = {10: ("airodump-ng", 0, 500), 11: ("bash", 0, 600), 12: ("gone", 0, 700)}
+            for pid, (name, ticks, start) in stats.items():
+                (proc / str(pid)).mkdir()
+                (proc / str(pid) / "stat").write_text(_pid_stat(pid, name, ticks, 0, start), encoding="utf-8")
+            (proc / "self").mkdir()
+            clock = iter([100.0, 102.0])
+            scanner = procfs.ProcessScanner(str(proc), clock=lambda: next(clock), clock_ticks=100)
+            self.assertEqual(scanner.top(), [])
+            (proc / "10" / "stat").write_text(_pid_stat(10, "airodump-ng", 190, 4, 500), encoding="utf-8")
+            (proc / "11" / "stat").write_text(_pid_stat(11, "bash", 5, 5, 601), encoding="utf-8")
+            (proc / "12" / "stat").unlink()
+            (proc / "12").rmdir()
+            top = scanner.top(2)
+            self.assertEqual(len(scanner._files), 2)
+            scanner.close()
+        self.assertEqual(top, [procfs.ProcessUsage(pid=10, name="airodump-ng", percent=97.0)])
+
+
+class TestNetDevCollector(unittest.TestCase):
+    def _write(self, proc: Path, *lines: str) -> None:
+        (proc / "net" / "dev").write_text(_NET_DEV_HEADER + "".join(lines), encoding="utf-8")
+
+    def test_parses_all_interfaces(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc = Path(temp_dir)
+            (proc / "net").mkdir()
+            self._write(
+                proc,
+                _net_dev_line("lo", 500, 5, 500, 5),
+                _net_dev_line("wlan0", 123456, 900, 65432, 300),
+                "  bad: not numbers\n",
+            )
+            collector = procfs.NetDevCollector(str(proc), max_age=0)
+            table = collector.read()
+            collector.close()
+        self.assertEqual(set(table), {"lo", "wlan0"})
+        wlan = table["wlan0"]
+        self.assertEqual((wlan.rx_bytes, wlan.rx_packets, wlan.rx_errors, wlan.rx_drops), (123456, 900, 1, 2))
+        self.assertEqual((wlan.tx_bytes, wlan.tx_packets, wlan.tx_errors, wlan.tx_drops), (65432, 300, 3, 4))
+        self.assertEqual(wlan.packets, 1200)
+
+    def test_rates_from_deltas(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc = Path(temp_dir)
+            (proc / "net").mkdir()
+            collector = procfs.NetDevCollector(str(proc), max_age=0)
+            with mock.patch("zeroterm_status.procfs.time.monotonic", side_effect=[100.0, 110.0, 120.0]):
+                self._write(proc, _net_dev_line("wlan0", 1000, 10, 1000, 10))
+                self.assertIsNone(collector.rates("wlan0"))
+                self._write(proc, _net_dev_line("wlan0", 11000, 60, 6000, 60))
+                rates = collector.rates("wlan0")
+                self._write(proc, _net_dev_line("wlan0", 0, 0, 0, 0))
+                self.assertIsNone(collector.rates("wlan0"))
+            collector.close()
+        self.assertAlmostEqual(rates.rx_pps, 5.0)
+        self.assertAlmostEqual(rates.pps, 10.0)
+        self.assertAlmostEqual(rates.rx_bps, 8000.0)
+        self.assertAlmostEqual(rates.bps, 12000.0)
+
+    def test_concurrent_readers_share_buffer_safely(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            proc = Path(temp_dir)
+            (proc / "net").mkdir()
+            self._write(proc, _net_dev_line("lo", 500, 5, 500, 5), _net_dev_line("wlan0", 123456, 900, 65432, 300))
+            collector = procfs.NetDevCollector(str(proc), max_age=0)
+            results = []
+
+            def worker() -> None:
+                for _ in range(200):
+                    table = collector.read()
+                    collector.rates("wlan0")
+                    results.append((table["lo"].packets, table["wlan0"].packets))
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            collector.close()
+        self.assertEqual(set(results), {(10, 1200)})
+
+    def test_missing_file(self) -> None:
+        collector = procfs.NetDevCollector("/nonexistent/zeroterm")
+        self.assertEqual(collector.read(), {})
+        self.assertIsNone(collector.rates("wlan0"))
+
+
+@unittest.skipUnless(os.environ.get("ZEROTERM_BENCH"), "set ZEROTERM_BENCH=1 to run benchmarks")
+class TestProcfsBenchmarks(unittest.TestCase):
+    iterations = 2000
+
+    def _bench(self, label: str, legacy, collector) -> None:
+        for func in (legacy, collector):
+            func()
+        start = time.perf_counter()
+        for _ in range(self.iterations):
+            legacy()
+        legacy_us = (time.perf_counter() - start) * 1e6 / self.iterations
+        start = time.perf_counter()
+        for _ in range(self.iterations):
+            collector()
+        collector_us = (time.perf_counter() - start) * 1e6 / self.iterations
+        print(f"\n{label:<10} read_text {legacy_us:7.2f} us  pread {collector_us:7.2f} us")
+
+    def test_collectors(self) -> None:
+        collector = procfs.SystemCollector()
+        proc = Path("/proc")
+        self._bench(
+            "uptime",
+            lambda: float((proc / "uptime").read_text().split()[0]),
+            collector.uptime_seconds,
+        )
+        self._bench(
+            "loadavg",
+            lambda: float((proc / "loadavg").read_text().split()[0]),
+            collector.load_average,
+        )
+        self._bench(
+            "meminfo",
+            lambda: [line.split() for line in (proc / "meminfo").read_text().splitlines()],
+            collector.memory,
+        )
+        sampler = procfs.CpuSampler()
+        self._bench(
+            "stat",
+            lambda: [int(value) for value in (proc / "stat").read_text().splitlines()[0].split()[1:]],
+            sampler.sample,
+        )
+        sampler.close()
+        thermal = Path("/sys/class/thermal")
+        self._bench(
+            "thermal",
+            lambda: [path.read_text() for path in sorted(thermal.glob("thermal_zone*/temp"))],
+            collector.temperatures,
+        )
+        collector.close()
+        net = Path("/sys/class/net")
+        net_dev = procfs.NetDevCollector(max_age=0)
+        self._bench(
+            "net",
+            lambda: [
+                int((iface / "statistics" / name).read_text())
+                for iface in net.iterdir()
+                for name in ("rx_bytes", "rx_packets", "tx_bytes", "tx_packets")
+            ],
+            net_dev.read,
+        )
+        net_dev.close()
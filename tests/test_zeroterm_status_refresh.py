@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tests.helpers import FakeClock
+from zeroterm_status import refresh
+from zeroterm_status.drivers.file import FileDisplay
+from zeroterm_status.drivers.base import DisplayError
+from zeroterm_status.drivers.waveshare import WaveshareDisplay
+from zeroterm_status.framebuffer import PackedFrame
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:  # pragma: no cover - exercised when Pillow is missing
+    Image = None
+    ImageDraw = None
+
+
+def _frame(*boxes):
+    image = Image.new("1", (250, 122), 255)
+    draw = ImageDraw.Draw(image)
+    for box in boxes:
+        draw.rectangle(box, fill=0)
+    return image
+
+
+class TestDiffRows(unittest.TestCase):
+    def test_rows_merge_into_rects(self) -> None:
+        width, height = 32, 12
+        previous = bytearray(4 * height)
+        current = bytearray(previous)
+        current[1 * 4 + 1] = 0xFF
+        current[3 * 4 + 2] = 0x01
+        current[10 * 4 + 0] = 0x80
+        rects = refresh.diff_rows(bytes(previous), bytes(current), width, height, merge_gap=2)
+        self.assertEqual(rects, [(8, 1, 24, 4), (0, 10, 8, 11)])
+
+    def test_identical_frames(self) -> None:
+        data = bytes(64)
+        self.assertEqual(refresh.diff_rows(data, data, 32, 16), [])
+
+
+@unittest.skipIf(Image is None, "Pillow not available")
+class TestPartialRefresher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        policy = refresh.RefreshPolicy(full_every=2, full_interval=600, max_partial_area=0.5)
+        self.refresher = refresh.PartialRefresher(policy, partial_supported=True, clock=self.clock)
+
+    def _show(self, image) -> refresh.RefreshPlan:
+        plan = self.refresher.plan(image)
+        self.refresher.commit(plan, image, 0.0, 0.0)
+        return plan
+
+    def test_plans(self) -> None:
+        self.assertEqual(self._show(_frame()).reason, "first")
+        self.assertEqual(self._show(_frame()).mode, refresh.SKIP)
+        plan = self._show(_frame((10, 10, 20, 20)))
+        self.assertEqual(plan.mode, refresh.PARTIAL)
+        self.assertEqual(plan.rects, ((8, 10, 24, 21),))
+        self.assertEqual(self._show(_frame((30, 10, 40, 20))).mode, refresh.PARTIAL)
+        self.assertEqual(self._show(_frame((50, 10, 60, 20))).reason, "count")
+        self.assertEqual(self._show(_frame((0, 0, 249, 121))).reason, "area")
+        self.clock.now += 601
+        self.assertEqual(self._show(_frame((5, 5, 8, 8))).reason, "interval")
+        self.assertEqual(self.refresher.stats.full, 4)
+        self.assertEqual(self.refresher.stats.partial, 2)
+        self.assertEqual(self.refresher.stats.skipped, 1)
+
+    def test_unsupported_model_refreshes_fully(self) -> None:
+        refresher = refresh.PartialRefresher(refresh.RefreshPolicy(), partial_supported=False)
+        refresher.commit(refresher.plan(_frame()), _frame(), 0.0, 0.0)
+        self.assertEqual(refresher.plan(_frame((1, 1, 2, 2))).reason, "unsupported")
+
+
+class FakeEPD:
+    width = 122
+    height = 250
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.buffers: list[bytes] = []
+
+    def init(self) -> None:
+        self.calls.append("init")
+
+    def getbuffer(self, image):
+        self.calls.append("getbuffer")
+        return image.tobytes()
+
+    def display(self, buffer) -> None:
+        self.calls.append("display")
+        self.buffers.append(buffer)
+
+    def displayPartBaseImage(self, buffer) -> None:
+        self.calls.append("base")
+        self.buffers.append(buffer)
+
+    def displayPartial(self, buffer) -> None:
+        self.calls.append("partial")
+        self.buffers.append(buffer)
+
+    def sleep(self) -> None:
+        self.calls.append("sleep")
+
+
+@unittest.skipIf(Image is None, "Pillow not available")
+class TestDrivers(unittest.TestCase):
+    def _waveshare(self, epd: FakeEPD, policy: refresh.RefreshPolicy) -> WaveshareDisplay:
+        module = types.SimpleNamespace(EPD=lambda: epd)
+        package = types.ModuleType("waveshare_epd")
+        modules = {"waveshare_epd": package, "waveshare_epd.epd2in13_V3": module}
+        with mock.patch.dict(sys.modules, modules):
+            display = WaveshareDisplay("epd2in13_V3", policy=policy)
+            display.init()
+        return display
+
+    def test_waveshare_uses_partial_updates(self) -> None:
+        epd = FakeEPD()
+        display = self._waveshare(epd, refresh.RefreshPolicy(full_every=1))
+        display.show(_frame())
+        display.show(_frame((10, 10, 20, 20)))
+        display.show(_frame((10, 10, 20, 20)))
+        display.show(_frame((30, 10, 40, 20)))
+        self.assertEqual(
+            epd.calls,
+            ["init", "getbuffer", "init", "base", "getbuffer", "partial", "getbuffer", "init", "base"],
+        )
+        self.assertEqual(display.refresh_stats.skipped, 1)
+
+    def test_waveshare_takes_packed_frames(self) -> None:
+        epd = FakeEPD()
+        display = self._waveshare(epd, refresh.RefreshPolicy())
+        self.assertTrue(display.accepts_frames)
+        first = PackedFrame.from_image(_frame().rotate(90, expand=True))
+        second = PackedFrame.from_image(_frame((10, 10, 20, 20)).rotate(90, expand=True))
+        display.show(first)
+        display.show(first)
+        display.show(second)
+        self.assertNotIn("getbuffer", epd.calls)
+        self.assertEqual(epd.buffers, [first.data, second.data])
+        self.assertEqual(display.refresh_stats.skipped, 1)
+        with self.assertRaises(DisplayError):
+            display.show(PackedFrame.from_image(_frame()))
+
+    def test_waveshare_wakes_only_for_changed_frames(self) -> None:
+        epd = FakeEPD()
+        display = self._waveshare(epd, refresh.RefreshPolicy())
+        display.show(_frame())
+        display.sleep()
+        display.sleep()
+        display.show(_frame())
+        display.show(_frame((10, 10, 20, 20)))
+        display.sleep()
+        display.show(_frame((30, 10, 40, 20)))
+        self.assertEqual(
+            epd.calls,
+            ["init", "getbuffer", "init", "base", "sleep", "getbuffer", "init", "partial", "sleep",
+             "getbuffer", "init", "partial"],
+        )
+        power = display.power_stats
+        self.assertEqual((power.inits, power.sleeps, power.wakes), (1, 2, 2))
+        self.assertIn("wakes=2", power.summary())
+
+    def test_file_display_simulates_sleep(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            display = FileDisplay(250, 122, str(Path(temp_dir) / "epaper.pbm"), model="epd2in13_V3")
+            display.init()
+            display.show(_frame())
+            display.sleep()
+            display.show(_frame())
+            display.show(_frame((10, 10, 20, 20)))
+        power = display.power_stats
+        self.assertEqual((power.sleeps, power.wakes), (1, 1))
+        self.assertAlmostEqual(power.wake_seconds, refresh.model_cost("epd2in13_V3").wake_seconds)
+        self.assertAlmostEqual(display.refresh_stats.seconds, 2.0 + 0.3 + 0.1)
+
+    def test_file_display_simulates_costs(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "epaper.png"
+            display = FileDisplay(250, 122, str(output), model="epd2in13_V3")
+            display.init()
+            display.show(_frame())
+            display.show(PackedFrame.from_image(_frame((10, 10, 20, 20))))
+            self.assertTrue(output.exists())
+        stats = display.refresh_stats
+        self.assertEqual((stats.full, stats.partial), (1, 1))
+        self.assertAlmostEqual(stats.seconds, 2.3)
+        self.assertAlmostEqual(stats.energy_mj, 2.3 * 26.4)
+        self.assertIn("partial=1", stats.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import unittest
+from pathlib import Path
 
-from zeroterm_status.render import (
-    RenderConfig,
+from zeroterm_status import layout, render
+from zeroterm_status.framebuffer import PackedFrame
+from zeroterm_status.render import RenderConfig, render_lines, render_status, render_status_frame
+from zeroterm_status.statusview import (
     _battery_short,
+    _format_rate,
     _pick_face,
     _short_wifi_state,
     _status_message,
-    render_lines,
-    render_status,
 )
 
 
@@ -24,6 +26,12 @@ class TestRenderHelpers(unittest.TestCase):
         self.assertEqual(_battery_short(100, "full"), "100%F")
         self.assertEqual(_battery_short(None, ""), "--")
 
+    def test_format_rate(self) -> None:
+        self.assertEqual(_format_rate(None), "--")
+        self.assertEqual(_format_rate(0.0), "0/s")
+        self.assertEqual(_format_rate(2.5), "2.5/s")
+        self.assertEqual(_format_rate(1530.4), "1.5k/s")
+
     def test_status_message(self) -> None:
         self.assertEqual(_status_message("running"), "SESSION LIVE")
         self.assertEqual(_status_message("ready"), "WAITING FOR INPUT")
@@ -36,6 +44,55 @@ class TestRenderHelpers(unittest.TestCase):
         self.assertEqual(_pick_face("running", 10), "(T_T)")
 
 
+class TestFitText(unittest.TestCase):
+    def _linear(self, draw, text: str, font, max_width: int) -> str:
+        def width(value: str) -> int:
+            bbox = draw.textbbox((0, 0), value, font=font)
+            return bbox[2] - bbox[0]
+
+        if width(text) <= max_width:
+            return text
+        trimmed = text
+        while trimmed:
+            if width(trimmed + "...") <= max_width:
+                return trimmed + "..."
+            trimmed = trimmed[:-1]
+        return ""
+
+    def test_matches_linear_trim(self) -> None:
+        if render.Image is None:
+            self.skipTest("Pillow not available")
+        draw = render.ImageDraw.Draw(render.Image.new("1", (250, 122), 255))
+        fonts = [render._load_font(None, 8), render._load_font(None, 12), render.ImageFont.load_default()]
+        proportional = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+        if Path(proportional).exists():
+            fonts.append(render._load_font(proportional, 10))
+        texts = [
+            "SSID ZEROTERM-FIELD-LAB-5GHZ-EXTENDED-GUEST-NETWORK",
+            "ALRT TIME UPD LOW TIME UPD LOW",
+            "iiiiWWWW  mmmm....",
+            "OK",
+        ]
+        for font in fonts:
+            for text in texts:
+                for max_width in (0, 5, 17, 40, 86, 300):
+                    with self.subTest(font=font, text=text, max_width=max_width):
+                        self.assertEqual(
+                            render._fit_text(draw, text, font, max_width),
+                            self._linear(draw, text, font, max_width),
+                        )
+
+    def test_monospace_advance(self) -> None:
+        if render.Image is None:
+            self.skipTest("Pillow not available")
+        mono = "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf"
+        proportional = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+        if not (Path(mono).exists() and Path(proportional).exists()):
+            self.skipTest("DejaVu fonts not installed")
+        self.assertIsNotNone(render._monospace_advance(render._load_font(mono, 10)))
+        self.assertIsNone(render._monospace_advance(render._load_font(proportional, 10)))
+
+
 class TestRenderOutput(unittest.TestCase):
     def test_render_lines(self) -> None:
         config = RenderConfig(width=250, height=122, rotate=0, font_path=None, font_size=14)
@@ -66,7 +123,103 @@ class TestRenderOutput(unittest.TestCase):
                 config=config,
                 wifi_channel="6",
                 wifi_packets=1200,
+                wifi_rate=42.5,
+                top="airodump-ng 97%",
             )
         except RuntimeError:
             self.skipTest("Pillow not available")
         self.assertEqual(image.size, (250, 122))
+
+    def test_cached_layout_matches_cold_render(self) -> None:
+        config = RenderConfig(width=250, height=122, rotate=180, font_path=None, font_size=14)
+        values = dict(
+            status="DOWN",
+            ip="10.0.0.5",
+            wifi="UP A-VERY-LONG-SSID-THAT-NEEDS-TRUNCATION",
+            battery="9% DISCHARGING",
+            adapter="wlan1",
+            power="DIS 0h40",
+            alert="TIME UPD LOW",
+            temp="61C",
+            load="3.10",
+            uptime="2d4h",
+            mem="91%",
+            cpu="99%",
+            battery_percent=9,
+            updated="12:30",
+            config=config,
+            top="airodump-ng 97%",
+        )
+        try:
+            render._LAYOUT_CACHE.pop(config, None)
+            cold = render_status(**values)
+        except RuntimeError:
+            self.skipTest("Pillow not available")
+        layout = render._LAYOUT_CACHE[config]
+        cached = render_status(**values)
+        self.assertIs(render._LAYOUT_CACHE[config], layout)
+        self.assertEqual(cold.tobytes(), cached.tobytes())
+        quiet = render_status(**dict(values, adapter=None, power=None, alert=None, top=None, status="RUNNING"))
+        self.assertNotEqual(quiet.tobytes(), cached.tobytes())
+        self.assertEqual(layout.base.getpixel((0, 0)), 0)
+
+
+    def test_status_frame(self) -> None:
+        config = RenderConfig(width=250, height=122, rotate=180, font_path=None, font_size=14)
+        values = dict(
+            status="RUNNING",
+            ip="10.0.0.5",
+            wifi="UP TEST",
+            battery="55% CHARGING",
+            adapter=None,
+            power=None,
+            alert=None,
+            temp="42C",
+            load="0.42",
+            uptime="1h2m",
+            mem="50%",
+            cpu="20%",
+            battery_percent=55,
+            updated=None,
+        )
+        try:
+            image = render_status(config=config, **values)
+        except RuntimeError:
+            self.skipTest("Pillow not available")
+        frame = render_status_frame(config=config, **values)
+        self.assertEqual(frame, PackedFrame.from_image(image))
+        self.assertIs(render_status_frame(config=config, **values), frame)
+        self.assertIsNot(render_status_frame(config=config, **dict(values, cpu="21%")), frame)
+
+        portrait = RenderConfig(width=122, height=250, rotate=90, font_path=None, font_size=14)
+        frame = render_status_frame(config=portrait, panel_size=(122, 250), **values)
+        landscape = render_status(config=RenderConfig(250, 122, 0, None, 14), **values)
+        self.assertEqual(frame.size, (122, 250))
+        self.assertEqual(frame, PackedFrame.from_image(landscape.rotate(90, expand=True)))
+
+    def test_panel_layouts(self) -> None:
+        values = dict(
+            status="READY",
+            ip="10.0.0.5",
+            wifi="UP TEST",
+            battery="80% FULL",
+            adapter=None,
+            power=None,
+            alert="LOW",
+            temp="40C",
+            load="0.10",
+            uptime="5m",
+            mem="20%",
+            cpu="3%",
+            battery_percent=80,
+            updated=None,
+        )
+        for name, panel in layout.PANELS.items():
+            config = RenderConfig(*panel.size, rotate=0, font_path=None, font_size=14, layout=name)
+            with self.subTest(panel=name):
+                try:
+                    image = render_status(config=config, **values)
+                except RuntimeError:
+                    self.skipTest("Pillow not available")
+                self.assertEqual(image.size, panel.size)
+                self.assertIn("lines", render._LAYOUT_CACHE[config].slots)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import errno
+import socket
+import struct
+import threading
+import unittest
+from unittest import mock
+
+from zeroterm_status import metrics, netlink, rtnetlink
+
+
+def _link(msg_type: int, index: int, name: str | None = None, operstate: int | None = None) -> bytes:
+    body = struct.pack("=BxHiII", 0, 1, index, 0, 0)
+    if name is not None:
+        body += netlink.pack_attr_str(rtnetlink.IFLA_IFNAME, name)
+    if operstate is not None:
+        body += netlink.pack_attr(rtnetlink.IFLA_OPERSTATE, bytes([operstate]))
+    return body
+
+
+def _addr(index: int, address: str) -> bytes:
+    return struct.pack("=BBBBI", socket.AF_INET, 24, 0, 0, index) + netlink.pack_attr(
+        rtnetlink.IFA_LOCAL, socket.inet_aton(address)
+    )
+
+
+class FakeDumpSocket:
+    def __init__(self, dumps: dict[int, list[tuple[int, bytes]]]) -> None:
+        self.dumps = dumps
+        self._pending: list[bytes] = []
+
+    def send(self, data: bytes) -> int:
+        msg_type, _, seq, _ = next(netlink.iter_messages(data))
+        chunk = b"".join(
+            netlink.pack_message(reply_type, netlink.NLM_F_MULTI, seq, body)
+            for reply_type, body in self.dumps.get(msg_type, [])
+        )
+        done = netlink.pack_message(netlink.NLMSG_DONE, netlink.NLM_F_MULTI, seq, struct.pack("=i", 0))
+        self._pending.append(chunk + done)
+        return len(data)
+
+    def recv(self, size: int) -> bytes:
+        return self._pending.pop(0)
+
+    def close(self) -> None:
+        return None
+
+
+class TestLinkMonitor(unittest.TestCase):
+    def test_apply_link_and_address(self) -> None:
+        monitor = rtnetlink.LinkMonitor()
+        self.assertTrue(monitor.apply(rtnetlink.RTM_NEWLINK, _link(rtnetlink.RTM_NEWLINK, 3, "wlan0", 2)))
+        self.assertTrue(monitor.apply(rtnetlink.RTM_NEWADDR, _addr(3, "10.0.0.5")))
+        self.assertFalse(monitor.apply(rtnetlink.RTM_NEWADDR, _addr(3, "10.0.0.5")))
+        self.assertTrue(monitor.apply(rtnetlink.RTM_NEWLINK, _link(rtnetlink.RTM_NEWLINK, 3, operstate=6)))
+        link = monitor.get("wlan0")
+        self.assertEqual(link.operstate, "up")
+        self.assertEqual(link.addresses, ("10.0.0.5",))
+        self.assertTrue(monitor.apply(rtnetlink.RTM_DELADDR, _addr(3, "10.0.0.5")))
+        self.assertEqual(monitor.get("wlan0").addresses, ())
+        self.assertTrue(monitor.apply(rtnetlink.RTM_DELLINK, _link(rtnetlink.RTM_DELLINK, 3)))
+        self.assertIsNone(monitor.get("wlan0"))
+
+    def test_events_trigger_on_change(self) -> None:
+        changed = threading.Event()
+        kernel, events = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        dumps = {
+            rtnetlink.RTM_GETLINK: [
+                (rtnetlink.RTM_NEWLINK, _link(rtnetlink.RTM_NEWLINK, 2, "wlan0", 2)),
+                (rtnetlink.RTM_NEWLINK, _link(rtnetlink.RTM_NEWLINK, 4, "eth0", 6)),
+            ],
+            rtnetlink.RTM_GETADDR: [(rtnetlink.RTM_NEWADDR, _addr(4, "192.168.1.2"))],
+        }
+        monitor = rtnetlink.LinkMonitor(
+            on_change=changed.set,
+            event_sock=events,
+            request_sock=FakeDumpSocket(dumps),
+        )
+        try:
+            self.assertTrue(monitor.start())
+            self.assertEqual(monitor.wifi_ifaces(), ["wlan0"])
+            self.assertEqual(monitor.get("eth0").addresses, ("192.168.1.2",))
+            kernel.send(netlink.pack_message(rtnetlink.RTM_NEWLINK, 0, 0, _link(rtnetlink.RTM_NEWLINK, 2, "wlan0", 6)))
+            self.assertTrue(changed.wait(2))
+            self.assertEqual(monitor.get("wlan0").operstate, "up")
+        finally:
+            monitor.stop()
+            kernel.close()
+
+    def test_monitor_survives_event_timeouts(self) -> None:
+        changed = threading.Event()
+        kernel, events = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        events.settimeout(0.01)
+        monitor = rtnetlink.LinkMonitor(on_change=changed.set, event_sock=events, request_sock=FakeDumpSocket({}))
+        try:
+            self.assertTrue(monitor.start())
+            self.assertFalse(changed.wait(0.1))
+            kernel.send(netlink.pack_message(rtnetlink.RTM_NEWLINK, 0, 0, _link(rtnetlink.RTM_NEWLINK, 2, "wlan0", 6)))
+            self.assertTrue(changed.wait(2))
+        finally:
+            monitor.stop()
+            kernel.close()
+
+    def test_request_times_out_as_netlink_error(self) -> None:
+        kernel, quiet = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        quiet.settimeout(0.01)
+        requests = netlink.NetlinkSocket(netlink.NETLINK_ROUTE, sock=quiet)
+        try:
+            with self.assertRaises(netlink.NetlinkError) as caught:
+                requests.request(rtnetlink.RTM_GETLINK, netlink.NLM_F_DUMP, b"")
+            self.assertEqual(caught.exception.errno, errno.ETIMEDOUT)
+        finally:
+            requests.close()
+            kernel.close()
+
+    def test_metrics_read_from_table(self) -> None:
+        monitor = rtnetlink.LinkMonitor()
+        monitor.apply(rtnetlink.RTM_NEWLINK, _link(rtnetlink.RTM_NEWLINK, 5, "wlan1", 6))
+        monitor.apply(rtnetlink.RTM_NEWADDR, _addr(5, "10.1.1.1"))
+        monitor.ready = True
+        with mock.patch("zeroterm_status.metrics._LINK_MONITOR", monitor):
+            self.assertTrue(metrics._iface_exists("wlan1"))
+            self.assertFalse(metrics._iface_exists("wlan7"))
+            self.assertEqual(metrics.list_wifi_ifaces(), ["wlan1"])
+            self.assertEqual(metrics._read_operstate("wlan1"), "up")
+            self.assertEqual(metrics.get_ip_address("wlan1"), "10.1.1.1")
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import unittest
+
+from tests.helpers import FakeClock, temp_env
+from zeroterm_status.collectors import COST_CHEAP, Collector, CollectorPool, CollectorRegistry, collector_periods
+from zeroterm_status.config import load_config
+from zeroterm_status.scheduler import Scheduler, TimerWheel
+
+
+class TestTimerWheel(unittest.TestCase):
+    def test_pop_due_in_order(self) -> None:
+        wheel = TimerWheel(tick=1.0, slots=8, start=100.0)
+        wheel.schedule("late", 130.5)
+        wheel.schedule("soon", 102.25)
+        wheel.schedule("mid", 104.0)
+        self.assertEqual(wheel.next_due(), 102.25)
+        self.assertEqual(wheel.pop_due(103.0), ["soon"])
+        self.assertEqual(wheel.next_due(), 104.0)
+        self.assertEqual(wheel.pop_due(110.0), ["mid"])
+        self.assertEqual(wheel.next_due(), 130.5)
+        self.assertEqual(wheel.pop_due(129.0), [])
+        self.assertEqual(wheel.pop_due(131.0), ["late"])
+        self.assertIsNone(wheel.next_due())
+
+    def test_reschedule_replaces_entry(self) -> None:
+        wheel = TimerWheel(tick=1.0, slots=8, start=0.0)
+        wheel.schedule("a", 5.0)
+        wheel.schedule("a", 2.0)
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(wheel.pop_due(10.0), ["a"])
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.calls: list[str] = []
+        self.registry = CollectorRegistry()
+        self.registry.register(Collector("fast", self._collector("fast"), 10.0, cost=COST_CHEAP))
+        self.registry.register(Collector("slow", self._collector("slow"), 60.0, cost=COST_CHEAP, budget=90.0))
+        self.registry.register(Collector("event", self._collector("event"), 300.0, cost=COST_CHEAP, on_wake=True))
+        self.pool = CollectorPool(max_workers=1)
+        self.scheduler = Scheduler(self.registry, self.pool, clock=self.clock)
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+
+    def _collector(self, name: str):
+        def collect() -> str:
+            self.calls.append(name)
+            return f"{name}@{self.clock.now:.0f}"
+
+        return collect
+
+    def test_runs_only_due_collectors(self) -> None:
+        self.assertEqual(self.scheduler.run_due(), {"fast", "slow", "event"})
+        self.assertEqual(self.scheduler.wait_time(), 10.0)
+        self.clock.now += 10
+        self.assertEqual(self.scheduler.run_due(), {"fast"})
+        self.clock.now += 5
+        self.assertEqual(self.scheduler.run_due(), set())
+        self.assertEqual(self.scheduler.run_due(woken=True), {"event"})
+        self.assertEqual(self.scheduler.value("event"), "event@1015")
+
+    def test_min_period_stretches_schedule(self) -> None:
+        self.scheduler.run_due(min_period=30.0)
+        self.assertEqual(self.scheduler.wait_time(), 30.0)
+
+    def test_staleness_budget(self) -> None:
+        self.scheduler.run_due()
+        self.registry.get("slow").func = lambda: 1 / 0
+        self.clock.now += 60
+        with self.assertLogs("zeroterm_status.scheduler", level="ERROR"):
+            self.scheduler.run_due()
+        self.assertIn("slow", self.scheduler.stale)
+        self.assertEqual(self.scheduler.value("slow"), "slow@1000")
+        self.clock.now += 31
+        self.assertIsNone(self.scheduler.value("slow"))
+
+    def test_stretched_period_keeps_values_fresh(self) -> None:
+        registry = CollectorRegistry()
+        registry.register(Collector("service", lambda: "active", 60.0, cost=COST_CHEAP))
+        registry.register(Collector("update", lambda: True, 60.0, cost=COST_CHEAP, budget=120.0))
+        scheduler = Scheduler(registry, self.pool, clock=self.clock)
+        start = self.clock.now
+        for step in range(1, 4):
+            self.assertEqual(scheduler.run_due(min_period=300.0), {"service", "update"})
+            self.clock.now = start + step * 300 - 1
+            self.assertEqual(scheduler.run_due(min_period=300.0), set())
+            self.assertEqual(scheduler.value("service"), "active")
+            self.assertTrue(scheduler.value("update"))
+            self.clock.now += 1
+        self.clock.now += 3 * 300 + 1
+        self.assertIsNone(scheduler.value("service"))
+
+
+class TestCollectorPeriods(unittest.TestCase):
+    def test_profile_periods(self) -> None:
+        with temp_env({"ZEROTERM_STATUS_PROFILE": "eco", "ZEROTERM_UPDATE_INTERVAL": "900"}):
+            periods = collector_periods(load_config())
+        self.assertEqual(periods["wifi"], 120)
+        self.assertEqual(periods["battery"], 120)
+        self.assertEqual(periods["system"], 300)
+        self.assertEqual(periods["update_fetch"], 900)
+
+    def test_unset_periods_follow_interval(self) -> None:
+        with temp_env({"ZEROTERM_STATUS_PROFILE": None, "ZEROTERM_STATUS_INTERVAL": "20"}):
+            periods = collector_periods(load_config())
+        self.assertEqual(periods["service"], 20)
+        self.assertEqual(periods["time_sync"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import unittest
+
+from tests.helpers import FakeClock
+from zeroterm_status.significance import FieldPolicy, SignificanceFilter
+
+
+class TestSignificanceFilter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.filter = SignificanceFilter(clock=self.clock)
+
+    def _fields(self, cpu: int, status: str = "RUNNING", temp: int = 45, load: float = 0.42):
+        return {
+            "status": (status, None),
+            "cpu": (f"{cpu}%", cpu),
+            "temp": (f"{temp}C", temp),
+            "load": (f"{load:.2f}", load),
+        }
+
+    def test_jitter_is_held(self) -> None:
+        first = self.filter.update(self._fields(cpu=20))
+        self.assertEqual(first["cpu"], "20%")
+        self.clock.now += 120
+        shown = self.filter.update(self._fields(cpu=27, temp=46, load=0.47))
+        self.assertEqual(shown, first)
+        self.assertEqual(self.filter.avoided, 1)
+        self.assertEqual(self.filter.suppressed, {"cpu": 1, "load": 1, "temp": 1})
+
+    def test_deadband_exceeded_after_hold(self) -> None:
+        self.filter.update(self._fields(cpu=20))
+        self.clock.now += 30
+        self.assertEqual(self.filter.update(self._fields(cpu=60))["cpu"], "20%")
+        self.clock.now += 31
+        self.assertEqual(self.filter.update(self._fields(cpu=60))["cpu"], "60%")
+        self.assertEqual(self.filter.refreshes, 2)
+
+    def test_immediate_change_flushes_pending_fields(self) -> None:
+        self.filter.update(self._fields(cpu=20))
+        self.clock.now += 1
+        shown = self.filter.update(self._fields(cpu=23, status="DOWN", temp=46))
+        self.assertEqual(shown["status"], "DOWN")
+        self.assertEqual(shown["cpu"], "23%")
+        self.assertEqual(shown["temp"], "46C")
+        self.assertEqual(self.filter.avoided, 0)
+
+    def test_load_buckets_with_hysteresis(self) -> None:
+        self.filter.update(self._fields(cpu=20, load=0.9))
+        self.assertEqual(self.filter.update(self._fields(cpu=20, load=1.05))["load"], "0.90")
+        self.assertEqual(self.filter.update(self._fields(cpu=20, load=1.15))["load"], "1.15")
+        self.assertEqual(self.filter.update(self._fields(cpu=20, load=0.95))["load"], "1.15")
+        self.assertEqual(self.filter.update(self._fields(cpu=20, load=0.85))["load"], "0.85")
+
+    def test_unknown_values_are_significant(self) -> None:
+        self.filter.update({"cpu": ("--", None)})
+        self.assertEqual(self.filter.update({"cpu": ("5%", 5)})["cpu"], "5%")
+        self.assertEqual(self.filter.value("cpu"), 5)
+
+    def test_custom_policies(self) -> None:
+        custom = SignificanceFilter({"bat": FieldPolicy(deadband=5)}, clock=self.clock)
+        custom.update({"bat": ("50% DIS", 50)})
+        self.assertEqual(custom.update({"bat": ("48% DIS", 48)})["bat"], "50% DIS")
+        self.assertEqual(custom.update({"bat": ("48% CHG", 48)})["bat"], "48% CHG")
+        self.assertIn("avoided=1", custom.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import ctypes
+import unittest
+
+from zeroterm_status import timex
+
+
+class TestClockSync(unittest.TestCase):
+    def test_is_synchronized(self) -> None:
+        self.assertTrue(timex.is_synchronized(0, 0x2001, 250_000))
+        self.assertFalse(timex.is_synchronized(0, timex.STA_UNSYNC, 250_000))
+        self.assertFalse(timex.is_synchronized(timex.TIME_ERROR, 0, 250_000))
+        self.assertFalse(timex.is_synchronized(0, 0, timex.MAX_ERROR_US))
+
+    def test_read_is_cached(self) -> None:
+        calls = []
+
+        def fake_adjtimex(buf) -> int:
+            calls.append(buf)
+            ctypes.cast(buf, ctypes.POINTER(timex.Timex)).contents.status = timex.STA_UNSYNC
+            return timex.TIME_ERROR
+
+        clock = timex.ClockSync(adjtimex=fake_adjtimex, ttl=60.0)
+        self.assertFalse(clock.read())
+        self.assertFalse(clock.read())
+        self.assertEqual(len(calls), 1)
+
+    def test_syscall_failure(self) -> None:
+        clock = timex.ClockSync(adjtimex=lambda buf: -1)
+        self.assertIsNone(clock.read())
+
+    def test_real_syscall(self) -> None:
+        result = timex.ClockSync(ttl=0.0).read()
+        self.assertIn(result, {True, False, None})
+
+
+if __name__ == "__main__":
+    unittest.main()
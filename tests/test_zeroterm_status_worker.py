@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from zeroterm_status.drivers.base import BaseDisplay, DisplayError
+from zeroterm_status.worker import DisplayWorker
+
+
+class FakeDisplay(BaseDisplay):
+    def __init__(self) -> None:
+        self.width = 8
+        self.height = 8
+        self.shown: list[object] = []
+        self.inits = 0
+        self.failures = 0
+        self.sleeps = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def init(self) -> None:
+        self.inits += 1
+
+    def show(self, image) -> None:
+        self.started.set()
+        self.release.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise DisplayError("spi timeout")
+        self.shown.append(image)
+
+    def sleep(self) -> None:
+        self.sleeps += 1
+
+
+class TestDisplayWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.display = FakeDisplay()
+        self.worker = DisplayWorker(self.display, backoff_min=0.01, backoff_max=0.05)
+        self.worker.start()
+        self.addCleanup(self.worker.stop)
+
+    def test_latest_frame_wins_during_refresh(self) -> None:
+        self.display.release.clear()
+        self.worker.submit("first")
+        self.assertTrue(self.display.started.wait(5))
+        for frame in ("second", "third", "fourth"):
+            self.worker.submit(frame)
+        self.display.release.set()
+        self.assertTrue(self.worker.wait_idle(5))
+        self.assertEqual(self.display.shown, ["first", "fourth"])
+        stats = self.worker.stats
+        self.assertEqual((stats.submitted, stats.shown, stats.dropped), (4, 2, 2))
+        self.assertEqual(self.worker.histogram.total, 2)
+
+    def test_failed_update_reinits_and_retries(self) -> None:
+        self.display.failures = 2
+        self.worker.submit("frame")
+        self.assertTrue(self.worker.wait_idle(5))
+        self.assertEqual(self.display.shown, ["frame"])
+        stats = self.worker.stats
+        self.assertEqual((stats.failures, stats.reinits), (2, 2))
+        self.assertEqual(self.display.inits, 2)
+        self.assertIn("failures=2", self.worker.summary())
+
+    def test_newer_frame_replaces_failed_retry(self) -> None:
+        self.display.failures = 1
+        self.display.release.clear()
+        self.worker.submit("stale")
+        self.assertTrue(self.display.started.wait(5))
+        self.worker.submit("fresh")
+        self.display.release.set()
+        self.assertTrue(self.worker.wait_idle(5))
+        self.assertEqual(self.display.shown, ["fresh"])
+
+    def test_sleeps_after_update_unless_frame_pending(self) -> None:
+        self.worker.sleep_between = True
+        self.display.release.clear()
+        self.worker.submit("first")
+        self.assertTrue(self.display.started.wait(5))
+        self.worker.submit("second")
+        self.display.release.set()
+        self.assertTrue(self.worker.wait_idle(5))
+        self.assertEqual(self.display.shown, ["first", "second"])
+        self.assertEqual(self.display.sleeps, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,3 +28,23 @@ class TestServerHelpers(unittest.TestCase):
                 path = server._make_log_path(config, "sess", 42)
         self.assertIsNotNone(path)
         self.assertIn("zeroterm-session-20200101-000000-sess-42.log", str(path))
+
+    def test_history_request(self) -> None:
+        from zeroterm_status.history import MetricsHistory
+
+        history = MetricsHistory()
+        history.record(1_700_000_000, {"battery": 80, "load": 0.5})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            history_path = Path(temp_dir) / "history.bin"
+            history.save(history_path)
+            env_path = Path(temp_dir) / "zeroterm.env"
+            env_path.write_text(f"ZEROTERM_STATUS_HISTORY_PATH={history_path}\n", encoding="utf-8")
+            config = SimpleNamespace(env_path=env_path)
+            with mock.patch("zerotermd.server._send_json") as send_json:
+                server._handle_history_request(None, config, "/api/history?metric=battery&res=10")
+                server._handle_history_request(None, config, "/api/history?res=7")
+        status, payload = send_json.call_args_list[0].args[1:]
+        self.assertEqual(status, 200)
+        self.assertEqual(list(payload["metrics"]), ["battery"])
+        self.assertEqual(payload["metrics"]["battery"]["avg"], [80.0])
+        self.assertEqual(send_json.call_args_list[1].args[1], 400)